@@ -13,8 +13,34 @@ from math import pow
 
 
 
+## Private helper that enumerates every valid pitch name string and returns
+#  a dictionary mapping it to its (letter, accidental, octave) indexes. Both
+#  upper and lower case letters are accepted, and the two characters of a
+#  double accidental may be mixed, e.g. 'C#s4'.
+def _build_pitch_names():
+    letters = 'CDEFGAB'
+    semitones = [0, 2, 4, 5, 7, 9, 11]
+    accidentals = {'': 2, 'b': 1, 'f': 1, '#': 3, 's': 3,
+                   'bb': 0, 'bf': 0, 'fb': 0, 'ff': 0,
+                   '##': 4, '#s': 4, 's#': 4, 'ss': 4}
+    octaves = ['00', '0', '1', '2', '3', '4', '5', '6', '7', '8', '9']
+    names = {}
+    for letter, name in enumerate(letters):
+        for acci, accidental in accidentals.items():
+            for octave, octaveName in enumerate(octaves):
+                if 0 <= semitones[letter] + accidental - 2 + octave * 12 <= 127:
+                    for case in (name, name.lower()):
+                        names[case + acci + octaveName] = (letter, accidental, octave)
+    return names
+
+
 class Pitch:
 
+    ## Pitches are immutable flyweights: their only instance attributes are
+    #  the three indexes and the values derived from them, which are all
+    #  computed once when the pitch is first created. See: _make().
+    __slots__ = ('letter', 'accidental', 'octave', '_pos', '_keynum', '_pc', '_pnum', '_hertz')
+
     ## A class variable that holds an IntEnum of all possible letter-and-accidental
     #  combinations Cff up to Bss. Each pnum encodes its letter and accidental index
     #  as a one byte value 'llllaaaa', where 'llll' is its letter index 0-6, and
@@ -98,6 +124,24 @@ class Pitch:
                              ('Bs', 0b01110011),
                              ('Bss', 0b01110100)])
 
+    ## A class variable that maps every valid pitch name string to its
+    #  interned Pitch so that Pitch(string) is a single dictionary lookup.
+    #  It is filled in after the class is defined.
+    nameDict = {}
+
+    ## A private class variable that maps (letter, accidental, octave) to the
+    #  single shared Pitch with those indexes. See: _make().
+    _interned = {}
+
+    ## A private class variable that holds the shared empty Pitch.
+    _empty = None
+
+    ## The semitones above C of each letter index.
+    _letterSemitones = (0, 2, 4, 5, 7, 9, 11)
+
+    ## The names of the Pnum of each accidental index.
+    _safeAccidentals = ('ff', 'f', '', 's', 'ss')
+
     ## Creates a Pitch from a string or list, if neither is provided
     #  an empty Pitch is returned.
     #  * Pitch(string) - creates a Pitch from a pitch name string.
@@ -135,90 +179,88 @@ class Pitch:
     # Examples: Pitch('C4'), Pitch('F##2'), Pitch('Gs8'), Pitch('Bb3'), Pitch("Df00"),
     # Pitch([0,3,6]), Pitch()
 
-    def __init__(self, ref=None):
-        letterDict = {'C': 0,
-                      'D': 1,
-                      'E': 2,
-                      'F': 3,
-                      'G': 4,
-                      'A': 5,
-                      'B': 6, }
-
-        ## A letter index 0-6.
+    def __new__(cls, ref=None):
         if ref is None:
-            self.letter = None
-            self.octave = None
-            self.accidental = None
+            if cls._empty is None:
+                cls._empty = cls._create(None, None, None)
+            return cls._empty
         elif isinstance(ref, str):
-
-            pitchList = list(ref)
-            octaveIndex = 1
-            #letter
-            self.letter = letterDict.get(pitchList[0].upper(), "none")
-            if self.letter == "none":
-                raise ValueError("This is not a valid pitch")
-            #accidental
-
-            if pitchList[1] == '#' or pitchList[1] == 's':
-                # if "##"
-                if pitchList[2] == '#' or pitchList[2] == 's':
-                    self.accidental = 4
-                    octaveIndex = 3
-                # if "#"
-                else:
-                   self.accidental = 3
-                   octaveIndex = 2
-            # if flats
-            elif pitchList[1] == 'b' or pitchList[1] == 'f':
-                # if 'bb'
-                if pitchList[2] == 'b' or pitchList[2] == 'f':
-                    self.accidental = 0
-                    octaveIndex = 3
-                # if 'b'
-                else:
-                    self.accidental = 1
-                    octaveIndex = 2
-            else:
-                self.accidental = 2
-
-
-            octaveStr = ''.join(pitchList[octaveIndex:])
-            #octave
-            if pitchList[octaveIndex] == '0':
-                if ''.join(pitchList[octaveIndex:]) == '00':
-                    self.octave = 0
-                else:
-                    self.octave = 1
-            elif octaveStr.isdigit():
-                if int(octaveStr) < 10 and int(octaveStr) > 0:
-                    self.octave = int(pitchList[octaveIndex]) + 1
-                else:
-                    raise ValueError("This is not a valid pitch")
-            else:
+            try:
+                return cls.nameDict[ref]
+            except KeyError:
                 raise ValueError("This is not a valid pitch")
-            if self.keynum() > 127 or self.keynum() < 0:
-                raise ValueError("This is not a valid pitch")
-
         elif isinstance(ref, list):
             if len(ref) > 3:
                 raise ValueError("This is not a valid pitch")
             if ref[0] <= 6 and ref[0] >= 0:
-                self.letter = ref[0]
                 if ref[1] <= 4 and ref[1] >= 0:
-                    self.accidental = ref[1]
                     if ref[2] <= 10 and ref[2] >= 0:
-                        self.octave = ref[2]
+                        return cls._make(ref[0], ref[1], ref[2])
                     else:
                         raise ValueError("This is not a valid pitch")
                 else:
                     raise ValueError("This is not a valid pitch")
             else:
                 raise ValueError("This is not a valid pitch")
-            if self.keynum() > 127 or self.keynum() < 0:
-                raise ValueError("This is not a valid pitch")
         else:
             raise ValueError("This is not a valid pitch")
 
+    ## Private class method that returns the interned Pitch for a letter,
+    #  accidental and octave index, creating it the first time.
+    #
+    #  Raises a ValueError if the pitch is outside the midi range 0-127.
+    @classmethod
+    def _make(cls, letter, accidental, octave):
+        pitch = cls._interned.get((letter, accidental, octave))
+        if pitch is None:
+            keynum = cls._letterSemitones[letter] + accidental - 2 + octave * 12
+            if keynum > 127 or keynum < 0:
+                raise ValueError("This is not a valid pitch")
+            pitch = cls._interned.setdefault((letter, accidental, octave), cls._create(letter, accidental, octave))
+        return pitch
+
+    ## Private class method that allocates a Pitch and computes its derived
+    #  values. Use _make() to get the shared instance.
+    @classmethod
+    def _create(cls, letter, accidental, octave):
+        pitch = object.__new__(cls)
+        values = {'letter': letter, 'accidental': accidental, 'octave': octave,
+                  '_pos': None, '_keynum': None, '_pc': None, '_pnum': None, '_hertz': None}
+        if letter is not None:
+            keynum = cls._letterSemitones[letter] + accidental - 2 + octave * 12
+            values['_pos'] = (octave << 8) + (letter << 4) + accidental
+            values['_keynum'] = keynum
+            values['_pc'] = (cls._letterSemitones[letter] + accidental - 2) % 12
+            values['_pnum'] = cls.pnums[Pitch.letterDict[letter] + cls._safeAccidentals[accidental]]
+            values['_hertz'] = 440.0 * 2 ** ((keynum - 69) / 12)
+        for name, value in values.items():
+            object.__setattr__(pitch, name, value)
+        return pitch
+
+    ## Pitches are immutable, assigning to an attribute raises an AttributeError.
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Pitch is immutable, cannot set {name}")
+
+    ## Pitches are immutable, deleting an attribute raises an AttributeError.
+    def __delattr__(self, name):
+        raise AttributeError(f"Pitch is immutable, cannot delete {name}")
+
+    ## Pickles a Pitch by its name so unpickling returns the interned instance.
+    def __reduce__(self):
+        return (Pitch, () if self.is_empty() else (self.string(),))
+
+    ## Pitches are immutable so a copy is the pitch itself.
+    def __copy__(self):
+        return self
+
+    ## Pitches are immutable so a deep copy is the pitch itself.
+    def __deepcopy__(self, memo):
+        return self
+
+    ## Returns a hash of the pitch's letter, accidental and octave so equal
+    #  pitches can be used as dictionary keys and set members.
+    def __hash__(self):
+        return hash(self._pos)
 
     ## Returns a string displaying information about the
     #  pitch within angle brackets. Information includes the
@@ -342,7 +384,7 @@ class Pitch:
     #  the octave-letter-accidental space. The expression to calculate
     #  this value is (octave<<8) + (letter<<4) + accidental.
     def pos(self):
-        return (self.octave << 8) + (self.letter << 4) + self.accidental
+        return self._pos
 
     ## Returns true if the Pitch is empty. A pitch is empty if its
     # letter, accidental and octave attributes are None. Only one of
@@ -359,68 +401,25 @@ class Pitch:
     def string(self):
         if self.is_empty():
             return 'empty'
-        else:
-            if self.octave == -1:
-                return f"{Pitch.letterDict[self.letter]}{Pitch.accDict[self.accidental]}00"
-            else:
-                return f"{Pitch.letterDict[self.letter]}{Pitch.accDict[self.accidental]}{Pitch.octDict[self.octave]}"
+        return f"{Pitch.letterDict[self.letter]}{Pitch.accDict[self.accidental]}{Pitch.octDict[self.octave]}"
 
     ## Returns the midi key number of the Pitch.
     def keynum(self):
-        letterDict = {0: 0,
-                      1: 2,
-                      2: 4,
-                      3: 5,
-                      4: 7,
-                      5: 9,
-                      6: 11, }
-        accidentals = {0: -2,
-                       1: -1,
-                       2: 0,
-                       3: 1,
-                       4: 2}
-        midi = letterDict[self.letter]
-        midi = midi + accidentals[self.accidental]
-        midi += self.octave * 12
-        if midi <= 127 and midi >= 0:
-            return midi
-        else:
-            raise ValueError(f"The pitch is outside the valid midi range of 0-127. Your pitch is midi value {midi}")
+        return self._keynum
 
     ## Returns the pnum (pitch class enum) of the Pitch. Pnums enumerate
     #  and order the letter and accidental of a Pitch so they can be compared,
     #  e.g.: C < C# < Dbb. See also: pnums.
     def pnum(self):
-        accidentals = {0: 'ff',
-                       1: 'f',
-                       2: '',
-                       3: 's',
-                       4: 'ss'}
-        pitchString = Pitch.letterDict[self.letter]
-        pitchString += accidentals[self.accidental]
-        return Pitch.pnums[pitchString]
-
+        return self._pnum
 
     ## Returns the pitch class (0-11) of the Pitch.
     def pc(self):
-        letterDict = {0: 0,
-                      1: 2,
-                      2: 4,
-                      3: 5,
-                      4: 7,
-                      5: 9,
-                      6: 11, }
-        accidentals = {0: -2,
-                       1: -1,
-                       2: 0,
-                       3: 1,
-                       4: 2}
-        pc = letterDict[self.letter] + accidentals[self.accidental]
-        return pc % 12
+        return self._pc
 
     ## Returns the hertz value of the Pitch.
     def hertz(self):
-        return 440.0 * 2 ** ((round(self.keynum()) - 69) / 12)
+        return self._hertz
 
     ## A @classmethod that creates a Pitch for the specified
     #  midi key number.
@@ -468,5 +467,8 @@ class Pitch:
         else:
             raise ValueError("This cannot be a valid pitch")
 
+Pitch.nameDict = {name: Pitch._make(*indexes) for name, indexes in _build_pitch_names().items()}
+
+
 if __name__ == '__main__':
     print(Pitch.from_keynum(70,'bbb'))
@@ -0,0 +1,214 @@
+###############################################################################
+import numpy as np
+
+from .pitch import Pitch
+
+
+## A class that stores many Pitches as one NumPy array of packed integers.
+#
+# Each pitch is packed into a single integer exactly like Pitch.pos():
+# (octave<<8) + (letter<<4) + accidental, so codes order the same way
+# Pitches compare. Keynums, pitch classes, pnums and hertz values of a whole
+# melody are then computed with one vectorized expression, and tessitura,
+# climax or diatonic checks become array operations.
+#
+# Example:
+# @code
+# melody = PitchArray.from_pitches(note.pitch for note in notes)
+# highest = melody.max()
+# inside = (melody.keynum() >= 60) & (melody.keynum() <= 72)
+# @endcode
+class PitchArray:
+
+    ## The semitones above C of each letter index.
+    _letterSemitones = np.array([0, 2, 4, 5, 7, 9, 11], dtype=np.int64)
+
+    ## The default (letter, accidental) of each pitch class, the same
+    #  spellings as Pitch.from_keynum(): C C# D Eb E F F# G Ab A Bb B.
+    _pcSpellings = np.array([(0 << 4) + 2, (0 << 4) + 3, (1 << 4) + 2, (2 << 4) + 1,
+                             (2 << 4) + 2, (3 << 4) + 2, (3 << 4) + 3, (4 << 4) + 2,
+                             (5 << 4) + 1, (5 << 4) + 2, (6 << 4) + 1, (6 << 4) + 2], dtype=np.int64)
+
+    ## The Pnum value of each letter * 5 + accidental, see: Pitch.pnums.
+    _pnumValues = np.array([Pitch.pnums[Pitch.letterDict[letter] + accidental].value
+                            for letter in range(7) for accidental in Pitch._safeAccidentals], dtype=np.int64)
+
+    ## Creates a PitchArray from packed pitch codes.
+    # @param codes A sequence or NumPy array of integer codes, see: Pitch.pos().
+    #
+    # Raises a ValueError if a code is not a valid pitch in the midi range
+    # 0-127. Use from_pitches(), from_strings() or from_keynums() to build
+    # an array from other representations.
+    def __init__(self, codes):
+        codes = np.asarray(codes)
+        if codes.size and not np.issubdtype(codes.dtype, np.integer):
+            raise TypeError("PitchArray codes must be integers")
+        self.codes = codes.astype(np.int64).ravel()
+        letters, accidentals, octaves = self.letters(), self.accidentals(), self.octaves()
+        valid = (letters <= 6) & (accidentals <= 4) & (octaves <= 10) & (self.codes >= 0)
+        if not np.all(valid):
+            raise ValueError("The PitchArray contains invalid pitch codes")
+        keynums = self.keynum()
+        if np.any((keynums < 0) | (keynums > 127)):
+            raise ValueError("The PitchArray contains pitches outside the midi range 0-127")
+
+    ## Private class method that wraps an already valid code array.
+    @classmethod
+    def _wrap(cls, codes):
+        array = cls.__new__(cls)
+        array.codes = codes
+        return array
+
+    ## Creates a PitchArray from an iterable of Pitches.
+    # Raises a ValueError if a pitch is empty.
+    @classmethod
+    def from_pitches(cls, pitches):
+        codes = []
+        for pitch in pitches:
+            if pitch.is_empty():
+                raise ValueError("An empty Pitch cannot be put in a PitchArray")
+            codes.append(pitch.pos())
+        return cls._wrap(np.array(codes, dtype=np.int64))
+
+    ## Creates a PitchArray from an iterable of pitch name strings.
+    # Raises a ValueError if a name is not a valid pitch.
+    @classmethod
+    def from_strings(cls, names):
+        return cls.from_pitches(Pitch(name) for name in names)
+
+    ## Creates a PitchArray from midi key numbers, spelling black keys as
+    # C# Eb F# Ab Bb like Pitch.from_keynum().
+    # @param keynums A sequence or NumPy array of key numbers 0-127.
+    @classmethod
+    def from_keynums(cls, keynums):
+        keynums = np.asarray(keynums, dtype=np.int64).ravel()
+        if np.any((keynums < 0) | (keynums > 127)):
+            raise ValueError("Key numbers must be in the midi range 0-127")
+        octaves, pcs = np.divmod(keynums, 12)
+        return cls._wrap((octaves << 8) + cls._pcSpellings[pcs])
+
+    ## Returns the array as a list of (interned) Pitches.
+    def to_pitches(self):
+        make = Pitch._make
+        return [make((code >> 4) & 0xF, code & 0xF, code >> 8) for code in self.codes.tolist()]
+
+    ## Returns a list of the pitch name of every element.
+    def strings(self):
+        return [pitch.string() for pitch in self.to_pitches()]
+
+    ## Returns a string showing the array's pitch names and the hex id.
+    # Example: '<PitchArray: [C4, E4, G4] 0x10610d2b0>'
+    def __str__(self):
+        return f'<PitchArray: [{", ".join(self.strings())}] {hex(id(self))}>'
+
+    ## Returns a string expression that will evaluate to this array.
+    def __repr__(self):
+        return f'PitchArray({self.codes.tolist()})'
+
+    ## Returns the number of pitches in the array.
+    def __len__(self):
+        return len(self.codes)
+
+    ## Implements PitchArray iteration by returning an iterator of Pitches.
+    def __iter__(self):
+        return iter(self.to_pitches())
+
+    ## Implements array[index]. An integer index returns a Pitch, a slice,
+    # integer array or boolean mask returns a new PitchArray.
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            code = int(self.codes[index])
+            return Pitch._make((code >> 4) & 0xF, code & 0xF, code >> 8)
+        return PitchArray._wrap(self.codes[index])
+
+    ## Returns the letter indexes 0-6 as an int64 array.
+    def letters(self):
+        return (self.codes >> 4) & 0xF
+
+    ## Returns the accidental indexes 0-4 as an int64 array.
+    def accidentals(self):
+        return self.codes & 0xF
+
+    ## Returns the octave indexes 0-10 as an int64 array.
+    def octaves(self):
+        return self.codes >> 8
+
+    ## Returns the midi key numbers as an int64 array. See: Pitch.keynum().
+    def keynum(self):
+        return PitchArray._letterSemitones[self.letters()] + self.accidentals() - 2 + self.octaves() * 12
+
+    ## Returns the pitch classes 0-11 as an int64 array. See: Pitch.pc().
+    def pc(self):
+        return (PitchArray._letterSemitones[self.letters()] + self.accidentals() - 2) % 12
+
+    ## Returns the integer values of the pitches' Pnums as an int64 array.
+    # See: Pitch.pnum().
+    def pnum(self):
+        return PitchArray._pnumValues[self.letters() * 5 + self.accidentals()]
+
+    ## Returns the hertz values as a float64 array. See: Pitch.hertz().
+    def hertz(self):
+        return 440.0 * 2 ** ((self.keynum() - 69) / 12)
+
+    ## Returns a boolean array that is true where the pitch class is one of
+    # the given pitch classes, e.g. the pcs of a diatonic scale.
+    def in_pcs(self, pcs):
+        return np.isin(self.pc(), list(pcs))
+
+    ## Private method that returns the codes of other, a PitchArray or Pitch.
+    def _operand(self, other):
+        if isinstance(other, PitchArray):
+            if len(other) != len(self):
+                raise ValueError("PitchArrays must have the same length")
+            return other.codes
+        if isinstance(other, Pitch):
+            return other.pos()
+        raise ValueError("You cannot compare {} with a PitchArray".format(other))
+
+    ## Implements elementwise array < other. Returns a boolean array.
+    def __lt__(self, other):
+        return self.codes < self._operand(other)
+
+    ## Implements elementwise array <= other. Returns a boolean array.
+    def __le__(self, other):
+        return self.codes <= self._operand(other)
+
+    ## Implements elementwise array == other. Returns a boolean array.
+    def __eq__(self, other):
+        return self.codes == self._operand(other)
+
+    ## Implements elementwise array != other. Returns a boolean array.
+    def __ne__(self, other):
+        return self.codes != self._operand(other)
+
+    ## Implements elementwise array >= other. Returns a boolean array.
+    def __ge__(self, other):
+        return self.codes >= self._operand(other)
+
+    ## Implements elementwise array > other. Returns a boolean array.
+    def __gt__(self, other):
+        return self.codes > self._operand(other)
+
+    ## PitchArrays compare elementwise so they cannot be hashed.
+    __hash__ = None
+
+    ## Returns the lowest Pitch, ordered like Pitch comparisons.
+    # Raises a ValueError if the array is empty.
+    def min(self):
+        return self[int(np.argmin(self.codes))]
+
+    ## Returns the highest Pitch, ordered like Pitch comparisons.
+    # Raises a ValueError if the array is empty.
+    def max(self):
+        return self[int(np.argmax(self.codes))]
+
+    ## Returns the indexes that sort the array from lowest to highest
+    # Pitch. Equal pitches keep their order.
+    def argsort(self):
+        return np.argsort(self.codes, kind='stable')
+
+
+if __name__ == '__main__':
+    melody = PitchArray.from_strings(['C4', 'E4', 'G4', 'F#4', 'C5', 'Bb3'])
+    print(melody, melody.keynum(), melody.pc(), melody.max(), melody.min())
+    print(PitchArray.from_keynums(melody.keynum()))
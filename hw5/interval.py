@@ -25,6 +25,12 @@ from .pitch import Pitch
 
 
 class Interval:
+
+    ## Intervals are immutable flyweights: every valid (span, qual, xoct, sign)
+    #  combination is created once when the module is loaded, together with
+    #  its pos(), semitones() and a word of predicate flags. See: _create().
+    __slots__ = ('span', 'qual', 'xoct', 'sign', '_pos', '_semitones', '_flags')
+
     ## Creates an Interval from a string, list, or two Pitches.
     #  * Interval(string) - creates an Interval from a pitch string.
     #  * Interval([s, q, x, s]) - creates a Pitch from a list of four
@@ -126,6 +132,15 @@ class Interval:
     invert_acci_dict = dict([[v, k] for k, v in accidentalDict.items()])
     invert_accisafe_dict = dict([[v, k] for k, v in accidentalSafeDict.items()])
 
+    ## Every quality symbol, safe or not, mapped to its quality index.
+    _qualityNames = {**invert_accisafe_dict, **invert_acci_dict}
+
+    ## The semitones above C of each letter index 0-6. See: transpose().
+    _letterSemitones = (0, 2, 4, 5, 7, 9, 11)
+
+    ## The Pnum name suffix of each accidental index 0-4.
+    _safeAccidentals = ('ff', 'f', '', 's', 'ss')
+
     majorminor = [1, 2, 5, 6]
     perfect = [0, 3, 4, 7]
 
@@ -160,33 +175,121 @@ class Interval:
                _4aug_qual: 4,
                _5aug_qual: 5}
 
-    def __init__(self, arg, other=None):
+    ## The quality index of each semitone adjustment, the inverses of
+    #  majMinAdj and perfAdj. See: _init_from_pitches().
+    _majMinQuals = dict([[v, k] for k, v in majMinAdj.items()])
+    _perfQuals = dict([[v, k] for k, v in perfAdj.items()])
+
+    ## The predicate flag bits of an interval. The span flags are 1 << span.
+    _SPAN_FLAGS = tuple(1 << span for span in range(8))
+    _MINOR, _PERFECT, _MAJOR, _PERFECT_TYPE, _IMPERFECT_TYPE, _SIMPLE, _ASCENDING, \
+    _CONSONANT, _DISSONANT = (1 << bit for bit in range(8, 17))
+
+    ## A private class variable that maps (span, qual, xoct, sign) to the
+    #  single shared Interval with those values. It is filled in after the
+    #  class is defined.
+    _interned = {}
+
+    ## A private class variable that caches the Interval of every interval
+    #  string that has been parsed. See: _init_from_string().
+    _strings = {}
+
+    ## A private class variable that memoizes Interval(pitch1, pitch2): it
+    #  maps the two pitches' pos() values packed into one integer,
+    #  (pitch1.pos() << 12) | pitch2.pos(), to the interned Interval between
+    #  them. Pitches are interned too and there are only a few hundred of
+    #  them, so every pair is computed at most once.
+    _pairs = {}
+
+    def __new__(cls, arg, other=None):
 
         if isinstance(arg, list):
             if len(arg) != 4:
                 raise ValueError("This is not a valid list to create an interval")
-            else:
-                interval = self._init_from_list(arg[0], arg[1], arg[2], arg[3])
-                self.span = interval[0]
-                self.qual = interval[1]
-                self.xoct = interval[2]
-                self.sign = interval[3]
-
+            return cls._lookup(tuple(arg))
         elif isinstance(arg, str):
-            interval = self._init_from_string(arg)
-            self.span = interval[0]
-            self.qual = interval[1]
-            self.xoct = interval[2]
-            self.sign = interval[3]
+            interval = cls._strings.get(arg)
+            if interval is None:
+                interval = cls._strings.setdefault(arg, cls._lookup(cls._init_from_string(arg)))
+            return interval
         elif isinstance(other, Pitch) and isinstance(arg, Pitch):
-            interval = self._init_from_pitches(arg, other)
-            self.span = interval[0]
-            self.qual = interval[1]
-            self.xoct = interval[2]
-            self.sign = interval[3]
+            key = (arg.pos() << 12) | other.pos()
+            interval = cls._pairs.get(key)
+            if interval is None:
+                interval = cls._pairs.setdefault(key, cls._lookup(cls._init_from_pitches(arg, other)))
+            return interval
         else:
             raise ValueError("This is not a valid interval")
 
+    ## Private class method that returns the interned Interval of four
+    #  values, checking them with _init_from_list() if they are not already
+    #  a valid key. Raises a ValueError if they are not a valid interval.
+    @classmethod
+    def _lookup(cls, values):
+        interval = cls._interned.get(values)
+        if interval is None:
+            interval = cls._interned.get(cls._init_from_list(*values))
+            if interval is None:
+                raise ValueError("This is not a valid interval")
+        return interval
+
+    ## Private class method that allocates an Interval and computes its
+    #  derived values. Use Interval([span, qual, xoct, sign]) to get the
+    #  shared instance.
+    @classmethod
+    def _create(cls, span, qual, xoct, sign):
+        interval = object.__new__(cls)
+        semitones = cls.diatonicDict[span] + 12 * xoct
+        if span in cls.majorminor:
+            # majMinAdj stops at the quadruple qualities, the quintuple ones
+            # continue the same steps.
+            semitones += cls.majMinAdj.get(qual, qual - 6 if qual < cls._perf_qual else qual - 7)
+            flags = cls._IMPERFECT_TYPE
+            if qual == cls._min_qual or qual == cls._maj_qual:
+                flags |= cls._CONSONANT
+        else:
+            semitones += cls.perfAdj[qual]
+            flags = cls._PERFECT_TYPE
+            if qual == cls._perf_qual:
+                flags |= cls._CONSONANT
+        flags |= cls._SPAN_FLAGS[span]
+        flags |= {cls._min_qual: cls._MINOR, cls._perf_qual: cls._PERFECT, cls._maj_qual: cls._MAJOR}.get(qual, 0)
+        if qual < cls._min_qual or qual > cls._maj_qual:
+            flags |= cls._DISSONANT
+        if xoct == 0:
+            flags |= cls._SIMPLE
+        if sign == 1:
+            flags |= cls._ASCENDING
+        values = {'span': span, 'qual': qual, 'xoct': xoct, 'sign': sign,
+                  '_pos': (((span + (xoct * 7)) + 1) << 8) + qual, '_semitones': semitones, '_flags': flags}
+        for name, value in values.items():
+            object.__setattr__(interval, name, value)
+        return interval
+
+    ## Intervals are immutable, assigning to an attribute raises an AttributeError.
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Interval is immutable, cannot set {name}")
+
+    ## Intervals are immutable, deleting an attribute raises an AttributeError.
+    def __delattr__(self, name):
+        raise AttributeError(f"Interval is immutable, cannot delete {name}")
+
+    ## Pickles an Interval by its values so unpickling returns the interned instance.
+    def __reduce__(self):
+        return (Interval, (self.to_list(),))
+
+    ## Intervals are immutable so a copy is the interval itself.
+    def __copy__(self):
+        return self
+
+    ## Intervals are immutable so a deep copy is the interval itself.
+    def __deepcopy__(self, memo):
+        return self
+
+    ## Returns a hash of pos() so intervals that compare equal hash equal.
+    def __hash__(self):
+        return hash(self._pos)
+
     ## A private method that checks four integer values (span, qual, xoct, sign) to make sure
     # they are valid index values for the span, qual, xoct and sign attributes. Legal values
     # are: span 0-7, qual 0-12, xoct 0-10, sign -1 or 1. If any value is out of range the
@@ -206,7 +309,11 @@ class Interval:
     # Only if all the edge case checks pass then _init_from_list() should assign
     # the four values to the attributes, e.g. self.span=span, self.qual=qual, and
     # so on. Otherwise if any edge case fails the method should raise a ValueError.
-    def _init_from_list(self, span, qual, xoct, sign):
+    #
+    # Intervals are interned, so the checked values are returned as a tuple
+    # and used to look up the shared instance.
+    @classmethod
+    def _init_from_list(cls, span, qual, xoct, sign):
 
         if span >= 0 and span < 9:
             if (Interval.accidentalDict.get(qual, "none") != "none"):
@@ -215,7 +322,7 @@ class Interval:
                 for interval in Interval.majorminor:
                     if span == interval:
                         if qual == 6:
-                            raise ValueError(f"A span of {self.span} cannot be a Perfect interval")
+                            raise ValueError(f"A span of {span} cannot be a Perfect interval")
                         break
                 # already checked if it is a major or a minor
                 # we can assume that is a perfect interval because it already passed the span tests
@@ -224,7 +331,7 @@ class Interval:
                 for interval in Interval.perfect:
                     if span == interval:
                         if qual == Interval._maj_qual or qual == Interval._min_qual:
-                            raise ValueError(f"A span of {self.span} cannot be a major or minor interval")
+                            raise ValueError(f"A span of {span} cannot be a major or minor interval")
                         if qual == Interval._5dim_qual and not span == Interval._5th_span:
                             raise ValueError("Only a fifth can be quintuply diminished")
                         if qual == Interval._5aug_qual and not span == Interval._4th_span:
@@ -245,7 +352,7 @@ class Interval:
                         raise ValueError("This interval is outside the range of 127 semitones")
                     elif xoct == 10 and span == Interval._5th_span and qual > Interval._2aug_qual:
                         raise ValueError("This interval is outside the range of 127 semitones")
-                    if not sign == 1 or not sign == -1:
+                    if sign == 1 or sign == -1:
                         if sign == 1:
                             if span == Interval._unison_span and qual < Interval._perf_qual \
                                     or span == Interval._2nd_span and qual < Interval._1dim_qual \
@@ -269,7 +376,8 @@ class Interval:
     # check the values and assign them to the instance's attributes. A ValueError
     # should be raised for any value that cannot be parsed from the string. See:
     # _init_from_list().
-    def _init_from_string(self, string):
+    @classmethod
+    def _init_from_string(cls, string):
         # ... parse the string into a span, qual, xoct and sign values
         span, qual, xoct, sign = (-1, -1, -1, -1)
         # ... pass on to check an assign instance attributes.
@@ -301,86 +409,25 @@ class Interval:
         qual = Interval.invert_acci_dict.get("".join(intervalChar), "none")
         if qual == "none":
             qual = Interval.invert_accisafe_dict.get("".join(intervalChar), "none")
-        return self._init_from_list(span, qual, xoct, sign)
+        return cls._init_from_list(span, qual, xoct, sign)
 
     ## A private method that determines approprite span, qual, xoct, sign
     # from two pitches. If pitch2 is lower than pitch1 then a descending
     # interval should be formed. The values should be passed to the
     # _init_from_list() method to initalize the interval's attributes.
     # See: _init_from_list().
-    #
-    # Do NOT implement this method yet.
-    def _init_from_pitches(self, pitch1, pitch2):
-
-        diatonicDict = {0: 0,
-                        1: 2,
-                        2: 4,
-                        3: 5,
-                        4: 7,
-                        5: 9,
-                        6: 11,
-                        7: 12}
-
-        majMinAdj = {-5: Interval._4dim_qual,
-                     -4: Interval._3dim_qual,
-                     -3: Interval._2dim_qual,
-                     -2: Interval._1dim_qual,
-                     -1: Interval._min_qual,
-                     0: Interval._maj_qual,
-                     1: Interval._1aug_qual,
-                     2: Interval._2aug_qual,
-                     3: Interval._3aug_qual,
-                     4: Interval._4aug_qual}
-        perfAdj = {-5: Interval._5dim_qual,
-                   -4: Interval._4dim_qual,
-                   -3: Interval._3dim_qual,
-                   -2: Interval._2dim_qual,
-                   -1: Interval._1dim_qual,
-                   0: Interval._perf_qual,
-                   1: Interval._1aug_qual,
-                   2: Interval._2aug_qual,
-                   3: Interval._3aug_qual,
-                   4: Interval._4aug_qual,
-                   5: Interval._5aug_qual}
-
-        # ... parse the string into a span, qual, xoct and sign values
-        span, qual, xoct, sign = (-1, -1, -1, -1)
-
-        if (pitch1 < pitch2):
-
+    @classmethod
+    def _init_from_pitches(cls, pitch1, pitch2):
+        if pitch1 <= pitch2:
             sign = 1
         else:
             sign = -1
-            temp = pitch1
-            pitch1 = pitch2
-            pitch2 = temp
-
-        span = pitch2.letter - pitch1.letter
-        while span < 0:
-            span += Interval._octave_span
-        semitones = pitch2.keynum() - pitch1.keynum()
-        diaSeparation = diatonicDict.get(pitch2.letter) - diatonicDict.get(pitch1.letter)
-        while diaSeparation < 0:
-            diaSeparation += 12
-        if semitones - diaSeparation < 0:
-            xoct, qual = divmod(semitones - diaSeparation, -12)
-        else:
-            xoct, qual = divmod(semitones - diaSeparation, 12)
-        if span in Interval.majorminor:
-            if pitch1.letter == 2 or pitch1.letter == 6:
-                qual -= 1
-            qual = majMinAdj.get(qual)
-        else:
-            if pitch1.letter == 3 and pitch2.letter == 6:
-                qual += 1
-            elif pitch1.letter == 6 and pitch2.letter != 2:
-                qual -= 1
-            qual = perfAdj.get(qual)
-        # find direction first. Then whether the letter is higher in the index than the other
-        # complement of an interval is 8va - (L1 - L2), regular span is L2 - L1
-        # needs to fix complement and octaves and such
-        # ... pass on to check and assign instance attributes.
-        return self._init_from_list(span, qual, xoct, sign)
+            pitch1, pitch2 = pitch2, pitch1
+        # the span is counted in lines and spaces, the quality is the
+        # difference between the actual semitones and the semitones of the
+        # major or perfect interval with that span.
+        steps = (pitch2.octave * 7 + pitch2.letter) - (pitch1.octave * 7 + pitch1.letter)
+        return cls._from_steps(steps, pitch2.keynum() - pitch1.keynum(), sign)
 
     ## Returns a string displaying information about the
     #  Interval within angle brackets. Information includes the
@@ -405,10 +452,7 @@ class Interval:
     # values to compare. See: pos().
     def __lt__(self, other):
         if isinstance(other, Interval):
-            if other.pos() > self.pos():
-                return True
-            else:
-                return False
+            return self._pos < other._pos
         else:
             raise TypeError("What is being compared is not an Interval")
 
@@ -421,10 +465,7 @@ class Interval:
     # values to compare. See: pos().
     def __le__(self, other):
         if isinstance(other, Interval):
-            if other.pos() >= self.pos():
-                return True
-            else:
-                return False
+            return self._pos <= other._pos
         else:
             raise TypeError("What is being compared is not an Interval")
 
@@ -437,10 +478,7 @@ class Interval:
     # values to compare. See: pos().
     def __eq__(self, other):
         if isinstance(other, Interval):
-            if other.pos() == self.pos():
-                return True
-            else:
-                return False
+            return self._pos == other._pos
         else:
             raise TypeError("What is being compared is not an Interval")
 
@@ -453,10 +491,7 @@ class Interval:
     # values to compare. See: pos().
     def __ne__(self, other):
         if isinstance(other, Interval):
-            if other.pos() != self.pos():
-                return True
-            else:
-                return False
+            return self._pos != other._pos
         else:
             raise TypeError("What is being compared is not an Interval")
 
@@ -469,10 +504,7 @@ class Interval:
     # values to compare. See: pos().
     def __ge__(self, other):
         if isinstance(other, Interval):
-            if other.pos() <= self.pos():
-                return True
-            else:
-                return False
+            return self._pos >= other._pos
         else:
             raise TypeError("What is being compared is not an Interval")
 
@@ -485,10 +517,7 @@ class Interval:
     # values to compare. See: pos().
     def __gt__(self, other):
         if isinstance(other, Interval):
-            if other.pos() < self.pos():
-                return True
-            else:
-                return False
+            return self._pos > other._pos
         else:
             raise TypeError("What is being compared is not an Interval")
 
@@ -501,7 +530,7 @@ class Interval:
     # larger than the second if its quality is larger. This value can be
     # encoded as a 16 bit integer: (((span + (xoct * 7)) + 1) << 8) + qual  
     def pos(self):
-        return (((self.span + (self.xoct * 7)) + 1) << 8) + self.qual
+        return self._pos
 
     ## Returns a string containing the interval name.
     #  For example, Interval('-P5').string() would return '-P5'.
@@ -554,11 +583,21 @@ class Interval:
             return 1
         return self.span + 1
 
-    ## Private method that returns a zero based interval quality from its 
-    #  external name. Raises an assertion if the name is invalid. See:
-    # is_unison() and similar.
+    ## Private method that returns a zero based interval quality from its
+    #  external name, or None if the name is not a quality. Raises a
+    #  ValueError if the name is not a string. See: is_unison() and similar.
     def _to_iq(self, name):
-        pass
+        if not isinstance(name, str):
+            raise ValueError('This is not a valid quality')
+        return Interval._qualityNames.get(name)
+
+    ## Private method that implements is_unison() and similar: returns true
+    #  if the interval's span is span and, if qual is given, its quality is
+    #  qual.
+    def _is_span(self, span, qual):
+        if not self._flags & Interval._SPAN_FLAGS[span]:
+            return False
+        return qual is None or self._to_iq(qual) == self.qual
 
     ## Returns the interval values as a list: [span, qual, xoct, sign]
     def to_list(self):
@@ -569,276 +608,123 @@ class Interval:
     # quality of unison, which can be any valid quality symbol, e.g.
     # 'P', 'M' 'm' 'd' 'A' 'o' '+' and so on. See: _to_iq().
     def is_unison(self, qual=None):
-        if self.span == Interval._unison_span:
-            if qual == None:
-                return True
-            else:
-                if isinstance(qual, str):
-                    if Interval.invert_acci_dict.get(qual, "none") == self.qual:
-                        return True
-                    else:
-                        if Interval.invert_accisafe_dict.get(qual, "none") == self.qual:
-                            return True
-                        return False
-                else:
-                    raise ValueError('This is not a valid quality')
-        else:
-            return False
+        return self._is_span(Interval._unison_span, qual)
 
     ## Returns true if the interval is a second otherwise false.
     # @param qual If specified the predicate tests for that specific
-    # quality of second, which can be any quality symbol, e.g.
+    # quality of second, which can be any valid quality symbol, e.g.
     # 'P', 'M' 'm' 'd' 'A' 'o' '+' and so on. See: _to_iq().
     def is_second(self, qual=None):
-        if self.span == Interval._2nd_span:
-            if qual == None:
-                return True
-            else:
-                if isinstance(qual, str):
-                    if Interval.invert_acci_dict.get(qual, "none") == self.qual:
-                        return True
-                    else:
-                        if Interval.invert_accisafe_dict.get(qual, "none") == self.qual:
-                            return True
-                        return False
-                else:
-                    raise ValueError('This is not a valid quality')
-        else:
-            return False
+        return self._is_span(Interval._2nd_span, qual)
 
     ## Returns true if the interval is a third otherwise false.
     # @param qual If specified the predicate tests for that specific
-    # quality of third, which can be any quality symbol, e.g.
+    # quality of third, which can be any valid quality symbol, e.g.
     # 'P', 'M' 'm' 'd' 'A' 'o' '+' and so on. See: _to_iq().
     def is_third(self, qual=None):
-        if self.span == Interval._3rd_span:
-            if qual == None:
-                return True
-            else:
-                if isinstance(qual, str):
-                    if Interval.invert_acci_dict.get(qual, "none") == self.qual:
-                        return True
-                    else:
-                        if Interval.invert_accisafe_dict.get(qual, "none") == self.qual:
-                            return True
-                        return False
-                else:
-                    raise ValueError('This is not a valid quality')
-        else:
-            return False
+        return self._is_span(Interval._3rd_span, qual)
 
     ## Returns true if the interval is a fourth otherwise false.
     # @param qual If specified the predicate tests for that specific
-    # quality of fourth, which can be any quality symbol, e.g.
+    # quality of fourth, which can be any valid quality symbol, e.g.
     # 'P', 'M' 'm' 'd' 'A' 'o' '+' and so on. See: _to_iq().
     def is_fourth(self, qual=None):
-        if self.span == Interval._4th_span:
-            if qual == None:
-                return True
-            else:
-                if isinstance(qual, str):
-                    if Interval.invert_acci_dict.get(qual, "none") == self.qual:
-                        return True
-                    else:
-                        if Interval.invert_accisafe_dict.get(qual, "none") == self.qual:
-                            return True
-                        return False
-                else:
-                    raise ValueError('This is not a valid quality')
-        else:
-            return False
+        return self._is_span(Interval._4th_span, qual)
 
     ## Returns true if the interval is a fifth otherwise false.
     # @param qual If specified the predicate tests for that specific
-    # quality of fifth, which can be any quality symbol, e.g.
+    # quality of fifth, which can be any valid quality symbol, e.g.
     # 'P', 'M' 'm' 'd' 'A' 'o' '+' and so on. See: _to_iq().
     def is_fifth(self, qual=None):
-        if self.span == Interval._5th_span:
-            if qual == None:
-                return True
-            else:
-                if isinstance(qual, str):
-                    if Interval.invert_acci_dict.get(qual, "none") == self.qual:
-                        return True
-                    else:
-                        if Interval.invert_accisafe_dict.get(qual, "none") == self.qual:
-                            return True
-                        return False
-                else:
-                    raise ValueError('This is not a valid quality')
-        else:
-            return False
+        return self._is_span(Interval._5th_span, qual)
 
     ## Returns true if the interval is a sixth otherwise false.
     # @param qual If specified the predicate tests for that specific
-    # quality of sixth, which can be any quality symbol, e.g.
+    # quality of sixth, which can be any valid quality symbol, e.g.
     # 'P', 'M' 'm' 'd' 'A' 'o' '+' and so on. See: _to_iq().
     def is_sixth(self, qual=None):
-        if self.span == Interval._6th_span:
-            if qual == None:
-                return True
-            else:
-                if isinstance(qual, str):
-                    if Interval.invert_acci_dict.get(qual, "none") == self.qual:
-                        return True
-                    else:
-                        if Interval.invert_accisafe_dict.get(qual, "none") == self.qual:
-                            return True
-                        return False
-                else:
-                    raise ValueError('This is not a valid quality')
-        else:
-            return False
+        return self._is_span(Interval._6th_span, qual)
 
     ## Returns true if the interval is a seventh otherwise false.
     # @param qual If specified the predicate tests for that specific
-    # quality of seventh, which can be any quality symbol, e.g.
+    # quality of seventh, which can be any valid quality symbol, e.g.
     # 'P', 'M' 'm' 'd' 'A' 'o' '+' and so on. See: _to_iq().
     def is_seventh(self, qual=None):
-        if self.span == Interval._7th_span:
-            if qual == None:
-                return True
-            else:
-                if isinstance(qual, str):
-                    if Interval.invert_acci_dict.get(qual, "none") == self.qual:
-                        return True
-                    else:
-                        if Interval.invert_accisafe_dict.get(qual, "none") == self.qual:
-                            return True
-                        return False
-                else:
-                    raise ValueError('This is not a valid quality')
-        else:
-            return False
+        return self._is_span(Interval._7th_span, qual)
 
     ## Returns true if the interval is an octave otherwise false.
     # @param qual If specified the predicate tests for that specific
-    # quality of octave, which can be any quality symbol, e.g.
+    # quality of octave, which can be any valid quality symbol, e.g.
     # 'P', 'M' 'm' 'd' 'A' 'o' '+' and so on. See: _to_iq().
     def is_octave(self, qual=None):
-        if self.span == Interval._octave_span:
-            if qual == None:
-                return True
-            else:
-                if isinstance(qual, str):
-                    if Interval.invert_acci_dict.get(qual, "none") == self.qual:
-                        return True
-                    else:
-                        if Interval.invert_accisafe_dict.get(qual, "none") == self.qual:
-                            return True
-                        return False
-                else:
-                    raise ValueError('This is not a valid quality')
-        else:
-            return False
+        return self._is_span(Interval._octave_span, qual)
 
     ## Returns a 'diminution count' 1-5 if the interval is diminished else False.
     # For example, if the interval is doubly-diminished then 2 is returned.
     # If the interval not diminished at all (e.g. is perfect, augmented, minor or
     # major) then False is returned.
     def is_diminished(self):
-        if self.qual > 4:
+        if self.qual > Interval._1dim_qual:
             return False
-        else:
-            return abs(self.qual - 5)
+        return Interval._min_qual - self.qual
 
     ## Returns true if the interval is minor, otherwise false.
     def is_minor(self):
-        if self.qual == 5:
-            return True
-        else:
-            return False
+        return bool(self._flags & Interval._MINOR)
 
     ## Returns true if the interval is perfect, otherwise false.
     def is_perfect(self):
-        if self.qual == 6:
-            return True
-        else:
-            return False
+        return bool(self._flags & Interval._PERFECT)
 
     ## Returns true if the interval is major, otherwise false.
     def is_major(self):
-        if self.qual == 7:
-            return True
-        else:
-            return False
+        return bool(self._flags & Interval._MAJOR)
 
     ## Returns a 'augmentation count' 1-5 if the interval is augmented else False.
     # For example, if the interval is doubly-augmented then 2 is returned.
     # If the interval not augmented at all (e.g. is perfect, diminished, minor or
     # major) then False is returned.
     def is_augmented(self):
-        if self.qual < 8:
+        if self.qual < Interval._1aug_qual:
             return False
-        else:
-            return 6 - (13 - self.qual)
+        return self.qual - Interval._maj_qual
 
     ## Returns true if the interval belongs to the 'perfect interval'
     #  family, i.e. it is a Unison, 4th, 5th, or Octave.
     def is_perfect_type(self):
-        if self.span in Interval.perfect:
-            return True
-        else:
-            return False
+        return bool(self._flags & Interval._PERFECT_TYPE)
 
     ## Returns true if this interval belongs to the 'imperfect interval'
     #  family, i.e. it is a 2nd, 3rd, 6th, or 7th.
     def is_imperfect_type(self):
-        if self.span in Interval.majorminor:
-            return True
-        else:
-            return False
+        return bool(self._flags & Interval._IMPERFECT_TYPE)
 
     ## Returns true if this is a simple interval, i.e. its span is
     #  less-than-or-equal to an octave.
     def is_simple(self):
-        if self.xoct == 0:
-            return True
-        else:
-            return False
+        return bool(self._flags & Interval._SIMPLE)
 
     ## Returns true if this is a compound interval, i.e. its span is
     #  more than an octave (an octave is a simple interval).
     def is_compound(self):
-        if self.xoct > 0:
-            return True
-        else:
-            return False
+        return not self._flags & Interval._SIMPLE
 
     ## Returns true if this interval's sign is 1.
     def is_ascending(self):
-        if self.sign == 1:
-            return True
-        else:
-            return False
+        return bool(self._flags & Interval._ASCENDING)
 
     ## Returns true if this interval's sign is -1.
     def is_descending(self):
-        if self.sign == -1:
-            return True
-        else:
-            return False
+        return not self._flags & Interval._ASCENDING
 
     ## Returns true if the interval is a consonant interval. In this
     # context the perfect fourth should be considered consonant.
     def is_consonant(self):
-        if self.is_imperfect_type():
-            if self.is_major() or self.is_minor():
-                return True
-            else:
-                return False
-        else:
-            if self.is_perfect():
-                return True
-            else:
-                return False
+        return bool(self._flags & Interval._CONSONANT)
 
     ## Returns true if the interval is not a consonant interval.
     def is_dissonant(self):
-        if self.is_augmented() or self.is_diminished():
-            return True
-        else:
-            return False
+        return bool(self._flags & Interval._DISSONANT)
 
     ##  Returns a complemented copy of the interval. To complement an interval
     # you invert its span and quality. To invert the span, subtract it from
@@ -856,14 +742,7 @@ class Interval:
     #
     # This value will be negative for descending intervals otherwise positive.
     def semitones(self):
-        semitones = Interval.diatonicDict.get(self.span)
-        if self.xoct > 0:
-             semitones = semitones + (12 * self.xoct)
-        if self.span in Interval.majorminor:
-            semitones += Interval.majMinAdj.get(self.qual)
-        else:
-            semitones += Interval.perfAdj.get(self.qual)
-        return semitones
+        return self._semitones
 
     ## Adds a specified interval to this interval.
     #  @return  a new interval expressing the total span of both intervals.
@@ -871,32 +750,77 @@ class Interval:
     #
     # A TypeError should be raised if other is not an interval. A
     # NotImplementedError if either intervals are descending.
+    #
+    # The spans and the semitones of the two intervals are added and the
+    # quality is whatever the semitones make of the total span, e.g. M3 + m3
+    # is P5 and M3 + M3 is +5.
     def add(self, other):
-        if isinstance(other, Interval):
-            span = ((self.span + other.span) - 1) % 7
-            # still need to finish
+        if not isinstance(other, Interval):
+            raise TypeError(f"You cannot add {other} to an interval")
+        if self.sign == -1 or other.sign == -1:
+            raise NotImplementedError("Descending intervals cannot be added")
+        steps = self.span + self.xoct * 7 + other.span + other.xoct * 7
+        return Interval._lookup(Interval._from_steps(steps, self._semitones + other._semitones, 1))
+
+    ## Private class method that returns the checked (span, qual, xoct, sign)
+    #  of an interval that moves a number of lines and spaces (steps) and
+    #  semitones, both positive. See: _init_from_list().
+    @classmethod
+    def _from_steps(cls, steps, semitones, sign):
+        xoct, span = divmod(steps, 7)
+        adjust = semitones - Interval.diatonicDict[span] - 12 * xoct
+        if span in Interval.majorminor:
+            qual = Interval._majMinQuals.get(adjust)
+        else:
+            qual = Interval._perfQuals.get(adjust)
+        return cls._init_from_list(span, qual, xoct, sign)
+
+    ## Private method that returns the (letter, accidental, octave) indexes
+    #  of a pitch transposed by the interval with xoct extra octaves. The
+    #  letter moves by the interval's lines and spaces, carrying into the
+    #  octave, and the accidental makes up the semitones.
+    def _transpose_indexes(self, letter, accidental, octave, xoct):
+        semitones = self._semitones - 12 * (self.xoct - xoct)
+        keynum = Interval._letterSemitones[letter] + accidental - 2 + 12 * octave + self.sign * semitones
+        octave, letter = divmod(octave * 7 + letter + self.sign * (self.span + 7 * xoct), 7)
+        return [letter, keynum - Interval._letterSemitones[letter] - 12 * octave + 2, octave]
 
     # Transposes a Pitch or Pnum by the interval. Pnum transposition
     #  has no direction so if the interval is negative its complement
     #  should be used.
     #  @param pref  The Pitch or Pnum to transpose.
     #  @return The transposed Pitch or Pnum.
+    #
+    #  A Pitch keeps its spelling: the letter moves by the interval's span and
+    #  the accidental supplies the quality, e.g. M3 transposes A4 to C#5. A
+    #  ValueError is raised if the result needs more than a double sharp or
+    #  flat or is outside the midi range. A Pnum is transposed by the simple
+    #  part of the interval, so moving it down gives the same Pnum as moving
+    #  it up by the complement.
     def transpose(self, pref):
-        #still need handle pnum cases
         if isinstance(pref, Pitch):
-            if self.sign == -1:
-                if self.span > pref.letter:
-                    pref.octave -= 1
-                pref.letter = (pref.letter + 7 - self.span) % 7
-                if self.is_major() or self.is_minor():
-                    pref.accidental -= Interval.majMinAdj.get(self.qual)
-                else:
-                    pref.accidental -= Interval.perfAdj.get(self.qual)
-            else:
-                pref.letter = pref.letter + self.span % 7
-                if self.is_major() or self.is_minor():
-                    pref.accidental += Interval.majMinAdj.get(self.qual)
-                else:
-                    pref.accidental += Interval.perfAdj.get(self.qual)
-            return Pitch(pref.string())
-
+            if pref.is_empty():
+                raise ValueError("An empty Pitch cannot be transposed")
+            return Pitch(self._transpose_indexes(pref.letter, pref.accidental, pref.octave, self.xoct))
+        elif isinstance(pref, Pitch.pnums):
+            letter = 'CDEFGAB'.index(pref.name[0])
+            accidental = Interval._safeAccidentals.index(pref.name[1:])
+            return Pitch(self._transpose_indexes(letter, accidental, 5, 0)).pnum()
+        raise TypeError(f"You cannot transpose {pref}, it is not a Pitch or Pnum")
+
+
+## Creates the interned Interval of every valid (span, qual, xoct, sign).
+def _intern_intervals():
+    for span in range(8):
+        for qual in range(13):
+            for xoct in range(11):
+                for sign in (1, -1):
+                    try:
+                        values = Interval._init_from_list(span, qual, xoct, sign)
+                    except ValueError:
+                        continue
+                    if values == (span, qual, xoct, sign):
+                        Interval._interned[values] = Interval._create(*values)
+
+
+_intern_intervals()
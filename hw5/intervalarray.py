@@ -0,0 +1,327 @@
+###############################################################################
+import numpy as np
+
+from .interval import Interval
+
+
+## Private helper that builds the IntervalArray semitone, flag and validity
+#  tables from the interned Intervals.
+def _interval_tables():
+    semitones = np.zeros((8, 13), dtype=np.int64)
+    flags = np.zeros((8, 13), dtype=np.int64)
+    valid = np.zeros((8, 13, 11, 2), dtype=bool)
+    for (span, qual, xoct, sign), interval in Interval._interned.items():
+        semitones[span, qual] = interval.semitones() - 12 * xoct
+        flags[span, qual] = interval._flags & ~(Interval._SIMPLE | Interval._ASCENDING)
+        valid[span, qual, xoct, (sign + 1) // 2] = True
+    return semitones, flags, valid
+
+
+## A class that stores many Intervals as parallel NumPy arrays.
+#
+# An IntervalArray holds the span, qual, xoct and sign of every interval in
+# four int64 arrays, plus their semitones(). It is built in one vectorized
+# pass from two aligned sequences of Pitches, e.g. the adjacent notes of one voice
+# (melodic()) or two voices at the same timepoints (harmonic()), and its
+# predicates return boolean masks instead of single booleans, so a rule can
+# count or locate every violation with array operations:
+# @code
+# intervals = IntervalArray.harmonic(bass, soprano)
+# parallel = intervals.is_fifth('P')[1:] & intervals.is_fifth('P')[:-1]
+# np.flatnonzero(parallel)
+# @endcode
+#
+# The predicates test the same flag bits as the Interval methods of the
+# same name. See: Interval.is_consonant() and similar.
+class IntervalArray:
+
+    ## The semitones of the major or perfect interval of each span.
+    _diatonic = np.array([Interval.diatonicDict[span] for span in range(8)], dtype=np.int64)
+
+    ## The semitones above C of each letter index.
+    _letterSemitones = np.array(Interval._letterSemitones, dtype=np.int64)
+
+    ## The quality index of each semitone adjustment -6 to 6 from the major
+    #  (imperfect spans) or perfect (perfect spans) interval, -1 if none.
+    _adjustQuals = np.array([[quals.get(adjust, -1) for adjust in range(-6, 7)]
+                             for quals in (Interval._majMinQuals, Interval._perfQuals)], dtype=np.int64)
+
+    ## True for the imperfect spans (2nd, 3rd, 6th and 7th).
+    _imperfect = np.isin(np.arange(8), Interval.majorminor)
+
+    ## The simple semitones and the flag bits (without the simple and
+    #  ascending flags) of every (span, qual), and a mask of every valid
+    #  (span, qual, xoct, sign) with sign index 0 for descending and 1 for
+    #  ascending. See: _interval_tables().
+    _semitoneTable, _flagTable, _valid = None, None, None
+
+    ## Creates an IntervalArray from arrays of interval values.
+    # @param span A sequence or NumPy array of span indexes 0-7.
+    # @param qual A sequence or NumPy array of quality indexes 0-12.
+    # @param xoct A sequence or NumPy array of extra octaves 0-10.
+    # @param sign A sequence or NumPy array of signs 1 or -1.
+    #
+    # Raises a ValueError if the arrays have different lengths or if an
+    # element is not a valid Interval. See: Interval._init_from_list().
+    # Use melodic(), harmonic(), or from_intervals() to build an array from
+    # Pitches or Intervals.
+    def __init__(self, span, qual, xoct, sign):
+        values = [np.asarray(v, dtype=np.int64).ravel() for v in (span, qual, xoct, sign)]
+        if any(len(v) != len(values[0]) for v in values):
+            raise ValueError("The interval values must have the same length")
+        span, qual, xoct, sign = values
+        inside = (span >= 0) & (span <= 7) & (qual >= 0) & (qual <= 12) & (xoct >= 0) & (xoct <= 10) \
+            & ((sign == 1) | (sign == -1))
+        if not np.all(inside) or not np.all(IntervalArray._valid[span, qual, xoct, (sign + 1) // 2]):
+            raise ValueError("The IntervalArray contains invalid intervals")
+        self._set(span, qual, xoct, sign)
+
+    ## Private method that assigns the value arrays and computes the
+    #  semitones and predicate flags.
+    def _set(self, span, qual, xoct, sign):
+        self.span, self.qual, self.xoct, self.sign = span, qual, xoct, sign
+        self._semitones = IntervalArray._semitoneTable[span, qual] + 12 * xoct
+        self._flags = IntervalArray._flagTable[span, qual] \
+            | np.where(xoct == 0, Interval._SIMPLE, 0) | np.where(sign == 1, Interval._ASCENDING, 0)
+
+    ## Private class method that wraps already valid value arrays.
+    @classmethod
+    def _wrap(cls, span, qual, xoct, sign):
+        array = cls.__new__(cls)
+        array._set(span, qual, xoct, sign)
+        return array
+
+    ## Returns the IntervalArray of an iterable of Intervals.
+    @classmethod
+    def from_intervals(cls, intervals):
+        values = np.array([interval.to_list() for interval in intervals], dtype=np.int64).reshape(-1, 4)
+        return cls._wrap(*values.T.copy())
+
+    ## Returns the intervals from each pitch in pitches1 to the aligned pitch
+    # in pitches2, exactly like Interval(pitch1, pitch2) for every pair.
+    # @param pitches1 An iterable of Pitches, or a NumPy array of their
+    # pos() values.
+    # @param pitches2 The same for the second pitches, of the same length.
+    #
+    # Raises a ValueError if the lengths differ or if a pair is not a valid
+    # Interval, e.g. a quintuply augmented third.
+    @classmethod
+    def between(cls, pitches1, pitches2):
+        codes1 = IntervalArray._codes(pitches1)
+        codes2 = IntervalArray._codes(pitches2)
+        if len(codes1) != len(codes2):
+            raise ValueError("The pitch arrays must have the same length")
+        ascending = codes1 <= codes2
+        sign = np.where(ascending, 1, -1)
+        low = np.where(ascending, codes1, codes2)
+        high = np.where(ascending, codes2, codes1)
+        steps = IntervalArray._steps(high) - IntervalArray._steps(low)
+        xoct, span = np.divmod(steps, 7)
+        adjust = IntervalArray._keynums(high) - IntervalArray._keynums(low) - IntervalArray._diatonic[span] - 12 * xoct
+        inside = (adjust >= -6) & (adjust <= 6)
+        qual = np.where(inside, IntervalArray._adjustQuals[(~IntervalArray._imperfect[span]).astype(np.int64),
+                                                           np.clip(adjust + 6, 0, 12)], -1)
+        # a unison span with extra octaves is an octave, see: _init_from_list()
+        octave = (span == Interval._unison_span) & (xoct > 0)
+        span = np.where(octave, Interval._octave_span, span)
+        xoct = np.where(octave, xoct - 1, xoct)
+        valid = (qual >= 0) & (xoct <= 10)
+        valid[valid] = IntervalArray._valid[span[valid], qual[valid], xoct[valid], (sign[valid] + 1) // 2]
+        if not np.all(valid):
+            index = int(np.argmin(valid))
+            raise ValueError(f"The pitches at index {index} do not form a valid interval")
+        return cls._wrap(span, qual, xoct, sign)
+
+    ## Returns the melodic intervals between the adjacent pitches of a voice.
+    # @param pitches An iterable of Pitches, or a NumPy array of their pos()
+    # values.
+    # @returns An IntervalArray one shorter than pitches.
+    @classmethod
+    def melodic(cls, pitches):
+        codes = IntervalArray._codes(pitches)
+        return cls.between(codes[:-1], codes[1:])
+
+    ## Returns the harmonic intervals from a lower voice to an upper voice
+    # at shared timepoints. See: between().
+    @classmethod
+    def harmonic(cls, lower, upper):
+        return cls.between(lower, upper)
+
+    ## Private static method that returns the pos() codes of an iterable of
+    # Pitches as an int64 array. An array is returned as it is. Raises a
+    # ValueError if a pitch is empty.
+    @staticmethod
+    def _codes(pitches):
+        if isinstance(pitches, np.ndarray):
+            return pitches.astype(np.int64, copy=False)
+        codes = []
+        for pitch in pitches:
+            if pitch.is_empty():
+                raise ValueError("An empty Pitch has no interval")
+            codes.append(pitch.pos())
+        return np.array(codes, dtype=np.int64)
+
+    ## Private static method that returns the lines and spaces above C00 of
+    # an array of pitch codes, (octave<<8) + (letter<<4) + accidental.
+    @staticmethod
+    def _steps(codes):
+        return (codes >> 8) * 7 + ((codes >> 4) & 0xF)
+
+    ## Private static method that returns the midi key numbers of an array
+    # of pitch codes. See: Pitch.keynum().
+    @staticmethod
+    def _keynums(codes):
+        return IntervalArray._letterSemitones[(codes >> 4) & 0xF] + (codes & 0xF) - 2 + 12 * (codes >> 8)
+
+    ## Returns the array as a list of (interned) Intervals.
+    def to_intervals(self):
+        interned = Interval._interned
+        return [interned[values] for values in zip(self.span.tolist(), self.qual.tolist(),
+                                                   self.xoct.tolist(), self.sign.tolist())]
+
+    ## Returns a list of the interval name of every element.
+    def strings(self):
+        return [interval.string() for interval in self.to_intervals()]
+
+    ## Returns a string showing the array's interval names and the hex id.
+    # Example: '<IntervalArray: [M2, -m3, P5] 0x10610d2b0>'
+    def __str__(self):
+        return f'<IntervalArray: [{", ".join(self.strings())}] {hex(id(self))}>'
+
+    ## Returns a string expression that will evaluate to this array.
+    def __repr__(self):
+        return f'IntervalArray({self.span.tolist()}, {self.qual.tolist()}, {self.xoct.tolist()}, {self.sign.tolist()})'
+
+    ## Returns the number of intervals in the array.
+    def __len__(self):
+        return len(self.span)
+
+    ## Implements IntervalArray iteration by returning an iterator of Intervals.
+    def __iter__(self):
+        return iter(self.to_intervals())
+
+    ## Implements array[index]. An integer index returns an Interval, a
+    # slice, integer array or boolean mask returns a new IntervalArray.
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Interval._interned[(int(self.span[index]), int(self.qual[index]),
+                                       int(self.xoct[index]), int(self.sign[index]))]
+        return IntervalArray._wrap(self.span[index], self.qual[index], self.xoct[index], self.sign[index])
+
+    ## Returns the semitones of every interval as an int64 array, positive like
+    # Interval.semitones().
+    def semitones(self):
+        return self._semitones
+
+    ## Returns the pos() of every interval as an int64 array. See: Interval.pos().
+    def pos(self):
+        return ((self.span + self.xoct * 7 + 1) << 8) + self.qual
+
+    ## Private method that returns a boolean array that is true where a
+    # flag bit is set.
+    def _flagged(self, flag):
+        return (self._flags & flag) != 0
+
+    ## Private method that implements is_unison() and similar.
+    def _is_span(self, span, qual):
+        mask = self._flagged(Interval._SPAN_FLAGS[span])
+        if qual is not None:
+            mask &= self.qual == Interval._qualityNames.get(qual, -1)
+        return mask
+
+    ## Returns a boolean array that is true for the unisons. See: Interval.is_unison().
+    def is_unison(self, qual=None):
+        return self._is_span(Interval._unison_span, qual)
+
+    ## Returns a boolean array that is true for the seconds. See: Interval.is_second().
+    def is_second(self, qual=None):
+        return self._is_span(Interval._2nd_span, qual)
+
+    ## Returns a boolean array that is true for the thirds. See: Interval.is_third().
+    def is_third(self, qual=None):
+        return self._is_span(Interval._3rd_span, qual)
+
+    ## Returns a boolean array that is true for the fourths. See: Interval.is_fourth().
+    def is_fourth(self, qual=None):
+        return self._is_span(Interval._4th_span, qual)
+
+    ## Returns a boolean array that is true for the fifths. See: Interval.is_fifth().
+    def is_fifth(self, qual=None):
+        return self._is_span(Interval._5th_span, qual)
+
+    ## Returns a boolean array that is true for the sixths. See: Interval.is_sixth().
+    def is_sixth(self, qual=None):
+        return self._is_span(Interval._6th_span, qual)
+
+    ## Returns a boolean array that is true for the sevenths. See: Interval.is_seventh().
+    def is_seventh(self, qual=None):
+        return self._is_span(Interval._7th_span, qual)
+
+    ## Returns a boolean array that is true for the octaves. See: Interval.is_octave().
+    def is_octave(self, qual=None):
+        return self._is_span(Interval._octave_span, qual)
+
+    ## Returns a boolean array that is true for the diminished intervals.
+    def is_diminished(self):
+        return self.qual < Interval._min_qual
+
+    ## Returns a boolean array that is true for the minor intervals.
+    def is_minor(self):
+        return self._flagged(Interval._MINOR)
+
+    ## Returns a boolean array that is true for the perfect intervals.
+    def is_perfect(self):
+        return self._flagged(Interval._PERFECT)
+
+    ## Returns a boolean array that is true for the major intervals.
+    def is_major(self):
+        return self._flagged(Interval._MAJOR)
+
+    ## Returns a boolean array that is true for the augmented intervals.
+    def is_augmented(self):
+        return self.qual > Interval._maj_qual
+
+    ## Returns a boolean array that is true for unisons, 4ths, 5ths and octaves.
+    def is_perfect_type(self):
+        return self._flagged(Interval._PERFECT_TYPE)
+
+    ## Returns a boolean array that is true for 2nds, 3rds, 6ths and 7ths.
+    def is_imperfect_type(self):
+        return self._flagged(Interval._IMPERFECT_TYPE)
+
+    ## Returns a boolean array that is true for the simple intervals.
+    def is_simple(self):
+        return self._flagged(Interval._SIMPLE)
+
+    ## Returns a boolean array that is true for the compound intervals.
+    def is_compound(self):
+        return ~self._flagged(Interval._SIMPLE)
+
+    ## Returns a boolean array that is true for the ascending intervals.
+    def is_ascending(self):
+        return self._flagged(Interval._ASCENDING)
+
+    ## Returns a boolean array that is true for the descending intervals.
+    def is_descending(self):
+        return ~self._flagged(Interval._ASCENDING)
+
+    ## Returns a boolean array that is true for the consonant intervals.
+    # See: Interval.is_consonant().
+    def is_consonant(self):
+        return self._flagged(Interval._CONSONANT)
+
+    ## Returns a boolean array that is true for the dissonant intervals.
+    # See: Interval.is_dissonant().
+    def is_dissonant(self):
+        return self._flagged(Interval._DISSONANT)
+
+
+IntervalArray._semitoneTable, IntervalArray._flagTable, IntervalArray._valid = _interval_tables()
+
+
+if __name__ == '__main__':
+    from .pitch import Pitch
+    soprano = [Pitch(name) for name in ['E5', 'D5', 'C5', 'B4', 'C5']]
+    bass = [Pitch(name) for name in ['C3', 'G2', 'A2', 'G2', 'C3']]
+    print(IntervalArray.melodic(soprano), IntervalArray.harmonic(bass, soprano))
+    print(IntervalArray.harmonic(bass, soprano).is_consonant())
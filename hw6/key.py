@@ -115,47 +115,95 @@ class Key:
     #
     # Examples: Fs-Dorian, Bf-Phrygian, B-Major
     def string(self):
-        for value in Key.keys:
-            if value == self.signum:
-                return f'{str(value)}-{self.mode}'
-
-    ## Returns a Pnum representing the key's tonic. The tonic can
-    # be calculated by transposing the Major tonic (Pnum) by the
-    # interval distance of the mode above the major. The
-    # transposition can be performed using that interval's transpose()
-    # method. The interval distances of Major up to Locrian are:
-    # P1, M2, M3, P4, P5, M6, M7.
+        return f'{self.tonic().name}-{self.mode}'
+
+    ## Returns a Pnum representing the key's tonic. The tonics of all keys
+    # are computed once when the module is loaded, see: _build_tables().
     #
     # Examples:
     # Key(0, "lydian").tonic() is Pnum F.
     # Key(2, "dorian").tonic() is Pnum E.
     # Key(-6, "phrygian").tonic() is Pnum Bf.
     def tonic(self):
-        if self.signum in Key.keys:
-            return Key.modeTranspose.get(self.mode).transpose(Key.keys.get(self.signum))
+        return Key._tonics[(self.signum, self.mode)]
 
     ## Returns a list of Pnums representing the unique pitches of the key's
     # diatonic scale. The octave completion should NOT be included in the list.
+    # The list is a new copy so callers may append to it.
     def scale(self):
-        if self.mode == "Major":
-            return self.makeScale(Key.majorIntervals)
-        elif self.mode == "Dorian":
-            return self.makeScale(Key.dorianIntervals)
-        elif self.mode == "Phrygian":
-            return self.makeScale(Key.phrygianIntervals)
-        elif self.mode == "Lydian":
-            return self.makeScale(Key.lydianIntervals)
-        elif self.mode == "Mixolydian":
-            return self.makeScale(Key.mixolydianIntervals)
-        elif self.mode == "Minor":
-            return self.makeScale(Key.minorIntervals)
-        elif self.mode == "Locrian":
-            return self.makeScale(Key.locrianIntervals)
-
-    def makeScale(self, intervals):
-        scale = []
-        pitch = self.tonic()
-        for i in intervals:
-            scale.append(pitch)
-            pitch = i.transpose(pitch)
-        return scale
\ No newline at end of file
+        return list(Key._scales[(self.signum, self.mode)])
+
+    ## Returns the scale with its seventh degree raised a semitone if the
+    # key is Minor (the harmonic minor scale), otherwise the same as scale().
+    def harmonic_scale(self):
+        return list(Key._harmonicScales[(self.signum, self.mode)])
+
+    ## Returns the scale with its sixth and seventh degrees raised a semitone
+    # if the key is Minor (the ascending melodic minor scale), otherwise the
+    # same as scale().
+    def melodic_scale(self):
+        return list(Key._melodicScales[(self.signum, self.mode)])
+
+    ## Returns the scale degree index 0-6 of a Pnum, e.g. 4 for G in C major,
+    # or None if the pnum is not in the key.
+    # @param pnum A Pnum.
+    # @param altered If true the raised sixth and seventh degrees of the
+    # melodic and harmonic minor scales count as degrees 5 and 6.
+    def degree(self, pnum, altered=False):
+        return Key._degrees[(self.signum, self.mode, altered)].get(pnum)
+
+    ## Returns the scale degree indexes 0-6 of many pnums as a NumPy array,
+    # with -1 for pnums that are not in the key. See: degree(). NumPy is
+    # imported on the first call and each key's lookup array is built once.
+    # @param pnums A sequence or NumPy array of Pnums or their integer
+    # values.
+    # @param altered See: degree().
+    def degrees(self, pnums, altered=False):
+        import numpy as np
+        key = (self.signum, self.mode, altered)
+        array = Key._degreeArrays.get(key)
+        if array is None:
+            degrees = Key._degrees[key]
+            array = np.full(128, -1, dtype=np.int64)
+            array[[int(pnum) for pnum in degrees]] = list(degrees.values())
+            array = Key._degreeArrays.setdefault(key, array)
+        return array[np.asarray(pnums, dtype=np.int64)]
+
+    ## Private class method that computes the tonic, scales and degree tables
+    # of every key once. The tonic is the Major tonic (Pnum) transposed by the
+    # interval distance of the mode above the major: P1, M2, M3, P4, P5, M6,
+    # M7 for Major up to Locrian. The scale is built from the tonic by the
+    # mode's rotation of the major scale's steps.
+    @classmethod
+    def _build_tables(cls):
+        rotations = {'Major': cls.majorIntervals, 'Dorian': cls.dorianIntervals,
+                     'Phrygian': cls.phrygianIntervals, 'Lydian': cls.lydianIntervals,
+                     'Mixolydian': cls.mixolydianIntervals, 'Minor': cls.minorIntervals,
+                     'Locrian': cls.locrianIntervals}
+        raised = Interval('+1')
+        cls._tonics, cls._scales, cls._harmonicScales, cls._melodicScales = {}, {}, {}, {}
+        cls._degrees, cls._degreeArrays = {}, {}
+        for signum, major in cls.keys.items():
+            for mode in cls.modeNames:
+                pnum = cls.modeTranspose[mode].transpose(major)
+                scale = []
+                for step in rotations[mode]:
+                    scale.append(pnum)
+                    pnum = step.transpose(pnum)
+                harmonic, melodic = list(scale), list(scale)
+                if mode == 'Minor':
+                    harmonic[6] = melodic[6] = raised.transpose(scale[6])
+                    melodic[5] = raised.transpose(scale[5])
+                key = (signum, mode)
+                cls._tonics[key] = scale[0]
+                cls._scales[key] = tuple(scale)
+                cls._harmonicScales[key] = tuple(harmonic)
+                cls._melodicScales[key] = tuple(melodic)
+                for altered in (False, True):
+                    degrees = {pnum: degree for degree, pnum in enumerate(scale)}
+                    if altered:
+                        degrees.update({melodic[5]: 5, melodic[6]: 6})
+                    cls._degrees[key + (altered,)] = degrees
+
+
+Key._build_tables()
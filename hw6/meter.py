@@ -139,3 +139,12 @@ class Meter:
     # and 3/2 returns a duration of 3/2. See: Ratio.
     def measure_dur(self):
         return Ratio(self.num, self.den)
+
+    ## Returns the MetricGrid of the meter at a tick resolution. Grids are
+    # computed once per meter and resolution and shared. MetricGrid needs
+    # NumPy, so it is imported on the first call. See: MetricGrid.get().
+    # @param resolution The number of ticks in a whole note, e.g. a
+    # Timebase's resolution.
+    def grid(self, resolution):
+        from .metricgrid import MetricGrid
+        return MetricGrid.get(self.num, self.den, resolution)
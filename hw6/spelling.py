@@ -0,0 +1,130 @@
+###############################################################################
+from .pitch import Pitch
+
+
+## A class that spells sequences of midi key numbers as Pitches.
+#
+# Pitch.from_keynum() spells every key number on its own, so a melody in
+# E major imported from MIDI comes out with Ab for G# and Eb for D#. The
+# Speller chooses each spelling from the notes around it instead, using the
+# line of fifths: every spelling has a position on the line (C is 0, G is 1,
+# F is -1, F# is 6, Bb is -2 ...) and the notes of one key sit close together
+# on it. Each note gets the spelling of its pitch class that is nearest to the
+# center of a sliding window of the spellings chosen for the previous notes,
+# pulled toward the center of the key if one is given. Ties go to the
+# spelling with fewer accidentals.
+#
+# The window is updated incrementally: its sum of line of fifths positions is
+# kept as notes enter and leave, so spelling a note is constant time no
+# matter how long the window is.
+#
+# Example:
+# @code
+# speller = Speller(Key(4, 'Major'))
+# pitches = speller.spell([64, 66, 68, 69, 71, 73, 75, 76])
+# # E4 F#4 G#4 A4 B4 C#5 D#5 E5
+# @endcode
+class Speller:
+
+    ## The line of fifths position of each natural letter index C-B.
+    _letterFifths = (0, 2, 4, -1, 1, 3, 5)
+
+    ## The letter index of each natural line of fifths position -1 (F) to
+    #  5 (B).
+    _fifthsLetter = {-1: 3, 0: 0, 1: 4, 2: 1, 3: 5, 4: 2, 5: 6}
+
+    ## The semitones above C of each letter index.
+    _letterSemitones = (0, 2, 4, 5, 7, 9, 11)
+
+    ## The spelling candidates of each pitch class as a tuple of line of
+    #  fifths positions from Fbb (-15) to B## (19), e.g. pc 0 is (-12, 0, 12)
+    #  for Dbb, C and B#.
+    _candidates = tuple(tuple(q for q in range(-15, 20) if (q * 7) % 12 == pc) for pc in range(12))
+
+    ## Creates a Speller.
+    #  @param key An optional Key (or any object with a signum attribute)
+    #  whose signature centers the spellings.
+    #  @param window The number of previous notes that set the center.
+    #  @param keyweight How many notes the key's center counts as. A large
+    #  value keeps spellings close to the key, a small one lets modulations
+    #  move them. Without a key a weak pull toward C major is used.
+    #  @param accweight The cost of each accidental, in line of fifths steps.
+    def __init__(self, key=None, window=8, keyweight=4.0, accweight=0.5):
+        if window < 1:
+            raise ValueError(f"The spelling window must hold at least one note, your input was {window}")
+        ## The line of fifths center of the key: the middle of its signature's
+        #  seven naturals, e.g. 2 (D) for C major and A minor.
+        self.keycenter = 2 + (key.signum if key is not None else 0)
+        self.keyweight = keyweight if key is not None else min(keyweight, 1.0)
+        self.window = window
+        self.accweight = accweight
+        self.reset()
+
+    ## Forgets the previous notes so the next note starts a new passage.
+    def reset(self):
+        self._recent = [0] * self.window
+        self._count = 0
+        self._sum = 0
+
+    ## Returns a string showing the speller's key center and window size.
+    def __str__(self):
+        return f'<Speller: center {self.keycenter}, window {self.window} {hex(id(self))}>'
+
+    ## Returns the line of fifths position chosen for one key number and adds
+    #  it to the window. See: letter_accidental().
+    #  @param keynum A midi key number 0-127.
+    def fifths(self, keynum):
+        filled = min(self._count, self.window)
+        center = (self.keyweight * self.keycenter + self._sum) / (self.keyweight + filled)
+        best = None
+        for q in Speller._candidates[keynum % 12]:
+            cost = abs(q - center) + self.accweight * abs((q + 1) // 7)
+            if best is None or cost < bestCost:
+                if Speller._octave(keynum, q) is not None:
+                    best, bestCost = q, cost
+        slot = self._count % self.window
+        if self._count >= self.window:
+            self._sum -= self._recent[slot]
+        self._recent[slot] = best
+        self._sum += best
+        self._count += 1
+        return best
+
+    ## Private static method that returns the octave index of a key number
+    #  spelled at line of fifths position q, or None if that spelling is
+    #  outside the pitch range.
+    @staticmethod
+    def _octave(keynum, q):
+        letter, accidental = Speller.letter_accidental(q)
+        octave = (keynum - Speller._letterSemitones[letter] - (accidental - 2)) // 12
+        return octave if 0 <= octave <= 10 else None
+
+    ## Returns the (letter, accidental) indexes of a line of fifths position,
+    #  e.g. 6 is (3, 3) for F#.
+    @staticmethod
+    def letter_accidental(q):
+        sharps, natural = divmod(q + 1, 7)
+        return Speller._fifthsLetter[natural - 1], sharps + 2
+
+    ## Spells one key number and returns its Pitch. The note is added to the
+    #  window so it influences the notes after it.
+    def spell_one(self, keynum):
+        if not 0 <= keynum <= 127:
+            raise ValueError(f"The key number must be in the midi range 0-127, your input was {keynum}")
+        q = self.fifths(keynum)
+        letter, accidental = Speller.letter_accidental(q)
+        return Pitch([letter, accidental, Speller._octave(keynum, q)])
+
+    ## Spells a sequence of key numbers in order.
+    #  @param keynums An iterable of midi key numbers 0-127.
+    #  @returns A list of Pitches.
+    def spell(self, keynums):
+        return [self.spell_one(int(keynum)) for keynum in keynums]
+
+
+## Spells a sequence of midi key numbers with a new Speller.
+#  @param keynums An iterable of midi key numbers 0-127.
+#  @param key An optional Key. See: Speller.
+#  @returns A list of Pitches.
+def spell(keynums, key=None, window=8):
+    return Speller(key, window).spell(keynums)
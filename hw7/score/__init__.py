@@ -1,3 +1,7 @@
+## transpose, keyfinder, scoretable and metricgrid require NumPy and are not
+# imported with the package; import them explicitly, e.g.
+# from hw7.score.transpose import Transposer
+# Timebase.metric_positions() imports NumPy when it is called.
 __all__ = [
     'interval',
     'pitch',
@@ -17,6 +21,7 @@ __all__ = [
     'staff',
     'part',
     'score',
+    'timebase',
     'mxml'
 ]
 
@@ -38,5 +43,6 @@ from .bar import *
 from .staff import *
 from .part import *
 from .score import *
+from .timebase import *
 from .mxml import *
 
@@ -0,0 +1,207 @@
+###############################################################################
+
+import numpy as np
+
+from .key import Key
+from .note import Note
+from .chord import Chord
+from .timebase import Timebase
+
+
+## A class that finds the keys of Scores by correlating their pitch class
+# content with major and minor key profiles.
+#
+# A score's pitch class histogram weights every pitch class by the number of
+# ticks it sounds (see: Timebase). Its Pearson correlation with the 24
+# rotations of a major and a minor profile rates every key; the best one is
+# the key of the score. The profiles are normalized once when the finder is
+# created, so rating a histogram is a single 12x24 matrix product.
+#
+# Modulating pieces are analyzed with a sliding window: the timeline of the
+# score is cut at every onset and offset, the pitch class weight sounding in
+# each slice is accumulated into prefix sums, and the histogram of any window
+# is then the difference of two interpolated prefix sums. Every window costs
+# the same constant time no matter how wide it is or how many notes it holds.
+# The per-window winners can be smoothed into key regions with a Viterbi pass
+# that charges a penalty for each change of key.
+#
+# Example:
+# @code
+# finder = KeyFinder()
+# key = finder.key(score)
+# for start, end, key in finder.regions(score, window=2, switch=0.5):
+#     ...
+# @endcode
+class KeyFinder:
+
+    ## Major and minor key profiles with their tonic at index 0. 'krumhansl'
+    #  are the Krumhansl-Kessler probe tone ratings, 'temperley' the
+    #  Kostka-Payne corpus profiles of Temperley (2001).
+    profiles = {
+        'krumhansl': ((6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88),
+                      (6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17)),
+        'temperley': ((0.748, 0.060, 0.488, 0.082, 0.670, 0.460, 0.096, 0.715, 0.104, 0.366, 0.057, 0.400),
+                      (0.712, 0.084, 0.474, 0.618, 0.049, 0.460, 0.105, 0.747, 0.404, 0.067, 0.133, 0.330))
+    }
+
+    ## Creates a KeyFinder.
+    # @param profile The name of one of the profiles, or a pair of 12 value
+    # major and minor profiles.
+    #
+    # Raises a ValueError if the profile name is unknown.
+    def __init__(self, profile='krumhansl'):
+        if isinstance(profile, str):
+            if profile not in KeyFinder.profiles:
+                raise ValueError(f"'{profile}' is not one of the key profiles {list(KeyFinder.profiles)}")
+            profile = KeyFinder.profiles[profile]
+        major, minor = (np.asarray(p, dtype=np.float64) for p in profile)
+        rows = [np.roll(major, pc) for pc in range(12)] + [np.roll(minor, pc) for pc in range(12)]
+        rows = np.array(rows) - np.mean(rows, axis=1, keepdims=True)
+        ## The 12x24 matrix of centered unit length profiles, one column
+        #  per key in the order of keys.
+        self.matrix = (rows / np.linalg.norm(rows, axis=1, keepdims=True)).T
+        ## The 24 candidate Keys: the major keys on C, C#... B, then the minor
+        #  keys on C, C#... B. Black key tonics use the signature with fewer
+        #  accidentals, and F# and D# for the six sharp keys.
+        self.keys = [Key(KeyFinder._signum(pc), 'Major') for pc in range(12)] + \
+                    [Key(KeyFinder._signum(pc + 3), 'Minor') for pc in range(12)]
+
+    ## Private static method that returns the signum -5..6 of the major key
+    # whose tonic is pitch class pc.
+    @staticmethod
+    def _signum(pc):
+        return (7 * pc + 5) % 12 - 5
+
+    ## Returns a string showing the number of keys and the hex id.
+    def __str__(self):
+        return f'<KeyFinder: {len(self.keys)} keys {hex(id(self))}>'
+
+    ## Returns the correlations of histograms with the 24 key profiles.
+    # @param histograms An array of 12 pitch class weights, or an array of
+    # them with the pitch classes on the last axis.
+    # @returns An array of correlations -1..1 with the keys on the last axis.
+    # A histogram with no content correlates 0 with every key.
+    def correlations(self, histograms):
+        histograms = np.asarray(histograms, dtype=np.float64)
+        centered = histograms - np.mean(histograms, axis=-1, keepdims=True)
+        norms = np.linalg.norm(centered, axis=-1, keepdims=True)
+        norms[norms == 0] = 1
+        return (centered / norms) @ self.matrix
+
+    ## Returns the duration weighted pitch class histogram of a score.
+    # @param score A Score.
+    # @param timebase An optional Timebase of the score, to reuse one that
+    # has already been built.
+    def histogram(self, score, timebase=None):
+        pcs, onsets, durs = KeyFinder._sounding(timebase or Timebase(score))
+        return np.bincount(pcs, weights=durs, minlength=12).astype(np.float64)
+
+    ## Returns the best Key of a score or of a pitch class histogram.
+    def key(self, score):
+        if not isinstance(score, np.ndarray):
+            score = self.histogram(score)
+        return self.keys[int(np.argmax(self.correlations(score)))]
+
+    ## Returns the key correlations of a sliding window centered on every
+    # onset of a score.
+    # @param score A Score.
+    # @param window The width of the window as a Ratio or a whole number of
+    # whole notes, e.g. 2 is two whole notes (two bars of 4/4).
+    # @param timebase An optional Timebase of the score.
+    # @returns A tuple (onsets, correlations): the distinct note onsets in
+    # ticks and an array with one row of 24 key correlations for each.
+    def timeline(self, score, window=2, timebase=None):
+        timebase = timebase or Timebase(score)
+        pcs, onsets, durs = KeyFinder._sounding(timebase)
+        if not len(pcs):
+            return np.zeros(0, dtype=np.int64), np.zeros((0, 24))
+        offsets = onsets + durs
+        points = np.unique(np.concatenate((onsets, offsets)))
+        # how many notes of each pitch class sound in each slice between
+        # two points, from +1 at each onset and -1 at each offset.
+        counts = np.zeros((len(points), 12))
+        np.add.at(counts, (np.searchsorted(points, onsets), pcs), 1)
+        np.add.at(counts, (np.searchsorted(points, offsets), pcs), -1)
+        counts = np.cumsum(counts, axis=0)
+        prefix = np.zeros((len(points), 12))
+        prefix[1:] = np.cumsum(counts[:-1] * np.diff(points)[:, None], axis=0)
+        centers = np.unique(onsets)
+        half = timebase.to_ticks(window) / 2
+        histograms = KeyFinder._accumulated(points, counts, prefix, centers + half) - \
+            KeyFinder._accumulated(points, counts, prefix, centers - half)
+        return centers, self.correlations(histograms)
+
+    ## Returns the keys of a score as a list of (start, end, Key) regions,
+    # with start and end in ticks of the score's Timebase.
+    # @param score A Score.
+    # @param window See: timeline().
+    # @param switch If None each onset takes the key of its window, else the
+    # keys are smoothed with a Viterbi pass that subtracts switch from the
+    # summed correlations for every change of key. Values around 0.5-2
+    # merge short tonicizations into their surrounding key.
+    # @param timebase An optional Timebase of the score.
+    def regions(self, score, window=2, switch=None, timebase=None):
+        timebase = timebase or Timebase(score)
+        onsets, correlations = self.timeline(score, window, timebase)
+        if not len(onsets):
+            return []
+        if switch is None:
+            path = np.argmax(correlations, axis=1)
+        else:
+            path = KeyFinder._viterbi(correlations, switch)
+        starts = np.flatnonzero(np.concatenate(([True], path[1:] != path[:-1])))
+        ends = list(onsets[starts[1:]]) + [timebase.length()]
+        return [(int(onsets[i]), int(end), self.keys[path[i]]) for i, end in zip(starts, ends)]
+
+    ## Private static method that returns the key indexes maximizing the
+    # summed correlations minus switch for each change of key.
+    @staticmethod
+    def _viterbi(correlations, switch):
+        states = np.arange(correlations.shape[1])
+        score = correlations[0].copy()
+        back = np.zeros(correlations.shape, dtype=np.int64)
+        for i in range(1, len(correlations)):
+            best = int(np.argmax(score))
+            stay = score >= score[best] - switch
+            back[i] = np.where(stay, states, best)
+            score = np.where(stay, score, score[best] - switch) + correlations[i]
+        path = np.zeros(len(correlations), dtype=np.int64)
+        path[-1] = np.argmax(score)
+        for i in range(len(correlations) - 1, 0, -1):
+            path[i - 1] = back[i, path[i]]
+        return path
+
+    ## Private static method that returns the pitch class weight accumulated
+    # from the start of the score up to each of the given ticks.
+    @staticmethod
+    def _accumulated(points, counts, prefix, ticks):
+        index = np.clip(np.searchsorted(points, ticks, side='right') - 1, 0, None)
+        elapsed = np.clip(ticks - points[index], 0, None)
+        return prefix[index] + counts[index] * elapsed[:, None]
+
+    ## Private static method that returns the pitch classes, onsets and
+    # durations in ticks of every sounding note of a Timebase as arrays.
+    @staticmethod
+    def _sounding(timebase):
+        pcs, onsets, durs = [], [], []
+        for onset, dur, pvid, note in timebase.events():
+            if isinstance(note, Chord):
+                notes = note.notes
+            elif isinstance(note, Note):
+                notes = (note,)
+            else:
+                continue
+            for n in notes:
+                if dur > 0:
+                    pcs.append(n.pitch.pc())
+                    onsets.append(onset)
+                    durs.append(dur)
+        return np.array(pcs, dtype=np.int64), np.array(onsets, dtype=np.int64), np.array(durs, dtype=np.int64)
+
+
+## Returns the best Key of each of many scores with one KeyFinder.
+# @param scores An iterable of Scores.
+# @param profile See: KeyFinder.
+def find_keys(scores, profile='krumhansl'):
+    finder = KeyFinder(profile)
+    return [finder.key(score) for score in scores]
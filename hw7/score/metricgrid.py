@@ -0,0 +1,112 @@
+###############################################################################
+
+import numpy as np
+
+
+## A class that holds the metric hierarchy of one measure of a meter on a
+# tick grid.
+#
+# The measure is divided level by level: into its strong beat groups (the
+# two halves of a quadruple measure), into beats, into the beat's division
+# (three for compound meters, two otherwise) and then in halves for as long
+# as the ticks allow. Every tick of the measure gets the beat it is in and
+# the strength level of the first division it starts: 0 for the downbeat,
+# beat_level for the other beats and larger numbers for weaker
+# subdivisions. Ticks that start no division get the weakest level,
+# len(spans). Simple meters (numerator 1-4) count a beat on every 1/den
+# note, compound meters (6, 9, 12, 15) on every 3/den note and complex
+# meters like 5/8 and 7/8 on every 1/den note.
+#
+# Both tables are NumPy arrays one measure long, so the metric position of
+# any onset, or of all the notes of a score at once, is one divmod and one
+# array lookup.
+#
+# Example:
+# @code
+# grid = MetricGrid.get(4, 4, 16)
+# grid.position(24)                  # (1, 2, 1): measure 1, beat 2 (the third)
+# measures, beats, strengths = grid.positions(onsets)
+# @endcode
+class MetricGrid:
+    ## Creates the grid of a meter.
+    # @param num The meter's numerator.
+    # @param den The meter's denominator.
+    # @param resolution The number of ticks in a whole note.
+    #
+    # Raises a ValueError if a measure or a beat is not a whole number of
+    # ticks at the resolution.
+    def __init__(self, num, den, resolution):
+        compound = num in (6, 9, 12, 15)
+        nbeats = num // 3 if compound else num
+        groups = [2, 2] if nbeats == 4 else [nbeats] if nbeats > 1 else []
+        division = 3 if compound else 2
+        self.num = num
+        self.den = den
+        self.resolution = resolution
+        ## The number of ticks in a measure.
+        self.length, extra = divmod(resolution * num, den)
+        if extra:
+            raise ValueError(f"A {num}/{den} measure is not a whole number of ticks at resolution {resolution}")
+        ## The tick length of the divisions at each strength level, from the
+        #  whole measure (level 0) down.
+        self.spans = [self.length]
+        for group in groups:
+            if self.spans[-1] % group:
+                raise ValueError(f"A {num}/{den} beat is not a whole number of ticks at resolution {resolution}")
+            self.spans.append(self.spans[-1] // group)
+        ## The strength level of the beats.
+        self.beat_level = len(self.spans) - 1
+        ## The number of ticks in a beat.
+        self.beat_ticks = self.spans[-1]
+        while self.spans[-1] > 1 and self.spans[-1] % division == 0:
+            self.spans.append(self.spans[-1] // division)
+            division = 2
+        ticks = np.arange(self.length)
+        ## The beat index (0 based) of every tick of the measure.
+        self.beats = ticks // self.beat_ticks
+        ## The strength level of every tick of the measure.
+        self.strengths = np.full(self.length, len(self.spans), dtype=np.int64)
+        for level in range(len(self.spans) - 1, -1, -1):
+            self.strengths[::self.spans[level]] = level
+
+    ## Returns the shared MetricGrid of a meter at a resolution, creating it
+    # on the first call. Meter.grid() and Timebase.metric_positions() both
+    # get their grids here, so each meter and resolution is computed once.
+    # @param num The meter's numerator.
+    # @param den The meter's denominator.
+    # @param resolution The number of ticks in a whole note.
+    @classmethod
+    def get(cls, num, den, resolution):
+        grid = cls._cache.get((num, den, resolution))
+        if grid is None:
+            grid = cls._cache.setdefault((num, den, resolution), cls(num, den, resolution))
+        return grid
+
+    ## Private cache of the grids created by get().
+    _cache = {}
+
+    ## Returns a string showing the meter, the resolution and the hex id.
+    # Example: '<MetricGrid: 6/8 at 48 0x1051a1690>'
+    def __str__(self):
+        return f'<MetricGrid: {self.num}/{self.den} at {self.resolution} {hex(id(self))}>'
+
+    ## Returns the (measure, beat, strength) of an onset.
+    # @param onset An onset in ticks.
+    # @param start The tick of the first downbeat; onsets before it (a
+    # pickup) are in measure -1.
+    def position(self, onset, start=0):
+        measure, offset = divmod(onset - start, self.length)
+        return measure, int(self.beats[offset]), int(self.strengths[offset])
+
+    ## Returns the measures, beats and strengths of many onsets as three
+    # NumPy arrays. See: position().
+    def positions(self, onsets, start=0):
+        measures, offsets = np.divmod(np.asarray(onsets, dtype=np.int64) - start, self.length)
+        return measures, self.beats[offsets], self.strengths[offsets]
+
+    ## Returns a boolean array that is true for the onsets on strong beats:
+    # the downbeat and the other strong beat groups, e.g. beats one and
+    # three of 4/4.
+    def strong(self, onsets, start=0):
+        offsets = np.mod(np.asarray(onsets, dtype=np.int64) - start, self.length)
+        return self.strengths[offsets] < max(self.beat_level, 1)
@@ -0,0 +1,222 @@
+###############################################################################
+
+from itertools import groupby
+
+import numpy as np
+
+from .pitch import Pitch
+from .ratio import Ratio
+from .note import Note
+from .chord import Chord
+from .rest import Rest
+from .voice import Voice
+from .bar import Bar
+from .staff import Staff
+from .part import Part
+from .score import Score
+from .timebase import Timebase
+
+
+## A class that stores a whole Score as columns of NumPy arrays, one row per
+# note or rest.
+#
+# The object tree of a Score needs five nested loops to reach its notes. A
+# ScoreTable flattens it once: every Rest, every Note and every note of a
+# Chord becomes a row, and each attribute becomes a column:
+#
+# - part, staff, bar, voice: the index of the row's part in the score, of
+#   its staff in the part, of its bar in the staff and of its voice's id in
+#   voice_ids.
+# - onset, dur: the onset and duration in ticks of the score's Timebase.
+# - num, den: the duration as a Ratio's numerator and denominator.
+# - pitch: the packed pitch, see: Pitch.pos(), or -1 for rests and empty
+#   pitches.
+# - rest: true for rests.
+# - chord: a number shared by the notes of one Chord, or -1.
+# - marks: a bit mask of the row's marks, bit i set for mark_types[i].
+#
+# Rows are grouped by voice (part, staff and voice id) and kept in time
+# order inside each group, so view() returns its rows as slices of the
+# columns: views of the same memory, not copies. to_score() rebuilds an
+# equivalent Score so code written for the object model keeps working.
+#
+# Example:
+# @code
+# table = ScoreTable(score)
+# soprano = table.view(0, 0, 1)
+# highest = soprano.pitch.max()
+# quarter_rests = np.count_nonzero(table.rest & (table.dur == table.resolution // 4))
+# @endcode
+class ScoreTable:
+
+    ## The names of the columns, in order.
+    columns = ('part', 'staff', 'bar', 'voice', 'onset', 'dur', 'num', 'den', 'pitch', 'rest', 'chord', 'marks')
+
+    ## Creates a ScoreTable from a Score.
+    # @param score The Score to flatten.
+    # @param timebase An optional Timebase of the score, to reuse one that
+    # has already been built.
+    def __init__(self, score, timebase=None):
+        timebase = timebase or Timebase(score)
+        ## The resolution of the onset and dur columns, in ticks per whole
+        #  note.
+        self.resolution = timebase.resolution
+        self.metadata = dict(score.metadata)
+        ## The (id, name, shortname) of each part.
+        self.parts = []
+        ## The staff ids of each part.
+        self.staffs = []
+        ## The (id, clef, key, meter, barline, partial, voice ids) of every
+        #  bar, keyed by its (part, staff, bar) indexes.
+        self.bars = {}
+        ## The distinct voice ids of the score; the voice column indexes it.
+        self.voice_ids = []
+        ## The distinct marks of the score; the marks column has one bit
+        #  for each.
+        self.mark_types = []
+        self._whole = True
+        groups = {}
+        voices, marks = {}, {}
+        chords = 0
+        for p, part in enumerate(score):
+            self.parts.append((part.id, part.name, part.shortname))
+            self.staffs.append([staff.id for staff in part])
+            for s, staff in enumerate(part):
+                for b, bar in enumerate(staff):
+                    self.bars[(p, s, b)] = (bar.id, bar.clef, bar.key, bar.meter, bar.barline, bar.partial,
+                                            tuple(voice.id for voice in bar))
+                    for voice in bar:
+                        if voice.id not in voices:
+                            voices[voice.id] = len(self.voice_ids)
+                            self.voice_ids.append(voice.id)
+                        v = voices[voice.id]
+                        rows = groups.setdefault((p, s, v), [])
+                        for durational in voice:
+                            onset, dur = timebase.onset(durational), timebase.dur(durational)
+                            ratio = durational.dur
+                            if isinstance(durational, Rest):
+                                rows.append((p, s, b, v, onset, dur, ratio.num, ratio.den, -1, True, -1, 0))
+                                continue
+                            if isinstance(durational, Chord):
+                                notes, chord = durational.notes, chords
+                                chords += 1
+                            else:
+                                notes, chord = (durational,), -1
+                            for note in notes:
+                                bits = 0
+                                for mark in note.marks:
+                                    if mark not in marks:
+                                        marks[mark] = len(self.mark_types)
+                                        self.mark_types.append(mark)
+                                    bits |= 1 << marks[mark]
+                                pitch = -1 if note.pitch.is_empty() else note.pitch.pos()
+                                rows.append((p, s, b, v, onset, dur, ratio.num, ratio.den, pitch, False, chord, bits))
+        ## Maps each (part, staff, voice) index triple to the slice of its
+        #  rows.
+        self.groups = {}
+        start = 0
+        for key, rows in groups.items():
+            self.groups[key] = slice(start, start + len(rows))
+            start += len(rows)
+        rows = [row for group in groups.values() for row in group]
+        values = list(zip(*rows)) if rows else [()] * len(ScoreTable.columns)
+        for name, column in zip(ScoreTable.columns, values):
+            setattr(self, name, np.array(column, dtype=bool if name == 'rest' else np.int64))
+
+    ## Returns a string showing the number of rows, the resolution and the
+    # hex id.
+    # Example: '<ScoreTable: 212 rows at 16 ticks per whole 0x10610d2b0>'
+    def __str__(self):
+        return f'<ScoreTable: {len(self)} rows at {self.resolution} ticks per whole {hex(id(self))}>'
+
+    ## Returns the number of rows.
+    def __len__(self):
+        return len(self.onset)
+
+    ## Returns a ScoreTable holding the rows of one voice. Its columns are
+    # views of this table's columns, so no data is copied and changes to
+    # them change this table.
+    # @param part The index of the part in the score.
+    # @param staff The index of the staff in the part.
+    # @param voice The voice id, e.g. 1.
+    #
+    # Raises a ValueError if no voice of the score has the id and a KeyError
+    # if the staff has no such voice.
+    def view(self, part, staff, voice):
+        return self._slice(self.groups[(part, staff, self.voice_ids.index(voice))])
+
+    ## Returns a list of the ScoreTables of every voice, in score order.
+    def views(self):
+        return [self._slice(rows) for rows in self.groups.values()]
+
+    ## Private method that returns a ScoreTable sharing this table's
+    # attributes with its columns sliced by rows.
+    def _slice(self, rows):
+        view = ScoreTable.__new__(ScoreTable)
+        view.__dict__.update(self.__dict__)
+        view._whole = False
+        for name in ScoreTable.columns:
+            setattr(view, name, getattr(self, name)[rows])
+        return view
+
+    ## Returns a boolean array that is true for the rows of notes that carry
+    # a mark. Marks that are not in the score match no rows.
+    def has_mark(self, mark):
+        if mark not in self.mark_types:
+            return np.zeros(len(self), dtype=bool)
+        return (self.marks >> self.mark_types.index(mark)) & 1 == 1
+
+    ## Returns the offset (onset + dur) of every row in ticks.
+    def offset(self):
+        return self.onset + self.dur
+
+    ## Returns a new Score with the same parts, staffs, bars, voices, notes,
+    # chords and rests as the score the table was made from. Bar clefs,
+    # keys, meters and barlines are shared with the original score. The
+    # table must be a whole score, not a view().
+    def to_score(self):
+        if not self._whole:
+            raise ValueError("Only a whole ScoreTable can be converted to a Score")
+        voices = {}
+        for (p, s, v), rows in self.groups.items():
+            for b, group in ScoreTable._runs(self.bar[rows]):
+                voices[(p, s, b, v)] = range(rows.start + group.start, rows.start + group.stop)
+        parts = []
+        for p, (partid, name, shortname) in enumerate(self.parts):
+            part = Part(partid, name, shortname)
+            part.score = self.metadata.get('work_title')
+            for s, staffid in enumerate(self.staffs[p]):
+                staff = Staff(staffid)
+                b = 0
+                while (p, s, b) in self.bars:
+                    barid, clef, key, meter, barline, partial, voiceids = self.bars[(p, s, b)]
+                    bar = Bar(barid, clef, key, meter, barline, partial)
+                    for voiceid in voiceids:
+                        voice = Voice(voiceid)
+                        rows = voices.get((p, s, b, self.voice_ids.index(voiceid)), range(0))
+                        for chord, group in groupby(rows, lambda i: self.chord[i] if self.chord[i] >= 0 else -1 - i):
+                            notes = [self._durational(i) for i in group]
+                            voice.add_note(Chord(notes) if chord >= 0 else notes[0])
+                        bar.add_voice(voice)
+                    staff.add_bar(bar)
+                    b += 1
+                part.add_staff(staff)
+            parts.append(part)
+        return Score(dict(self.metadata), parts)
+
+    ## Private method that returns a new Rest or Note for row i.
+    def _durational(self, i):
+        dur = Ratio(int(self.num[i]), int(self.den[i]))
+        if self.rest[i]:
+            return Rest(dur)
+        code = int(self.pitch[i])
+        pitch = Pitch() if code < 0 else Pitch([(code >> 4) & 0xF, code & 0xF, code >> 8])
+        return Note(pitch, dur, [mark for j, mark in enumerate(self.mark_types) if self.marks[i] >> j & 1])
+
+    ## Private static method that returns (value, slice) pairs for the runs
+    # of equal values in a sorted array.
+    @staticmethod
+    def _runs(values):
+        starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1]))) if len(values) else []
+        stops = list(starts[1:]) + [len(values)]
+        return [(int(values[start]), slice(int(start), int(stop))) for start, stop in zip(starts, stops)]
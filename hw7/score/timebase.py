@@ -0,0 +1,179 @@
+###############################################################################
+
+import math
+
+from .ratio import Ratio
+from .chord import Chord
+
+
+## A class that maps all the onsets and durations of a Score onto a single
+# integer tick grid, like the 'divisions' of a MusicXml file.
+#
+# When a Timebase is created it visits every Note, Rest and Chord in the score
+# once and computes the least common multiple of all their duration
+# denominators. That number is the timebase's resolution: the number of ticks
+# in a whole note (Ratio(1, 1)). Every duration and every onset in the score
+# is then an exact integer number of ticks, so timelines can be built, sorted
+# and tested for overlaps with plain integer arithmetic. Ticks convert back to
+# Ratios without loss. See: to_ticks(), to_ratio().
+#
+# Onsets are measured in ticks from the start of the score. The onset of a bar
+# is the sum of the durations of the bars before it in its staff, where the
+# duration of a bar is the duration of its longest voice.
+#
+# Example:
+# @code
+# tb = Timebase(score)
+# for onset, dur, pvid, note in tb.events():
+#     ...
+# tb.to_ratio(tb.onset(note))
+# @endcode
+class Timebase:
+    ## Initializes a Timebase and its attributes self.score, self.resolution,
+    # and self.bar_onsets.
+    # @param score The Score to build the timebase for.
+    def __init__(self, score):
+        self.score = score
+        ## The number of ticks in a whole note.
+        self.resolution = 1
+        ## Maps each Bar's id() to its onset in ticks.
+        self.bar_onsets = {}
+        self._onsets = {}
+        self._durs = {}
+        self._events = []
+        dens = set()
+        for part in score:
+            for staff in part:
+                for bar in staff:
+                    for voice in bar:
+                        for note in voice:
+                            dens.add(note.dur.den)
+        for den in dens:
+            self.resolution = self.resolution * den // math.gcd(self.resolution, den)
+        for part in score:
+            for staff in part:
+                barOnset = 0
+                for bar in staff:
+                    self.bar_onsets[id(bar)] = barOnset
+                    barDur = 0
+                    for voice in bar:
+                        onset = barOnset
+                        pvid = f'{part.id}.{voice.id}'
+                        for note in voice:
+                            dur = self.to_ticks(note.dur)
+                            self._add(note, onset, dur)
+                            self._events.append((onset, dur, pvid, note))
+                            onset += dur
+                        barDur = max(barDur, onset - barOnset)
+                    barOnset += barDur
+        self._events.sort(key=lambda e: e[0])
+
+    ## Private method that records the onset and duration of a durational,
+    # including the notes inside a chord.
+    def _add(self, note, onset, dur):
+        self._onsets[id(note)] = onset
+        self._durs[id(note)] = dur
+        if isinstance(note, Chord):
+            for n in note.notes:
+                self._onsets[id(n)] = onset
+                self._durs[id(n)] = dur
+
+    ## Returns a string showing the timebase's resolution and the
+    # hex id of the instance.
+    # Example: '<Timebase: 48 ticks per whole 0x109877c50>'
+    def __str__(self):
+        return f'<Timebase: {self.resolution} ticks per whole {hex(id(self))}>'
+
+    ## Define __repr__ to be the same as __str__ except there is
+    # no hex id included.
+    # Example: '<Timebase: 48 ticks per whole>'
+    def __repr__(self):
+        return f'<Timebase: {self.resolution} ticks per whole>'
+
+    ## Returns the number of ticks in a Ratio duration.
+    # @param ratio A Ratio or int beat duration.
+    # @returns An integer number of ticks.
+    #
+    # The method raises a ValueError if the ratio does not fall on the tick
+    # grid, i.e. its denominator does not divide the resolution.
+    def to_ticks(self, ratio):
+        if isinstance(ratio, int):
+            return ratio * self.resolution
+        ticks, extra = divmod(ratio.num * self.resolution, ratio.den)
+        if extra:
+            raise ValueError(f"{ratio.string()} is not on the tick grid of {self.resolution} ticks per whole")
+        return ticks
+
+    ## Returns the Ratio beat value of a number of ticks.
+    # @param ticks An integer number of ticks.
+    def to_ratio(self, ticks):
+        return Ratio(ticks, self.resolution)
+
+    ## Returns the onset of a Note, Rest or Chord in ticks from the start
+    # of the score. Raises a KeyError if the note is not in the score.
+    def onset(self, note):
+        return self._onsets[id(note)]
+
+    ## Returns the duration of a Note, Rest or Chord in ticks.
+    def dur(self, note):
+        return self._durs[id(note)]
+
+    ## Returns the tick at which a Note, Rest or Chord ends (onset + duration).
+    def offset(self, note):
+        return self._onsets[id(note)] + self._durs[id(note)]
+
+    ## Returns the onset of a Bar in ticks from the start of the score.
+    def bar_onset(self, bar):
+        return self.bar_onsets[id(bar)]
+
+    ## Returns true if the two notes sound at the same time for at least
+    # one tick.
+    def overlaps(self, note1, note2):
+        return self.onset(note1) < self.offset(note2) and self.onset(note2) < self.offset(note1)
+
+    ## Returns a list of (onset, dur, pvid, note) tuples for every Note, Rest
+    # and Chord in the score, sorted by onset. The onset and duration are
+    # ticks and pvid is the 'part and voice' identifier, e.g. 'P1.1'.
+    # Events with the same onset keep their score order.
+    def events(self):
+        return list(self._events)
+
+    ## Returns the total length of the score in ticks, i.e. the largest
+    # offset of any note.
+    def length(self):
+        return max((onset + dur for onset, dur, pvid, note in self._events), default=0)
+
+    ## Returns the metric position of every event of events() as three NumPy
+    # arrays (measures, beats, strengths) in the same order. The measure is
+    # the index of the event's bar in its staff, and the beat and strength
+    # come from the MetricGrid of the bar's meter, or of the last meter
+    # before it. A meter in one staff of a part applies to the same bar of
+    # the part's other staffs, like a MusicXml time signature. A partial bar
+    # is aligned so that it ends on a downbeat. Events with no meter before
+    # them get -1 for all three. Needs NumPy.
+    def metric_positions(self):
+        import numpy as np
+        from .metricgrid import MetricGrid
+        rows = {id(event[3]): i for i, event in enumerate(self._events)}
+        positions = np.full((3, len(self._events)), -1, dtype=np.int64)
+        for part in self.score:
+            meters = {}
+            for staff in part:
+                for number, bar in enumerate(staff):
+                    if bar.meter:
+                        meters.setdefault(number, bar.meter)
+            for staff in part:
+                meter = None
+                for number, bar in enumerate(staff):
+                    meter = bar.meter or meters.get(number) or meter
+                    notes = [note for voice in bar for note in voice]
+                    if meter is None or not notes:
+                        continue
+                    grid = MetricGrid.get(meter.num, meter.den, self.resolution)
+                    start = self.bar_onsets[id(bar)]
+                    if bar.partial:
+                        start = max(self.offset(note) for note in notes) - grid.length
+                    index = [rows[id(note)] for note in notes]
+                    measures, beats, strengths = grid.positions([self._onsets[id(note)] for note in notes], start)
+                    positions[:, index] = (measures + number, beats, strengths)
+        return positions[0], positions[1], positions[2]
@@ -0,0 +1,228 @@
+###############################################################################
+
+import numpy as np
+
+from .pitch import Pitch
+from .interval import Interval
+from .key import Key
+from .note import Note
+from .chord import Chord
+from .voice import Voice
+from .bar import Bar
+from .staff import Staff
+from .part import Part
+from .score import Score
+
+
+## A class that transposes Pitches, Keys and whole Scores by an Interval.
+#
+# Transposition keeps spelling: every pitch moves by the interval's lines
+# and spaces and its accidental makes up the semitones, so G# up a major
+# third is B#, not C, and key signatures move around the circle of fifths by
+# the same amount. See: Interval.transpose().
+#
+# A Score is transposed in one vectorized pass: the distinct Pitches of the
+# score are packed into an integer array (see: Pitch.pos()), transposed
+# with NumPy and mapped back to Pitches, then the score is rebuilt
+# around them. The transposed score gets new Parts, Staffs, Bars, Voices,
+# Notes and Chords, but shares everything a transposition does not change
+# with the original: the Ratio durations, Rests, marks, clefs, meters and
+# barlines.
+#
+# Example:
+# @code
+# up = Transposer(Interval('M2')).score(bach)
+# inc = Transposer.between_keys(bach.get_metadata('main_key'), Key(0, 'Major')).score(bach)
+# @endcode
+class Transposer:
+
+    ## The semitones above C of each letter index.
+    _letterSemitones = np.array([0, 2, 4, 5, 7, 9, 11], dtype=np.int64)
+
+    ## The line of fifths position of each natural letter index C-B.
+    _letterFifths = (0, 2, 4, -1, 1, 3, 5)
+
+    ## Creates a Transposer for an Interval.
+    # @param interval The Interval to transpose by, ascending or descending.
+    #
+    # Raises a TypeError if interval is not an Interval.
+    def __init__(self, interval):
+        if not isinstance(interval, Interval):
+            raise TypeError(f"{interval} is not an Interval")
+        self.interval = interval
+        ## The signed number of lines and spaces and semitones the
+        #  transposition moves.
+        self.steps = interval.sign * (interval.span + 7 * interval.xoct)
+        self.semitones = interval.sign * abs(interval.semitones())
+        # the line of fifths position of C transposed by the interval, e.g.
+        # 1 (G) for P5 and -2 (Bb) for M2 descending.
+        octave, letter = divmod(self.steps, 7)
+        sharps = self.semitones - int(Transposer._letterSemitones[letter]) - 12 * octave
+        ## The number of sharps (positive) or flats a key signature gains.
+        self.fifths = Transposer._letterFifths[letter] + 7 * sharps
+
+    ## Returns the Transposer that moves music in fromkey to the tonic of
+    # tokey by the smallest interval, up or down (up for a tritone).
+    # @param fromkey The Key of the music.
+    # @param tokey The Key to transpose to, in the same mode.
+    #
+    # Raises a ValueError if the two keys have different modes.
+    @classmethod
+    def between_keys(cls, fromkey, tokey):
+        if fromkey.mode != tokey.mode:
+            raise ValueError(f"Cannot transpose from {fromkey.mode} to {tokey.mode}, the modes differ")
+        low, high = (Pitch(pnum.name + '4') for pnum in (fromkey.tonic(), tokey.tonic()))
+        interval = Interval(low, high)
+        size = abs(interval.semitones())
+        if size > 6 or (interval.is_descending() and size >= 6):
+            # the other direction is smaller: move the target an octave
+            high = Pitch(tokey.tonic().name + ('3' if interval.is_ascending() else '5'))
+            interval = Interval(low, high)
+        return cls(interval)
+
+    ## Returns a string showing the transposition interval and the hex id.
+    # Example: '<Transposer: -M2 0x10610d2b0>'
+    def __str__(self):
+        return f'<Transposer: {self.interval.string()} {hex(id(self))}>'
+
+    ## Transposes an array of packed pitch codes.
+    # @param codes A NumPy array (or sequence) of Pitch.pos() values.
+    # @returns A NumPy array with the codes of the transposed pitches.
+    #
+    # Raises a ValueError if a transposed pitch needs more than a double
+    # sharp or flat or is outside the midi range.
+    def codes(self, codes):
+        codes = np.asarray(codes, dtype=np.int64)
+        octaves, letters, accidentals = codes >> 8, (codes >> 4) & 0xF, codes & 0xF
+        keynums = Transposer._letterSemitones[letters] + accidentals - 2 + 12 * octaves + self.semitones
+        octaves, letters = np.divmod(7 * octaves + letters + self.steps, 7)
+        accidentals = keynums - Transposer._letterSemitones[letters] - 12 * octaves + 2
+        bad = (accidentals < 0) | (accidentals > 4) | (keynums < 0) | (keynums > 127)
+        if np.any(bad):
+            raise ValueError(f"Transposing by {self.interval.string()} moves pitches out of range"
+                             f" or past double sharps and flats")
+        return (octaves << 8) + (letters << 4) + accidentals
+
+    ## Returns a dictionary mapping the pos() of each of the distinct
+    # non-empty Pitches to its transposition, computed with one call to
+    # codes(). Pitches are not hashable, so their codes are the keys.
+    def pitch_map(self, pitches):
+        codes = list({pitch.pos() for pitch in pitches if not pitch.is_empty()})
+        return {code: Pitch([(new >> 4) & 0xF, new & 0xF, new >> 8])
+                for code, new in zip(codes, self.codes(codes).tolist())}
+
+    ## Returns a list of the transposed Pitches, in order. Empty pitches are
+    # returned as they are.
+    def pitches(self, pitches):
+        pitches = list(pitches)
+        mapping = self.pitch_map(pitches)
+        return [Transposer._mapped(pitch, mapping) for pitch in pitches]
+
+    ## Returns the transposed Key, in the same mode. A None key is returned
+    # as it is.
+    #
+    # Raises a ValueError if the new signature needs more than seven sharps
+    # or flats, e.g. C# major up a major second.
+    def key(self, key):
+        if key is None:
+            return None
+        return Key(key.signum + self.fifths, key.mode)
+
+    ## Returns a transposed copy of a Voice. See: score().
+    def voice(self, voice):
+        return self._voice(voice, self.pitch_map(Transposer._voice_pitches(voice)))
+
+    ## Returns a transposed copy of a Score. Keys in the bars and the
+    # 'main_key' metadata are transposed too. See: Transposer.
+    def score(self, score):
+        pitches = (pitch for part in score for staff in part for bar in staff
+                   for pitch in Transposer._bar_pitches(bar))
+        mapping = self.pitch_map(pitches)
+        keys = {}
+        metadata = dict(score.metadata)
+        if isinstance(metadata.get('main_key'), Key):
+            metadata['main_key'] = self._key(metadata['main_key'], keys)
+        parts = []
+        for part in score:
+            copy = Part(part.id, part.name, part.shortname)
+            copy.score = part.score
+            for staff in part:
+                copy.add_staff(self._staff(staff, mapping, keys))
+            parts.append(copy)
+        return Score(metadata, parts)
+
+    ## Private method that returns the transposed Key of a key, transposing
+    # each distinct key once.
+    def _key(self, key, keys):
+        if key is None:
+            return None
+        transposed = keys.get(id(key))
+        if transposed is None:
+            transposed = keys.setdefault(id(key), self.key(key))
+        return transposed
+
+    ## Private method that returns a transposed copy of a Staff.
+    def _staff(self, staff, mapping, keys):
+        copy = Staff(staff.id)
+        for bar in staff:
+            new = Bar(bar.id, bar.clef, self._key(bar.key, keys), bar.meter, bar.barline, bar.partial)
+            for voice in bar:
+                new.add_voice(self._voice(voice, mapping))
+            copy.add_bar(new)
+        return copy
+
+    ## Private method that returns a transposed copy of a Voice. Rests are
+    # shared with the original voice.
+    def _voice(self, voice, mapping):
+        copy = Voice(voice.id)
+        for durational in voice:
+            if isinstance(durational, Note):
+                durational = Note(Transposer._mapped(durational.pitch, mapping), durational.dur, durational.marks)
+            elif isinstance(durational, Chord):
+                durational = Chord([Note(Transposer._mapped(note.pitch, mapping), note.dur, note.marks)
+                                    for note in durational.notes])
+            copy.add_note(durational)
+        return copy
+
+    ## Private static method that returns the transposition of a pitch from
+    # a pitch_map(), or the pitch itself if it is empty.
+    @staticmethod
+    def _mapped(pitch, mapping):
+        return pitch if pitch.is_empty() else mapping[pitch.pos()]
+
+    ## Private static method that yields the Pitches of the notes and chords
+    # of a voice.
+    @staticmethod
+    def _voice_pitches(voice):
+        for durational in voice:
+            if isinstance(durational, Note):
+                yield durational.pitch
+            elif isinstance(durational, Chord):
+                for note in durational.notes:
+                    yield note.pitch
+
+    ## Private static method that yields the Pitches of every voice of a bar.
+    @staticmethod
+    def _bar_pitches(bar):
+        for voice in bar:
+            yield from Transposer._voice_pitches(voice)
+
+
+## Returns a copy of a Score transposed by an Interval. See: Transposer.
+def transpose(score, interval):
+    return Transposer(interval).score(score)
+
+
+## Returns a copy of a Score transposed to the tonic of a Key, e.g. to C for
+# corpus statistics. The score's key is read from its 'main_key' metadata,
+# or from its first bar if there is none.
+#
+# Raises a ValueError if the score has no key or its mode differs from the
+# mode of key.
+def transpose_to_key(score, key):
+    fromkey = score.get_metadata('main_key')
+    if not isinstance(fromkey, Key):
+        fromkey = next((bar.key for part in score for staff in part for bar in staff if bar.key is not None), None)
+    if fromkey is None:
+        raise ValueError("The score has no key to transpose from")
+    return Transposer.between_keys(fromkey, key).score(score)
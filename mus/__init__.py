@@ -1,9 +1,14 @@
+## The modules that only need the standard library are imported with the
+#  package. ratioarray, quantize, tuning, segment, pitchdetect, render and
+#  pcset require NumPy and are imported explicitly, e.g.
+#  from mus.ratioarray import RatioArray
 __all__ = [
     'tet',
-    'ratio'
+    'ratio',
+    'durations'
 ]
 
 from .tet import *
 from .ratio import *
-
+from .durations import *
 
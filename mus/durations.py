@@ -0,0 +1,147 @@
+###############################################################################
+## @file
+#  A precomputed vocabulary of every notatable duration.
+#
+#  A notated duration is a base value (breve, whole, half ... 128th), zero to
+#  three augmentation dots and an optional tuplet. This module enumerates all
+#  the combinations once at import and keeps two frozen dictionaries so that
+#  exporters and quantizers can go in either direction with a single lookup:
+#  * duration(base, dots, tuplet) - the Ratio value of a notation.
+#  * notation(ratio) - the simplest notation of a Ratio value.
+#
+#  Values that cannot be written as a single note can be split into the fewest
+#  tied notatable values with tied(). See also: Ratio.dotted(), Ratio.tuplets().
+
+from collections import namedtuple
+from types import MappingProxyType
+
+from .ratio import Ratio
+
+## The notated base values from the breve (2/1) down to the 128th note.
+BASE_VALUES = tuple([Ratio(2, 1)] + [Ratio(1, 2 ** i) for i in range(8)])
+
+## The largest number of augmentation dots.
+MAX_DOTS = 3
+
+## The largest number of dots on a note inside a tuplet. Multiply dotted
+#  tuplet notes are legal but nobody wants to read them, so values like 5/8
+#  are tied from plain values instead.
+MAX_TUPLET_DOTS = 1
+
+## The common tuplets as (num, intimeof) pairs: num notes in the time of
+#  intimeof, e.g. (3, 2) is a triplet. The order is the order of preference
+#  when two tuplets produce the same value. See: Ratio.tuplets().
+TUPLETS = ((3, 2), (5, 4), (6, 4), (7, 4), (7, 8), (9, 8), (2, 3), (4, 3))
+
+## A notated duration: a base Ratio, the number of dots 0-3 and a tuplet
+#  (num, intimeof) pair or None.
+Notation = namedtuple('Notation', ['base', 'dots', 'tuplet'])
+
+
+## Returns a string name for a Notation, e.g. '1/4', '1/8..' or '1/8 3:2'.
+def notation_string(nota):
+    name = nota.base.string() + '.' * nota.dots
+    if nota.tuplet is not None:
+        name += f' {nota.tuplet[0]}:{nota.tuplet[1]}'
+    return name
+
+
+## Private helper that builds the two lookup tables. Notations are visited
+#  plainest first (no tuplet, then fewer dots) so that when several notations
+#  share a value the simplest one is the one stored for it.
+def _build_tables():
+    values = {}
+    notations = {}
+    for tuplet in (None,) + TUPLETS:
+        for dots in range((MAX_DOTS if tuplet is None else MAX_TUPLET_DOTS) + 1):
+            for base in BASE_VALUES:
+                value = base.dotted(dots) if dots else base
+                if tuplet is not None:
+                    value = value * tuplet[1] / tuplet[0]
+                nota = Notation(base, dots, tuplet)
+                values[nota] = value
+                notations.setdefault(value, nota)
+    return MappingProxyType(values), MappingProxyType(notations)
+
+
+## Two read only dictionaries: NOTATION_VALUES maps every Notation to its
+#  Ratio value and VALUE_NOTATIONS maps every notatable Ratio value to its
+#  simplest Notation.
+NOTATION_VALUES, VALUE_NOTATIONS = _build_tables()
+
+## The notatable values that are not tuplets, largest first. See: tied().
+_PLAIN_VALUES = tuple(sorted((v for v, n in VALUE_NOTATIONS.items() if n.tuplet is None), reverse=True))
+
+
+## Returns the Ratio value of a notated duration.
+#  @param base One of the BASE_VALUES Ratios.
+#  @param dots The number of augmentation dots 0-3 (0-1 inside a tuplet).
+#  @param tuplet A (num, intimeof) pair from TUPLETS or None.
+#
+#  The function raises a ValueError if the notation is not in the vocabulary.
+def duration(base, dots=0, tuplet=None):
+    try:
+        return NOTATION_VALUES[Notation(base, dots, tuple(tuplet) if tuplet else None)]
+    except KeyError:
+        raise ValueError(f"{base} with {dots} dot(s) and tuplet {tuplet} is not a notatable duration")
+
+
+## Returns the simplest Notation of a Ratio value, or None if the value
+#  cannot be notated as a single note. See: tied().
+def notation(ratio):
+    return VALUE_NOTATIONS.get(ratio)
+
+
+## Returns true if the Ratio can be notated as a single note.
+def is_notatable(ratio):
+    return ratio in VALUE_NOTATIONS
+
+
+## Splits a Ratio into the fewest notatable values that, tied together, sum
+#  to the Ratio. The values are returned largest first. A value that is
+#  already notatable is returned as a one element list.
+#  @param ratio A positive Ratio.
+#  @returns A list of Notations.
+#
+#  Values longer than the longest notation are first filled with tied
+#  breves. The rest is split using only the notatable values whose
+#  denominators divide the ratio's denominator (a coin change over the
+#  ratio's own grid, without tuplets if the denominator is a power of 2),
+#  so a 5/8 becomes [1/2, 1/8] and 7/12 becomes [1/2, 1/8 3:2]. A ValueError
+#  is raised if the ratio is not positive or cannot be split into notatable
+#  values.
+def tied(ratio):
+    if not isinstance(ratio, Ratio) or ratio.num <= 0:
+        raise ValueError(f"Only a positive Ratio can be split into tied values, your input was {ratio}")
+    nota = VALUE_NOTATIONS.get(ratio)
+    if nota is not None:
+        return [nota]
+    result = []
+    longest = BASE_VALUES[0]
+    while ratio > _PLAIN_VALUES[0]:
+        result.append(VALUE_NOTATIONS[longest])
+        ratio = ratio - longest
+    if ratio.num == 0:
+        return result
+    den = ratio.den
+    # a power of two grid is split into plain values only, tuplets are
+    # reserved for the grids that need them.
+    vocab = _PLAIN_VALUES if den & (den - 1) == 0 else VALUE_NOTATIONS
+    coins = sorted({v.num * (den // v.den) for v in vocab if den % v.den == 0}, reverse=True)
+    units = ratio.num
+    # fewest[n] is the fewest coins that sum to n units, last[n] the coin used
+    fewest = [0] + [None] * units
+    last = [0] * (units + 1)
+    for n in range(1, units + 1):
+        for coin in coins:
+            if coin <= n and fewest[n - coin] is not None:
+                if fewest[n] is None or fewest[n - coin] + 1 < fewest[n]:
+                    fewest[n] = fewest[n - coin] + 1
+                    last[n] = coin
+    if fewest[units] is None:
+        raise ValueError(f"{ratio.string()} cannot be split into notatable durations")
+    values = []
+    while units:
+        values.append(last[units])
+        units -= last[units]
+    return result + [VALUE_NOTATIONS[Ratio(v, den)] for v in sorted(values, reverse=True)]
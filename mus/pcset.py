@@ -0,0 +1,352 @@
+###############################################################################
+## @file
+#  Pitch-class sets stored as 12 bit integers, with set-class tables.
+#
+#  Bit pc of a set is 1 if the set holds pitch class pc, e.g. the C major
+#  triad {0, 4, 7} is 0b000010010001. Union, intersection, complement and
+#  subset tests are single integer operations and transposition is a 12 bit
+#  rotation. Because there are only 4096 sets, the normal form, prime form,
+#  Forte name and interval-class vector of every one of them are computed
+#  once when the module is loaded, so classifying a set is a table lookup.
+#  The tables are NumPy arrays, so a whole array of sets (e.g. the sonority
+#  at every timepoint of a chorale) is classified with one indexing
+#  operation, see: keynums_to_bits() and forte_names().
+#
+#  Normal forms and prime forms follow Rahn: the most compact rotation,
+#  comparing the interval from the first pitch class to the last, then to
+#  the second to last and so on. For the six set classes where Rahn and
+#  Forte differ (5-20, 6-Z29, 6-31, 7-Z18, 7-20 and 8-26) the prime form is
+#  Rahn's but the Forte name is the same.
+
+import numpy as np
+
+## Forte's prime forms of the trichords to hexachords in catalogue order,
+#  written with T for 10. The Z-related sets are listed in _FORTE_Z. The
+#  names of the larger sets are those of their complements, e.g. 7-35 is the
+#  complement of 5-35.
+_FORTE_PRIMES = {
+    3: ('012', '013', '014', '015', '016', '024', '025', '026', '027', '036', '037', '048'),
+    4: ('0123', '0124', '0134', '0125', '0126', '0127', '0145', '0156', '0167', '0235',
+        '0135', '0236', '0136', '0237', '0146', '0157', '0347', '0147', '0148', '0158',
+        '0246', '0247', '0257', '0248', '0268', '0358', '0258', '0369', '0137'),
+    5: ('01234', '01235', '01245', '01236', '01237', '01256', '01267', '02346', '01246', '01346',
+        '02347', '01356', '01248', '01257', '01268', '01347', '01348', '01457', '01367', '01378',
+        '01458', '01478', '02357', '01357', '02358', '02458', '01358', '02368', '01368', '01468',
+        '01369', '01469', '02468', '02469', '02479', '01247', '03458', '01258'),
+    6: ('012345', '012346', '012356', '012456', '012367', '012567', '012678', '023457', '012357', '013457',
+        '012457', '012467', '013467', '013458', '012458', '014568', '012478', '012578', '013478', '014589',
+        '023468', '012468', '023568', '013468', '013568', '013578', '013469', '013569', '013689', '013679',
+        '013589', '024579', '023579', '013579', '02468T', '012347', '012348', '012378', '023458', '012358',
+        '012368', '012369', '012568', '012569', '023469', '012469', '012479', '012579', '013479', '014679'),
+}
+
+## The catalogue numbers of the Z-related sets of each cardinality.
+_FORTE_Z = {
+    4: (15, 29),
+    5: (12, 17, 18, 36, 37, 38),
+    6: (3, 4, 6, 10, 11, 12, 13, 17, 19, 23, 24, 25, 26, 28, 29, 36, 37, 38, 39, 40, 41, 42, 43,
+        44, 45, 46, 47, 48, 49, 50),
+}
+
+
+## Returns the 12 bit integer of an iterable of pitch classes.
+def _bits(pcs):
+    bits = 0
+    for pc in pcs:
+        bits |= 1 << (pc % 12)
+    return bits
+
+
+## Returns the pitch classes of a 12 bit integer in ascending order.
+def _pcs(bits):
+    return tuple(pc for pc in range(12) if bits >> pc & 1)
+
+
+## Returns a 12 bit set transposed up by n semitones.
+def _rotate(bits, n):
+    n %= 12
+    return ((bits << n) | (bits >> (12 - n))) & 0xFFF
+
+
+## Returns the normal form of a 12 bit set and its comparison key: the
+#  intervals from the first pitch class to the last, second to last ... of
+#  the most compact rotation.
+def _normal_form(bits):
+    pcs = _pcs(bits)
+    best = key = None
+    for i in range(len(pcs)):
+        rotation = pcs[i:] + tuple(pc + 12 for pc in pcs[:i])
+        k = tuple(pc - rotation[0] for pc in reversed(rotation[1:]))
+        if key is None or k < key:
+            best, key = rotation, k
+    return tuple(pc % 12 for pc in best or ()), key or ()
+
+
+## Returns the prime form of a 12 bit set as a 12 bit set: the more compact
+#  of the normal forms of the set and its inversion, transposed to 0.
+def _prime_form(bits):
+    forms = []
+    for b in (bits, _bits(-pc for pc in _pcs(bits))):
+        normal, key = _normal_form(b)
+        forms.append((key, _bits(pc - normal[0] for pc in normal) if normal else 0))
+    return min(forms)[1]
+
+
+## Returns the interval-class vector of a 12 bit set as a tuple of six
+#  counts, one per interval class 1-6.
+def _icv(bits):
+    pcs = _pcs(bits)
+    vector = [0] * 6
+    for i, a in enumerate(pcs):
+        for b in pcs[i + 1:]:
+            ic = min(b - a, 12 - (b - a))
+            vector[ic - 1] += 1
+    return tuple(vector)
+
+
+## Private helper that builds the set-class tables.
+def _build_tables():
+    normals = tuple(_normal_form(bits)[0] for bits in range(4096))
+    # the prime form and vector are shared by the 24 transpositions and
+    # inversions of a set, so each is computed once per set class.
+    primes = [None] * 4096
+    icvs = [None] * 4096
+    for bits in range(4096):
+        if primes[bits] is None:
+            prime, icv = _prime_form(bits), _icv(bits)
+            for b in (bits, _bits(-pc for pc in _pcs(bits))):
+                for n in range(12):
+                    primes[_rotate(b, n)], icvs[_rotate(b, n)] = prime, icv
+    primes = np.array(primes, dtype=np.int64)
+    icvs = np.array(icvs, dtype=np.int64)
+    # the Forte name of each prime form, the sets outside 3-9 named by
+    # cardinality and interval class like 2-5 (perfect fourth).
+    names = {0: '0-1', 0xFFF: '12-1', 1: '1-1', _prime_form(0xFFE): '11-1'}
+    for ic in range(1, 7):
+        prime = _prime_form(1 | 1 << ic)
+        names[prime] = f'2-{ic}'
+        names[_prime_form(0xFFF ^ prime)] = f'10-{ic}'
+    for card, forms in _FORTE_PRIMES.items():
+        for number, form in enumerate(forms, 1):
+            z = 'Z' if number in _FORTE_Z.get(card, ()) else ''
+            prime = _prime_form(_bits('0123456789TE'.index(pc) for pc in form))
+            names[prime] = f'{card}-{z}{number}'
+            if card < 6:
+                names[_prime_form(0xFFF ^ prime)] = f'{12 - card}-{z}{number}'
+    classes = tuple(sorted(set(names.values()), key=lambda n: (int(n.split('-')[0]), int(n.split('-')[1].lstrip('Z')))))
+    index = {name: i for i, name in enumerate(classes)}
+    forte = np.array([index[names[prime]] for prime in primes.tolist()], dtype=np.int64)
+    for table in (primes, icvs, forte):
+        table.flags.writeable = False
+    return normals, primes, icvs, classes, forte
+
+
+## The tables indexed by 12 bit set:
+#  * NORMAL_FORMS - the normal form of every set as a tuple of pitch classes.
+#  * PRIME_FORMS - the prime form of every set as a 12 bit set.
+#  * IC_VECTORS - the interval-class vector of every set, a 4096 x 6 array.
+#  * FORTE_INDEX - the index of every set's Forte name in SET_CLASSES.
+#
+#  SET_CLASSES holds the 224 Forte names from '0-1' to '12-1' in catalogue
+#  order. All the arrays are read only.
+NORMAL_FORMS, PRIME_FORMS, IC_VECTORS, SET_CLASSES, FORTE_INDEX = _build_tables()
+
+## The number of pitch classes in every 12 bit set.
+CARDINALITIES = np.array([bin(bits).count('1') for bits in range(4096)], dtype=np.int64)
+CARDINALITIES.flags.writeable = False
+
+## The prime form (as a 12 bit set) of every Forte name.
+_NAME_PRIMES = {SET_CLASSES[FORTE_INDEX[prime]]: prime for prime in sorted(set(PRIME_FORMS.tolist()))}
+
+## The inversion around 0 of every 12 bit set.
+_INVERSIONS = tuple(_bits(-pc for pc in _pcs(bits)) for bits in range(4096))
+
+
+## A class that represents an immutable set of pitch classes 0-11.
+#
+#  PcSets are interned: there is exactly one PcSet per 12 bit value, so
+#  equal sets are the same object and creating one is a table lookup.
+#  Comparisons follow Python sets: a <= b is true if a is a subset of b.
+#
+#  Example:
+#  @code
+#  triad = PcSet([0, 4, 7])
+#  triad.transpose(2)            # PcSet([2, 6, 9])
+#  triad.forte(), triad.icv()    # ('3-11', (0, 0, 1, 1, 1, 0))
+#  triad <= PcSet.from_keynums([60, 62, 64, 65, 67, 69, 71])  # True
+#  @endcode
+class PcSet:
+
+    __slots__ = ('bits',)
+
+    ## Returns the PcSet of an iterable of pitch classes. Any integer is
+    #  taken modulo 12, so key numbers work too. See also: from_bits(),
+    #  from_keynums(), from_pitches(), from_forte().
+    def __new__(cls, pcs=()):
+        return PcSet._sets[_bits(pcs)]
+
+    ## Private class method that creates the PcSet of a 12 bit integer.
+    @classmethod
+    def _create(cls, bits):
+        pcset = object.__new__(cls)
+        object.__setattr__(pcset, 'bits', bits)
+        return pcset
+
+    ## Returns the PcSet of a 12 bit integer.
+    #  Raises a ValueError if bits is not between 0 and 4095.
+    @staticmethod
+    def from_bits(bits):
+        if not 0 <= bits <= 0xFFF:
+            raise ValueError(f"A pitch-class set must be between 0 and 4095, your input was {bits}")
+        return PcSet._sets[bits]
+
+    ## Returns the PcSet of the pitch classes of an iterable of midi key
+    #  numbers.
+    @staticmethod
+    def from_keynums(keynums):
+        return PcSet(keynums)
+
+    ## Returns the PcSet of an iterable of Pitches (or anything with a pc()
+    #  method).
+    @staticmethod
+    def from_pitches(pitches):
+        return PcSet(pitch.pc() for pitch in pitches)
+
+    ## Returns the prime form PcSet of a Forte name, e.g. '4-Z15'.
+    #  Raises a ValueError if the name is not in SET_CLASSES.
+    @staticmethod
+    def from_forte(name):
+        try:
+            return PcSet._sets[_NAME_PRIMES[name]]
+        except KeyError:
+            raise ValueError(f"'{name}' is not a Forte set-class name") from None
+
+    ## PcSets are immutable.
+    def __setattr__(self, name, value):
+        raise AttributeError("PcSet objects are immutable")
+
+    ## Implements copy and pickle by returning the interned set.
+    def __reduce__(self):
+        return (PcSet.from_bits, (self.bits,))
+
+    ## Returns a string showing the pitch classes and the hex id.
+    #  Example: '<PcSet: [0, 4, 7] 0x10610d2b0>'
+    def __str__(self):
+        return f'<PcSet: {list(self)} {hex(id(self))}>'
+
+    ## Returns a string expression that will evaluate to this set.
+    def __repr__(self):
+        return f'PcSet({list(self)})'
+
+    ## Returns the 12 bit value as the hash.
+    def __hash__(self):
+        return self.bits
+
+    ## Returns the number of pitch classes in the set.
+    def __len__(self):
+        return int(CARDINALITIES[self.bits])
+
+    ## Implements iteration over the pitch classes in ascending order.
+    def __iter__(self):
+        return iter(_pcs(self.bits))
+
+    ## Returns true if the set holds the pitch class of an integer.
+    def __contains__(self, pc):
+        return bool(self.bits >> (pc % 12) & 1)
+
+    ## Implements the union a | b.
+    def __or__(self, other):
+        return PcSet._sets[self.bits | other.bits]
+
+    ## Implements the intersection a & b.
+    def __and__(self, other):
+        return PcSet._sets[self.bits & other.bits]
+
+    ## Implements the difference a - b.
+    def __sub__(self, other):
+        return PcSet._sets[self.bits & ~other.bits]
+
+    ## Implements the symmetric difference a ^ b.
+    def __xor__(self, other):
+        return PcSet._sets[self.bits ^ other.bits]
+
+    ## Implements the complement ~a.
+    def __invert__(self):
+        return PcSet._sets[0xFFF ^ self.bits]
+
+    ## Returns true if the set is a subset of other.
+    def __le__(self, other):
+        return self.bits & other.bits == self.bits
+
+    ## Returns true if the set is a proper subset of other.
+    def __lt__(self, other):
+        return self.bits != other.bits and self <= other
+
+    ## Returns true if the set is a superset of other.
+    def __ge__(self, other):
+        return other <= self
+
+    ## Returns true if the set is a proper superset of other.
+    def __gt__(self, other):
+        return other < self
+
+    ## Returns the set transposed up by n semitones.
+    def transpose(self, n):
+        return PcSet._sets[_rotate(self.bits, n)]
+
+    ## Returns the set inverted around 0 and then transposed up by n
+    #  semitones, i.e. the set TnI.
+    def invert(self, n=0):
+        return PcSet._sets[_rotate(_INVERSIONS[self.bits], n)]
+
+    ## Returns the normal form as a tuple of pitch classes, e.g. (11, 2, 5)
+    #  for {2, 5, 11}.
+    def normal_form(self):
+        return NORMAL_FORMS[self.bits]
+
+    ## Returns the prime form as a PcSet.
+    def prime_form(self):
+        return PcSet._sets[PRIME_FORMS[self.bits]]
+
+    ## Returns the Forte name of the set's set class, e.g. '3-11'.
+    def forte(self):
+        return SET_CLASSES[FORTE_INDEX[self.bits]]
+
+    ## Returns the interval-class vector as a tuple of six counts.
+    def icv(self):
+        return tuple(IC_VECTORS[self.bits].tolist())
+
+    ## Returns true if other is in the same set class (is a transposition or
+    #  an inversion of this set).
+    def is_equivalent(self, other):
+        return PRIME_FORMS[self.bits] == PRIME_FORMS[other.bits]
+
+
+## The interned PcSets indexed by their 12 bit value.
+PcSet._sets = tuple(PcSet._create(bits) for bits in range(4096))
+
+
+## Returns the 12 bit sets of the sonorities in an array of key numbers.
+#  @param keynums An integer NumPy array (or nested sequence) of midi key
+#  numbers. Negative values are rests and are left out.
+#  @param axis The axis that holds the notes of one sonority, e.g. the voice
+#  axis of a timepoints x voices array.
+#  @returns An int64 array of 12 bit sets with the axis removed. Index the
+#  tables with it, e.g. FORTE_INDEX[bits] or IC_VECTORS[bits].
+def keynums_to_bits(keynums, axis=-1):
+    keynums = np.asarray(keynums, dtype=np.int64)
+    bits = np.where(keynums >= 0, np.left_shift(1, keynums % 12), 0)
+    return np.bitwise_or.reduce(bits, axis=axis)
+
+
+## Returns the Forte names of an array of 12 bit sets as an array of
+#  strings. See: keynums_to_bits().
+def forte_names(bits):
+    return np.asarray(SET_CLASSES)[FORTE_INDEX[np.asarray(bits, dtype=np.int64)]]
+
+
+if __name__ == '__main__':
+    chorale = np.array([[48, 55, 64, 72], [43, 55, 62, 71], [45, 57, 64, 72], [41, 57, 65, 69], [43, 55, 62, 67]])
+    bits = keynums_to_bits(chorale)
+    print(forte_names(bits), IC_VECTORS[bits])
+    print(PcSet([0, 4, 7]), PcSet([0, 4, 7]).forte(), PcSet([11, 2, 5]).normal_form())
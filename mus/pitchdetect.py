@@ -0,0 +1,231 @@
+###############################################################################
+## @file
+#  Fundamental frequency (f0) detection of WAV files with the YIN algorithm.
+#
+#  A WavStream reads a PCM WAV file with the standard wave module and yields
+#  it as blocks of mono float samples. track() cuts the blocks into
+#  overlapping analysis frames and estimates the f0 of every frame with a
+#  vectorized YIN: the difference functions of all the frames in a block are
+#  computed at once with NumPy FFTs, normalized, and searched for the first
+#  dip below a threshold. Frames without a clear pitch get 0. Long files are
+#  processed through a fixed size buffer so memory does not grow with the
+#  length of the file.
+#
+#  The f0 values are hertz and plug straight into the tet module, e.g.
+#  hertz_to_midi_array(f0[f0 > 0]) gives key numbers that Pitch.from_keynum()
+#  spells, and segment() turns a whole track into notes.
+#
+#  See: A. de Cheveigne and H. Kawahara, "YIN, a fundamental frequency
+#  estimator for speech and music", JASA 111(4), 2002.
+
+import math
+import time
+import wave
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+## A class that reads a PCM WAV file as blocks of mono float64 samples
+#  between -1.0 and 1.0. Multichannel files are mixed down to mono.
+#
+#  Example:
+#  @code
+#  with WavStream('take1.wav') as wav:
+#      for block in wav:
+#          ...
+#  @endcode
+class WavStream:
+
+    ## Opens a WAV file for reading.
+    #  @param path The path to the WAV file.
+    #  @param blocksize The number of sample frames in each block.
+    #
+    #  Raises a ValueError if the file is not 8, 16, 24 or 32 bit PCM.
+    def __init__(self, path, blocksize=65536):
+        self.file = wave.open(path, 'rb')
+        ## The sample rate in hertz.
+        self.rate = self.file.getframerate()
+        ## The number of channels in the file.
+        self.channels = self.file.getnchannels()
+        ## The total number of sample frames in the file.
+        self.frames = self.file.getnframes()
+        self.width = self.file.getsampwidth()
+        self.blocksize = blocksize
+        if self.width not in (1, 2, 3, 4):
+            self.file.close()
+            raise ValueError(f"Only 8, 16, 24 and 32 bit WAV files are supported, your file has {self.width * 8} bits")
+
+    ## Returns a string showing the file's rate, channels and length.
+    def __str__(self):
+        return f'<WavStream: {self.rate} Hz, {self.channels} channel(s), {self.seconds():.2f} seconds {hex(id(self))}>'
+
+    ## Implements the context manager protocol, see: close().
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    ## Closes the file.
+    def close(self):
+        self.file.close()
+
+    ## Returns the length of the file in seconds.
+    def seconds(self):
+        return self.frames / self.rate
+
+    ## Implements iteration by yielding mono float64 blocks of up to
+    #  blocksize samples until the end of the file.
+    def __iter__(self):
+        while True:
+            data = self.file.readframes(self.blocksize)
+            if not data:
+                return
+            yield self._samples(data)
+
+    ## Private method that converts raw PCM bytes to mono float samples.
+    def _samples(self, data):
+        if self.width == 1:
+            samples = np.frombuffer(data, dtype=np.uint8).astype(np.float64) - 128
+        elif self.width == 3:
+            raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            samples = (raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)).astype(np.float64)
+            samples[samples >= 2 ** 23] -= 2 ** 24
+        else:
+            samples = np.frombuffer(data, dtype=f'<i{self.width}').astype(np.float64)
+        samples /= 2 ** (8 * self.width - 1)
+        return samples.reshape(-1, self.channels).mean(axis=1)
+
+
+## Estimates the f0 of a 2D array of frames with the YIN algorithm.
+#  @param frames A 2D NumPy array with one frame per row. Each frame holds
+#  window + maxlag samples where maxlag is the longest period searched.
+#  @param rate The sample rate in hertz.
+#  @param window The number of samples each difference is summed over.
+#  @param fmin The lowest f0 searched in hertz.
+#  @param fmax The highest f0 searched in hertz.
+#  @param threshold The YIN threshold: a frame is pitched if its normalized
+#  difference dips below it. Smaller values reject more frames.
+#  @returns A float64 array with the f0 of every frame, 0 if unpitched.
+def yin(frames, rate, window, fmin, fmax, threshold=0.15):
+    frames = np.atleast_2d(frames)
+    count, length = frames.shape
+    minlag = max(2, int(rate / fmax))
+    maxlag = min(length - window, int(math.ceil(rate / fmin)))
+    if maxlag <= minlag:
+        raise ValueError("The frames are too short for the f0 range")
+    # d(tau) = sum(x[j]^2) + sum(x[j+tau]^2) - 2 * sum(x[j] * x[j+tau]),
+    # the cross term for every lag at once with one real FFT per frame.
+    size = 1 << (length + window - 1).bit_length()
+    spectrum = np.fft.rfft(frames, size, axis=1)
+    head = np.fft.rfft(frames[:, :window], size, axis=1)
+    cross = np.fft.irfft(np.conj(head) * spectrum, size, axis=1)[:, :maxlag + 1]
+    squares = np.concatenate((np.zeros((count, 1)), np.cumsum(frames ** 2, axis=1)), axis=1)
+    lags = np.arange(maxlag + 1)
+    energy = squares[:, lags + window] - squares[:, lags]
+    diff = np.maximum(energy[:, :1] + energy - 2 * cross, 0.0)
+    # the cumulative mean normalized difference, 1 at lag 0
+    sums = np.cumsum(diff[:, 1:], axis=1)
+    norm = np.ones(diff.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        norm[:, 1:] = np.where(sums > 0, diff[:, 1:] * lags[1:] / sums, 1.0)
+    # the first lag below the threshold, then down to the bottom of its dip
+    below = norm[:, minlag:maxlag] < threshold
+    pitched = below.any(axis=1)
+    first = minlag + np.argmax(below, axis=1)
+    rising = norm[:, minlag + 1:maxlag + 1] >= norm[:, minlag:maxlag]
+    rising &= lags[minlag:maxlag] >= first[:, None]
+    tau = minlag + np.argmax(rising, axis=1)
+    # parabolic interpolation around the minimum
+    rows = np.arange(count)
+    left, mid, right = norm[rows, tau - 1], norm[rows, tau], norm[rows, np.minimum(tau + 1, maxlag)]
+    curve = left - 2 * mid + right
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shift = np.where(curve > 0, 0.5 * (left - right) / curve, 0.0)
+    return np.where(pitched, rate / (tau + np.clip(shift, -1, 1)), 0.0)
+
+
+## A generator that yields the f0 track of a stream of sample blocks, one
+#  array of f0 values per block.
+#  @param blocks An iterable of mono float sample arrays, e.g. a WavStream.
+#  @param rate The sample rate in hertz.
+#  @param hop The number of samples between frames.
+#  @param window The number of samples each YIN difference is summed over.
+#  @param fmin The lowest f0 searched in hertz.
+#  @param fmax The highest f0 searched in hertz.
+#  @param threshold The YIN threshold, see: yin().
+#  @returns An iterator of float64 arrays. Frame k starts at sample k * hop.
+#
+#  Samples are copied into a fixed size buffer that holds one block plus the
+#  overlap carried over from the previous block.
+def track(blocks, rate, hop=256, window=1024, fmin=50.0, fmax=2000.0, threshold=0.15):
+    length = window + int(math.ceil(rate / fmin))
+    buffer = None
+    carry = 0
+    for block in blocks:
+        block = np.asarray(block, dtype=np.float64)
+        if buffer is None or len(buffer) < length + len(block):
+            buffer = np.resize(buffer if buffer is not None else np.zeros(0), length + len(block))
+        buffer[carry:carry + len(block)] = block
+        filled = carry + len(block)
+        count = (filled - length) // hop + 1 if filled >= length else 0
+        if count > 0:
+            frames = sliding_window_view(buffer[:filled], length)[::hop][:count]
+            yield yin(frames, rate, window, fmin, fmax, threshold)
+        # keep the samples from the next frame's start for the next block
+        used = count * hop
+        carry = filled - used
+        buffer[:carry] = buffer[used:filled].copy()
+
+
+## Returns the f0 track of a WAV file as one array. See: track().
+#  @param path The path to the WAV file.
+#  @returns A tuple (f0, framerate) where framerate is the number of f0
+#  values per second.
+def wav_to_f0(path, hop=256, window=1024, fmin=50.0, fmax=2000.0, threshold=0.15):
+    with WavStream(path) as wav:
+        f0 = list(track(wav, wav.rate, hop, window, fmin, fmax, threshold))
+        return (np.concatenate(f0) if f0 else np.zeros(0)), wav.rate / hop
+
+
+## Times the f0 detection of a WAV file.
+#  @param path The path to the WAV file.
+#  @returns A tuple (seconds, elapsed, rtf) holding the length of the audio,
+#  the processing time and the real-time factor elapsed / seconds (smaller
+#  is faster, 0.01 means 100 times faster than real time).
+def benchmark(path, **kwargs):
+    start = time.perf_counter()
+    with WavStream(path) as wav:
+        seconds = wav.seconds()
+        for f0 in track(wav, wav.rate, **kwargs):
+            pass
+    elapsed = time.perf_counter() - start
+    return seconds, elapsed, elapsed / seconds if seconds else 0.0
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+    import tempfile
+    temporary = len(sys.argv) < 2
+    if not temporary:
+        path = sys.argv[1]
+    else:
+        # a 60 second test file of notes from A2 to A5
+        rate = 44100
+        hertz = np.repeat(110.0 * 2 ** (np.arange(37) / 12), rate * 60 // 37 + 1)[:rate * 60]
+        samples = 0.5 * np.sin(2 * np.pi * np.cumsum(hertz) / rate)
+        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp:
+            path = temp.name
+        with wave.open(path, 'wb') as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(rate)
+            out.writeframes((samples * 32767).astype('<i2').tobytes())
+    try:
+        seconds, elapsed, rtf = benchmark(path)
+    finally:
+        if temporary:
+            os.remove(path)
+    print(f'{seconds:.1f} seconds of audio in {elapsed:.2f} seconds, real-time factor {rtf:.4f}')
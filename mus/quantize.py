@@ -0,0 +1,155 @@
+###############################################################################
+## @file
+#  Vectorized quantization of floating point durations and onsets to Ratios.
+#
+#  Ratio(float) converts a float exactly through its decimal string, so a
+#  performed duration like 0.3333 becomes 3333/10000 instead of 1/3. The
+#  functions in this module take a whole NumPy array of floats (e.g. timings
+#  from a performance or a pitch tracker, measured in whole notes) and return
+#  a RatioArray of the best rational approximations together with the
+#  quantization error of every value. Two kinds of limits are supported:
+#  1. A maximum denominator. The best approximation is found with continued
+#     fractions, checking the last semiconvergent exactly like
+#     fractions.Fraction.limit_denominator() does for a single value.
+#  2. An allowed grid. Either a Ratio step (every value is rounded to the
+#     nearest multiple of the step) or a list of allowed denominators (every
+#     value is rounded to the closest fraction with one of the denominators).
+
+import numpy as np
+
+from .ratio import Ratio
+from .ratioarray import RatioArray
+
+## The largest number of continued fraction terms that are computed.
+MAX_TERMS = 64
+
+
+## Returns the best rational approximations of an array of floats whose
+#  denominators do not exceed max_den, see: continued fractions.
+#  @param values A sequence or NumPy array of floats.
+#  @param max_den The largest allowed denominator, a positive integer.
+#  @returns A RatioArray the same length as values.
+#
+#  The function raises a ValueError if max_den is not a positive integer or
+#  if any value is not finite.
+def limit_denominator(values, max_den):
+    if not isinstance(max_den, (int, np.integer)) or max_den < 1:
+        raise ValueError(f"The maximum denominator must be a positive integer, your input was {max_den}")
+    values = _as_floats(values)
+    sign = np.where(values < 0, -1, 1)
+    x = np.abs(values)
+    whole = np.floor(x)
+    frac = x - whole
+    # convergents h/k (current) and h0/k0 (previous)
+    h0 = np.ones(x.shape, dtype=np.int64)
+    k0 = np.zeros(x.shape, dtype=np.int64)
+    h = whole.astype(np.int64)
+    k = np.ones(x.shape, dtype=np.int64)
+    active = frac > 0
+    for i in range(MAX_TERMS):
+        if not active.any():
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.where(active, 1.0 / np.where(active, frac, 1.0), 0.0)
+        term = np.floor(r)
+        frac = np.where(active, r - term, 0.0)
+        # a term larger than max_den always overflows the limit, clamping it
+        # keeps the integer arithmetic below in range.
+        term = np.minimum(term, max_den + 1).astype(np.int64)
+        h1 = term * h + h0
+        k1 = term * k + k0
+        over = active & (k1 > max_den)
+        if over.any():
+            # the best approximation is either the last convergent or the
+            # largest semiconvergent that still fits under max_den.
+            m = (max_den - k0[over]) // k[over]
+            hs = m * h[over] + h0[over]
+            ks = m * k[over] + k0[over]
+            xo = x[over]
+            semi = np.abs(xo - hs / ks) < np.abs(xo - h[over] / k[over])
+            h[over] = np.where(semi, hs, h[over])
+            k[over] = np.where(semi, ks, k[over])
+        step = active & ~over
+        h0, k0, h, k = (np.where(step, h, h0), np.where(step, k, k0),
+                        np.where(step, h1, h), np.where(step, k1, k))
+        active = step & (frac > 0) & (np.abs(x - h / k) > 0)
+    return RatioArray(sign * h, k)
+
+
+## Rounds an array of floats to the nearest multiple of a Ratio step.
+#  @param values A sequence or NumPy array of floats.
+#  @param step A positive Ratio or int, e.g. Ratio(1, 16).
+#  @returns A RatioArray the same length as values.
+def snap_to_step(values, step):
+    if isinstance(step, int):
+        step = Ratio(step)
+    if not isinstance(step, Ratio) or step.num <= 0:
+        raise ValueError(f"The grid step must be a positive Ratio, your input was {step}")
+    values = _as_floats(values)
+    count = np.rint(values * step.den / step.num).astype(np.int64)
+    return RatioArray(count * step.num, np.full(values.shape, step.den, dtype=np.int64))
+
+
+## Rounds an array of floats to the closest fraction whose denominator is
+#  one of the allowed denominators. When two fractions are equally close the
+#  one with the smaller denominator is chosen.
+#  @param values A sequence or NumPy array of floats.
+#  @param dens A sequence of positive integer denominators, e.g. [1, 2, 3, 4,
+#  6, 8, 12, 16].
+#  @returns A RatioArray the same length as values.
+def snap_to_dens(values, dens):
+    dens = np.unique(np.asarray(dens, dtype=np.int64))
+    if dens.size == 0 or dens[0] < 1:
+        raise ValueError("The allowed denominators must be positive integers")
+    values = _as_floats(values)
+    nums = np.rint(values[:, None] * dens[None, :]).astype(np.int64)
+    errors = np.abs(values[:, None] - nums / dens[None, :])
+    best = np.argmin(errors, axis=1)
+    rows = np.arange(len(values))
+    return RatioArray(nums[rows, best], dens[best])
+
+
+## Quantizes an array of float durations or onsets to Ratios.
+#  @param values A sequence or NumPy array of floats.
+#  @param max_den If specified, the largest allowed denominator.
+#  See: limit_denominator().
+#  @param grid If specified, either a Ratio step (see: snap_to_step()) or a
+#  sequence of allowed denominators (see: snap_to_dens()).
+#  @returns A tuple (ratios, errors) where ratios is a RatioArray and errors
+#  is a float64 NumPy array holding value - ratio for every value.
+#
+#  Exactly one of max_den and grid must be specified, otherwise a ValueError
+#  is raised.
+#
+#  Example:
+#  @code
+#  ratios, errors = quantize([0.3333, 0.251, 0.126], max_den=16)
+#  ratios.strings()  # ['1/3', '1/4', '1/8']
+#  @endcode
+def quantize(values, max_den=None, grid=None):
+    if (max_den is None) == (grid is None):
+        raise ValueError("Specify either a maximum denominator or a grid")
+    values = _as_floats(values)
+    if max_den is not None:
+        ratios = limit_denominator(values, max_den)
+    elif isinstance(grid, (Ratio, int)):
+        ratios = snap_to_step(values, grid)
+    else:
+        ratios = snap_to_dens(values, grid)
+    return ratios, values - ratios.float()
+
+
+## Private helper that returns the values as a flat float64 array, raising a
+#  ValueError if any value is infinite or NaN.
+def _as_floats(values):
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if not np.all(np.isfinite(values)):
+        raise ValueError("Only finite values can be quantized")
+    return values
+
+
+if __name__ == '__main__':
+    ratios, errors = quantize([0.3333, 0.251, 0.126, -0.6667], max_den=16)
+    print(ratios, errors)
+    print(quantize([0.3333, 0.251, 0.126], grid=Ratio(1, 16)))
+    print(quantize([0.3333, 0.251, 0.126], grid=[1, 2, 3, 4, 8, 16]))
@@ -9,9 +9,24 @@
 
 import math
 import decimal
+import sys
+
+## The modulus and infinity values Python uses for numeric hashes. Ratio uses
+#  the same hashing scheme as the builtin numbers so that equal ints, floats
+#  and Ratios hash to the same value. See: Ratio.__hash__().
+_HASH_MODULUS = sys.hash_info.modulus
+_HASH_INF = sys.hash_info.inf
+
 
 class Ratio:
 
+    ## Ratios are immutable and only store their numerator and denominator.
+    __slots__ = ('num', 'den')
+
+    ## A class variable that maps (num, den) tuples to shared Ratio instances
+    #  for the common metric values. See: _intern().
+    _interned = {}
+
     ## Creates a Ratio from integers, a floating point number, or a string name.
     #  * Ratio(int, int) - creates a ratio from an integer numerator and denominator.
     #  * Ratio(int) - creates a ratio from an integer numerator with the denominator
@@ -33,51 +48,86 @@ class Ratio:
     #
     #  The constructor should raise a TypeError if the num or den is not a integer,
     #  string or float and a DivisionByZero error if the denominator is 0.
-    def __init__(self, num, den=None):
-
-        if den == None:
+    #
+    #  Ratios are built in __new__ so that common metric values (see: _intern())
+    #  are returned as shared instances instead of being allocated again.
+    def __new__(cls, num, den=None):
+        if den is None:
             if isinstance(num, str):
-
                 strRatio = num.split("/")
-
+                if len(strRatio) != 2:
+                    raise ValueError("The Ratio is not a valid ratio")
                 try:
-                    self.num = int(strRatio[0]) / math.gcd(int(strRatio[0]), int(strRatio[1]))
-                    self.den = int(strRatio[1]) / math.gcd(int(strRatio[0]), int(strRatio[1]))
-                    self.num = int(self.num)
-                    self.den = int(self.den)
-                    #negatives have to be in numerator: need to fix
-                    if self.num < 0 and self.den < 0:
-                        self.num = -self.num
-                        self.den = -self.den
-                    elif self.num >= 0 and self.den < 0:
-                        self.num = -self.num
-                        self.den = -self.den
+                    num = int(strRatio[0])
+                    den = int(strRatio[1])
                 except ValueError:
                     raise ValueError("The Ratio is not a valid ratio")
-            if isinstance(num, float):
-                num = str(num)
-                tupRatio = decimal.Decimal(num).as_integer_ratio()
-                self.num = tupRatio[0]
-                self.den = tupRatio[1]
-            if isinstance(num, int):
-                self.num = num
-                self.den = 1
-        else:
-            if isinstance(num, int) and isinstance(den, int):
-                if den == 0:
-                    raise ZeroDivisionError("You cannot make a ratio with 0 in the denominator")
-                #negatives have to be in the numerator: need to fix
-                self.num = num // math.gcd(num, den)
-                self.den = den // math.gcd(num, den)
-                if self.num < 0 and self.den < 0:
-                    self.num = -self.num
-                    self.den = -self.den
-                elif self.num >= 0 and self.den < 0:
-                    self.num = -self.num
-                    self.den = -self.den
+            elif isinstance(num, float):
+                num, den = decimal.Decimal(str(num)).as_integer_ratio()
+                return cls._make(num, den)
+            elif isinstance(num, int):
+                return cls._make(num, 1)
             else:
-                raise ValueError("The Ratio does not have valid inputs. Your inputs were {} and {}".format(num, den))
-
+                raise TypeError("The Ratio does not have a valid input. Your input was {}".format(num))
+        elif not (isinstance(num, int) and isinstance(den, int)):
+            raise ValueError("The Ratio does not have valid inputs. Your inputs were {} and {}".format(num, den))
+        if den == 0:
+            raise ZeroDivisionError("You cannot make a ratio with 0 in the denominator")
+        return cls._reduce(num, den)
+
+    ## Private class method that returns the Ratio num/den in simplest form with
+    #  the sign carried by the numerator. Uses a single gcd() call.
+    #  @param num An integer numerator.
+    #  @param den A non-zero integer denominator.
+    @classmethod
+    def _reduce(cls, num, den):
+        if den < 0:
+            num, den = -num, -den
+        g = math.gcd(num, den)
+        if g != 1:
+            num //= g
+            den //= g
+        return cls._make(num, den)
+
+    ## Private class method that returns a Ratio for an already reduced
+    #  num/den, reusing the interned instance if there is one.
+    #  @param num An integer numerator.
+    #  @param den A positive integer denominator that shares no factor with num.
+    @classmethod
+    def _make(cls, num, den):
+        ratio = cls._interned.get((num, den))
+        if ratio is None:
+            ratio = object.__new__(cls)
+            object.__setattr__(ratio, 'num', num)
+            object.__setattr__(ratio, 'den', den)
+        return ratio
+
+    ## Private class method that adds the ratio num/den to the intern cache.
+    #  @returns The shared Ratio instance.
+    @classmethod
+    def _intern(cls, num, den):
+        ratio = cls._reduce(num, den)
+        return cls._interned.setdefault((ratio.num, ratio.den), ratio)
+
+    ## Ratios are immutable, assigning to an attribute raises an AttributeError.
+    def __setattr__(self, name, value):
+        raise AttributeError("Ratio objects are immutable")
+
+    ## Ratios are immutable, deleting an attribute raises an AttributeError.
+    def __delattr__(self, name):
+        raise AttributeError("Ratio objects are immutable")
+
+    ## Copies and pickles rebuild the ratio from its numerator and denominator.
+    def __reduce__(self):
+        return (Ratio, (self.num, self.den))
+
+    ## Ratios are immutable so a copy is the ratio itself.
+    def __copy__(self):
+        return self
+
+    ## Ratios are immutable so a deep copy is the ratio itself.
+    def __deepcopy__(self, memo):
+        return self
 
     ## Returns a string showing the ratio's fraction and the hex
     #  hex value of the ratio's memory address.
@@ -96,13 +146,15 @@ class Ratio:
     # A TypeError should be raised if other is not a Ratio, int or float.
     def __mul__(self, other):
         if isinstance(other, Ratio):
-            return Ratio(self.num * other.num, self.den * other.den)
+            return Ratio._reduce(self.num * other.num, self.den * other.den)
         if isinstance(other, int):
-            return Ratio(self.num * other, self.den)
+            return Ratio._reduce(self.num * other, self.den)
         if isinstance(other, float):
             return other * self.num / self.den
         else:
-            raise TypeError("You can only multiply by a Ratio, integer, or float")
+            # lets other types (e.g. RatioArray) handle the operation, otherwise
+            # Python raises the TypeError
+            return NotImplemented
 
     ## Implements right side multiplication by calling __mul__
     __rmul__ = __mul__
@@ -120,7 +172,7 @@ class Ratio:
         if isinstance(other, float):
             return (self.num / other) / self.den
         else:
-            raise TypeError("You can only multiply by a Ratio, integer, or float")
+            return NotImplemented
 
     ## Implements int / Ratio or float / Ratio (right side division).
     #  @returns A new Ratio.
@@ -145,13 +197,15 @@ class Ratio:
     #  @returns A new Ratio.
     def __add__(self, other):
         if isinstance(other, Ratio):
-            return Ratio((self.num * other.den) + (other.num * self.den), self.den * other.den)
+            if self.den == other.den:
+                return Ratio._reduce(self.num + other.num, self.den)
+            return Ratio._reduce((self.num * other.den) + (other.num * self.den), self.den * other.den)
         if isinstance(other, int):
-            return Ratio(self.num + (other * self.den), self.den)
+            return Ratio._make(self.num + (other * self.den), self.den)
         if isinstance(other, float):
             return other + (self.num/self.den)
         else:
-            raise TypeError("You cannot add {} with a Ratio".format(other))
+            return NotImplemented
 
 
     ## Implements right side addition by calling __add__.
@@ -161,7 +215,7 @@ class Ratio:
     ## Implements -ratio (negation).
     #  @returns A new Ratio.
     def __neg__(self):
-        return Ratio(-self.num, self.den)
+        return Ratio._make(-self.num, self.den)
 
     ## Implements ratio - ratio, ratio - int and ratio - float.
     #  @returns A new Ratio.
@@ -173,7 +227,7 @@ class Ratio:
         if isinstance(other, float):
             return self.__add__(other.__neg__())
         else:
-            raise TypeError("You cannot subtract a Ratio with your input, {}".format(other))
+            return NotImplemented
 
 
 
@@ -183,45 +237,126 @@ class Ratio:
         # other is the LEFT side non-ratio operand.
 
         if isinstance(other, int):
-            return Ratio((other * self.den) - self.num, self.den)
+            return Ratio._make((other * self.den) - self.num, self.den)
         if isinstance(other, float):
             return other - (self.num / self.den)
         else:
             raise TypeError("You cannot subtract a Ratio with your input, {}".format(other))
 
-    ## Implements ratio % ratio.
-    #  @returns A new Ratio.
+    ## Private helper that returns the integer quotient and Ratio remainder of
+    #  num1/den1 divided by num2/den2 using integer cross-multiplication. The
+    #  quotient is floored and the remainder takes the sign of the divisor,
+    #  like Python's divmod() for ints.
+    @staticmethod
+    def _divmod(num1, den1, num2, den2):
+        if num2 == 0:
+            raise ZeroDivisionError("You cannot divide a Ratio by zero")
+        quotient, remainder = divmod(num1 * den2, num2 * den1)
+        return quotient, Ratio._reduce(remainder, den1 * den2)
+
+    ## Private helper that returns the numerator and denominator of an int or
+    #  Ratio operand, or None if other is neither.
+    @staticmethod
+    def _terms(other):
+        if isinstance(other, Ratio):
+            return other.num, other.den
+        if isinstance(other, int):
+            return other, 1
+        return None
+
+    ## Implements ratio % ratio, ratio % int and ratio % float.
+    #  @returns A new Ratio if other is a Ratio or int, otherwise a float.
+    #  The result has the same sign as other, e.g. Ratio(13,4) % Ratio(3,4)
+    #  is 1/4 and Ratio(-1,4) % 1 is 3/4.
+    #
+    #  The result is computed in constant time, see: __divmod__().
     def __mod__(self, other):
-        if isinstance(other, Ratio) or isinstance(other, int) or isinstance(other, float):
-            modRatio = Ratio(self.num, self.den)
-            while modRatio.num > 0:
-                modRatio = modRatio.__sub__(other)
-            if modRatio.num == 0:
-                return modRatio
-            else:
-                return modRatio.__add__(other)
+        terms = Ratio._terms(other)
+        if terms is not None:
+            return Ratio._divmod(self.num, self.den, *terms)[1]
+        if isinstance(other, float):
+            return (self.num / self.den) % other
+        else:
+            raise TypeError("You cannot use modulo with your input {}".format(other))
+
+    ## Implements int % ratio.
+    #  @returns A new Ratio.
+    def __rmod__(self, other):
+        if isinstance(other, int):
+            return Ratio._divmod(other, 1, self.num, self.den)[1]
+        if isinstance(other, float):
+            return other % (self.num / self.den)
         else:
             raise TypeError("You cannot use modulo with your input {}".format(other))
 
+    ## Implements ratio // ratio, ratio // int and ratio // float.
+    #  @returns The largest integer less than or equal to self / other
+    #  (a float if other is a float), e.g. the zero based bar index of an
+    #  onset is onset // bar_duration.
+    def __floordiv__(self, other):
+        terms = Ratio._terms(other)
+        if terms is not None:
+            if terms[0] == 0:
+                raise ZeroDivisionError("You cannot divide a Ratio by zero")
+            return (self.num * terms[1]) // (terms[0] * self.den)
+        if isinstance(other, float):
+            return (self.num / self.den) // other
+        else:
+            raise TypeError("You cannot use floor division with your input {}".format(other))
+
+    ## Implements int // ratio.
+    #  @returns An integer.
+    def __rfloordiv__(self, other):
+        if isinstance(other, int):
+            if self.num == 0:
+                raise ZeroDivisionError("You cannot divide by a zero Ratio")
+            return (other * self.den) // self.num
+        if isinstance(other, float):
+            return other // (self.num / self.den)
+        else:
+            raise TypeError("You cannot use floor division with your input {}".format(other))
+
+    ## Implements divmod(ratio, ratio) and divmod(ratio, int).
+    #  @returns A tuple (quotient, remainder) where quotient is an integer and
+    #  remainder is a Ratio such that quotient * other + remainder == self.
+    #  For an onset and a bar duration this is the (bar index, offset in bar).
+    def __divmod__(self, other):
+        terms = Ratio._terms(other)
+        if terms is not None:
+            return Ratio._divmod(self.num, self.den, *terms)
+        if isinstance(other, float):
+            return divmod(self.num / self.den, other)
+        else:
+            raise TypeError("You cannot use divmod with your input {}".format(other))
 
+    ## Implements divmod(int, ratio).
+    def __rdivmod__(self, other):
+        if isinstance(other, int):
+            return Ratio._divmod(other, 1, self.num, self.den)
+        if isinstance(other, float):
+            return divmod(other, self.num / self.den)
+        else:
+            raise TypeError("You cannot use divmod with your input {}".format(other))
 
     ## Implements Ratio**int, Ratio**float, and Ratio**Ratio.
     #  @returns If the exponent is a positive or negative int
     #  a Ratio should be returned. Otherwise for Ratio or float
     #  exponents a float should be returned. See: math.pow().
+    #
+    #  Integer powers raise the numerator and denominator separately with
+    #  Python's integer pow (exponentiation by squaring). The powers of two
+    #  coprime integers are coprime so no gcd is needed. A negative power of
+    #  a zero Ratio raises a ZeroDivisionError.
     def __pow__(self, other):
         if isinstance(other, int):
-            expRatio = Ratio(self.num, self.den)
-            if other > 0:
-                for i in range(other - 1):
-                    expRatio *= self
-                return expRatio
-            elif other < 0:
-                for i in range(abs(other) - 1):
-                    expRatio /= self
-                return expRatio
-            elif other == 0:
-                return Ratio(1,1)
+            if other >= 0:
+                return Ratio._make(self.num ** other, self.den ** other)
+            elif self.num == 0:
+                raise ZeroDivisionError("You cannot raise a zero Ratio to a negative power")
+            elif self.num < 0:
+                return Ratio._make((-self.den) ** -other, (-self.num) ** -other)
+            else:
+                return Ratio._make(self.den ** -other, self.num ** -other)
         elif isinstance(other, Ratio):
             return math.pow(self.num / self.den, other.num / other.den)
         elif isinstance(other, float):
@@ -240,63 +375,76 @@ class Ratio:
             raise ValueError("You cannot raise {} by a Ratio".format(other))
     ## Implements Ratio < Ratio, Ratio < int, Ratio < float. See: compare().
     def __lt__(self, other):
-        if self.compare(other) < 0:
-            return True
-        else:
-            return False
+        comparison = self.compare(other)
+        if comparison is NotImplemented:
+            return NotImplemented
+        return comparison < 0
 
     ## Implements Ratio <= Ratio, Ratio <= int, Ratio <= float. See: compare().
     def __le__(self, other):
-        if self.compare(other) <= 0:
-            return True
-        else:
-            return False
+        comparison = self.compare(other)
+        if comparison is NotImplemented:
+            return NotImplemented
+        return comparison <= 0
 
     ## Implements Ratio <= Ratio, Ratio <= int, Ratio <= float. See: compare().
     def __eq__(self, other):
-        if self.compare(other) == 0:
-            return True
-        else:
-            return False
+        comparison = self.compare(other)
+        if comparison is NotImplemented:
+            return NotImplemented
+        return comparison == 0
 
     ## Implements Ratio != Ratio, Ratio != int, Ratio != float. See: compare().
     def __ne__(self, other):
-        if self.compare(other) == 0:
-            return False
-        else:
-            return True
+        comparison = self.compare(other)
+        if comparison is NotImplemented:
+            return NotImplemented
+        return comparison != 0
 
     ## Implements Ratio >= Ratio, Ratio >= int, Ratio >= float. See: compare().
     def __ge__(self, other):
-        if self.compare(other) >= 0:
-            return True
-        else:
-            return False
+        comparison = self.compare(other)
+        if comparison is NotImplemented:
+            return NotImplemented
+        return comparison >= 0
 
     ## Implements Ratio>Ratio, Ratio > int, Ratio > float. See: compare().
     def __gt__(self, other):
-        if self.compare(other) > 0:
-            return True
-        else:
-            return False
-
-    ## Returns a single integer hash value for the ratio: (num<<16 + den)
+        comparison = self.compare(other)
+        if comparison is NotImplemented:
+            return NotImplemented
+        return comparison > 0
+
+    ## Returns a single integer hash value for the ratio. The hash is computed
+    #  the same way Python hashes its builtin numbers, so equal Ratios always
+    #  share a hash and Ratio(3) hashes like 3 and Ratio(1, 2) like 0.5.
+    #  This lets ratios be used as dict keys and set members.
     def __hash__(self):
-        return hex(id(self))
+        # the inverse of den modulo the (prime) modulus, by Fermat's little
+        # theorem; zero if den is a multiple of the modulus.
+        dinv = pow(self.den, _HASH_MODULUS - 2, _HASH_MODULUS)
+        if not dinv:
+            hashValue = _HASH_INF
+        else:
+            hashValue = hash(hash(abs(self.num)) * dinv)
+        hashValue = hashValue if self.num >= 0 else -hashValue
+        return -2 if hashValue == -1 else hashValue
 
     ## Helper method implements ratio comparison. Returns 0 if the ratios are equal,
     # a negative value if self is less than other and a positive value if self is
     # GEQ other. Given two ratios the comparison is (num1*den2) - (num2/den1)
+    # Returns NotImplemented for other types so Python can try the reflected
+    # operator, e.g. RatioArray.__gt__() for Ratio < RatioArray.
     def compare(self, other):
         if isinstance(other, Ratio):
             #basically only taking the top part of the fraction comparison
             return (self.num * other.den) - (other.num * self.den)
         elif isinstance(other, int):
-            pass
+            return self.num - (other * self.den)
         elif isinstance(other, float):
             return (self.num / self.den) - other
         else:
-            raise ValueError("What is being compared to cannot be compared to a Ratio!")
+            return NotImplemented
 
     ## A static method that returns the lowest common multiple of two integers
     # a and b. lcm be calculated using gcd(): (a*b) // gcd(a,b)
@@ -375,6 +523,118 @@ class Ratio:
         return (newRatio.num / newRatio.den) / (tempo / 60)
 
 
+## A class that sums a long stream of Ratios (e.g. the durations of a voice)
+#  without normalizing after every addition. The accumulator keeps an integer
+#  numerator over a running least common multiple of all the denominators it
+#  has seen, so adding a value whose denominator already divides the running
+#  denominator is plain integer arithmetic. The sum is only reduced to a Ratio
+#  when it is read with value().
+#
+#  Example:
+#  @code
+#  total = RatioAccumulator()
+#  for note in voice:
+#      total += note.dur
+#  total.value()
+#  @endcode
+class RatioAccumulator:
+
+    __slots__ = ('num', 'den')
+
+    ## Creates an accumulator.
+    #  @param start The Ratio or int to start the sum at. Defaults to 0.
+    def __init__(self, start=0):
+        self.num = 0
+        self.den = 1
+        self.add(start)
+
+    ## Returns a string showing the accumulated (unreduced) fraction and the hex
+    #  value of the accumulator's memory address.
+    #  Example: <RatioAccumulator: 12/16 0x10610d2b0>
+    def __str__(self):
+        return f'<RatioAccumulator: {self.num}/{self.den} {hex(id(self))}>'
+
+    ## Returns a string expression that will evaluate to an accumulator holding
+    #  the same value.
+    def __repr__(self):
+        return f'RatioAccumulator({self.value()!r})'
+
+    ## Adds a Ratio or int to the sum.
+    #  @param value The Ratio or int to add.
+    #  @returns The accumulator, so calls can be chained.
+    #
+    #  A TypeError is raised if value is not a Ratio or int.
+    def add(self, value):
+        if isinstance(value, Ratio):
+            den = value.den
+            if self.den % den:
+                scale = den // math.gcd(self.den, den)
+                self.num *= scale
+                self.den *= scale
+            self.num += value.num * (self.den // den)
+        elif isinstance(value, int):
+            self.num += value * self.den
+        else:
+            raise TypeError("You can only accumulate a Ratio or an integer, your input was {}".format(value))
+        return self
+
+    ## Subtracts a Ratio or int from the sum.
+    #  @param value The Ratio or int to subtract.
+    #  @returns The accumulator, so calls can be chained.
+    def sub(self, value):
+        return self.add(-value)
+
+    ## Adds every Ratio or int in an iterable to the sum.
+    #  @param values An iterable of Ratios and/or ints.
+    #  @returns The accumulator, so calls can be chained.
+    def extend(self, values):
+        for value in values:
+            self.add(value)
+        return self
+
+    ## Implements accumulator += value. See: add().
+    __iadd__ = add
+
+    ## Implements accumulator -= value. See: sub().
+    __isub__ = sub
+
+    ## Returns the current sum as a Ratio in simplest form.
+    def value(self):
+        return Ratio._reduce(self.num, self.den)
+
+    ## Returns the current sum as a floating point number.
+    def float(self):
+        return self.num / self.den
+
+    ## Helper method implements comparison with a Ratio, int or float without
+    #  reducing the sum. See: Ratio.compare().
+    def compare(self, other):
+        if isinstance(other, Ratio):
+            return (self.num * other.den) - (other.num * self.den)
+        elif isinstance(other, int):
+            return self.num - (other * self.den)
+        elif isinstance(other, float):
+            return (self.num / self.den) - other
+        else:
+            raise ValueError("What is being compared to cannot be compared to a RatioAccumulator!")
+
+
+## Fills the Ratio intern cache with the common metric values: every multiple
+#  of a whole, half, triplet, quarter ... 1/64 subdivision up to a breve (2/1),
+#  plus the single, double and triple dotted values of 2/1 down to 1/64.
+#  Arithmetic that produces one of these values returns the shared instance.
+def _intern_metric_values():
+    for den in (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64, 96):
+        for num in range(2 * den + 1):
+            Ratio._intern(num, den)
+    for value in [Ratio(2, 1)] + [Ratio(1, 2 ** i) for i in range(7)]:
+        for dots in range(1, 4):
+            Ratio._intern(value.num * (2 ** (dots + 1) - 1), value.den * 2 ** dots)
+
+
+_intern_metric_values()
+
+
 if __name__ == '__main__':
     yeet = Ratio(3,4)
     print(yeet)
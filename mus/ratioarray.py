@@ -0,0 +1,300 @@
+###############################################################################
+## @file
+#  A NumPy backed array of exact fractions.
+#  The RatioArray class stores many Ratio values as two parallel int64 arrays
+#  of numerators and denominators so that durations and onsets can be added,
+#  compared and prefix-summed in a single vectorized call instead of one
+#  Ratio object at a time. Every element is always kept in simplest form with
+#  the sign carried by the numerator, exactly like Ratio. Converting to and
+#  from a list of Ratios is lossless.
+
+from functools import reduce
+
+import numpy as np
+
+from .ratio import Ratio
+
+
+class RatioArray:
+
+    ## Creates a RatioArray from numerators and denominators.
+    #  * RatioArray(nums, dens) - creates the array from two equal length
+    #  sequences of integers.
+    #  * RatioArray(nums) - creates the array from integer numerators with all
+    #  the denominators set to 1.
+    #
+    #  @param nums A sequence (or NumPy array) of integer numerators.
+    #  @param dens A sequence (or NumPy array) of non-zero integer denominators,
+    #  or None.
+    #
+    #  The constructor raises a TypeError if the values are not integers, a
+    #  ValueError if nums and dens have different shapes and a ZeroDivisionError
+    #  if any denominator is 0. Use from_ratios() to build an array from Ratios.
+    def __init__(self, nums, dens=None):
+        nums = np.asarray(nums)
+        dens = np.ones(nums.shape, dtype=np.int64) if dens is None else np.asarray(dens)
+        for values in (nums, dens):
+            if values.size and not np.issubdtype(values.dtype, np.integer):
+                raise TypeError("RatioArray values must be integers")
+        nums = nums.astype(np.int64).ravel()
+        dens = dens.astype(np.int64).ravel()
+        if nums.shape != dens.shape:
+            raise ValueError("The numerators and denominators must have the same length")
+        self.num, self.den = RatioArray._normalize(nums, dens)
+
+    ## Private static method that returns the numerators and denominators
+    #  in simplest form with positive denominators. See: np.gcd().
+    @staticmethod
+    def _normalize(nums, dens):
+        if np.any(dens == 0):
+            raise ZeroDivisionError("You cannot make a ratio with 0 in the denominator")
+        sign = np.where(dens < 0, -1, 1)
+        nums = nums * sign
+        dens = dens * sign
+        g = np.gcd(nums, dens)
+        return nums // g, dens // g
+
+    ## Private static method that returns the elementwise product of two
+    #  integer arrays (or scalars). Raises an OverflowError instead of letting
+    #  a product wrap around if it does not fit in 63 bits.
+    @staticmethod
+    def _product(a, b):
+        if np.any(np.abs(np.asarray(a, dtype=np.float64)) * np.abs(np.asarray(b, dtype=np.float64)) >= 2.0 ** 62):
+            raise OverflowError("The RatioArray result is too large for 64 bit integers")
+        return a * b
+
+    ## Private static method that returns the least common multiple of two
+    #  denominator arrays. See: _product().
+    @staticmethod
+    def _lcm(den1, den2):
+        return RatioArray._product(den1 // np.gcd(den1, den2), den2)
+
+    ## Private class method that wraps already normalized arrays without
+    #  copying or normalizing them again.
+    @classmethod
+    def _wrap(cls, nums, dens):
+        array = cls.__new__(cls)
+        array.num = nums
+        array.den = dens
+        return array
+
+    ## Creates a RatioArray from a sequence of Ratios (or ints).
+    #  @param ratios An iterable of Ratios and/or integers.
+    #  @returns A new RatioArray holding the same values.
+    #
+    #  Raises an OverflowError if a value does not fit in 64 bits.
+    @classmethod
+    def from_ratios(cls, ratios):
+        nums = []
+        dens = []
+        for ratio in ratios:
+            if isinstance(ratio, Ratio):
+                nums.append(ratio.num)
+                dens.append(ratio.den)
+            elif isinstance(ratio, int):
+                nums.append(ratio)
+                dens.append(1)
+            else:
+                raise TypeError(f"Cannot put {ratio} in a RatioArray")
+        return cls._wrap(np.array(nums, dtype=np.int64), np.array(dens, dtype=np.int64))
+
+    ## Returns the array as a list of Ratios.
+    def to_ratios(self):
+        return [Ratio._make(n, d) for n, d in zip(self.num.tolist(), self.den.tolist())]
+
+    ## Returns a string showing the array's fractions and the hex
+    #  value of the array's memory address.
+    #  Example: <RatioArray: [1/4, 1/8, 3/8] 0x10610d2b0>
+    def __str__(self):
+        return f'<RatioArray: [{", ".join(self.strings())}] {hex(id(self))}>'
+
+    ## Returns a string expression that will evaluate to this array.
+    def __repr__(self):
+        return f'RatioArray({self.num.tolist()}, {self.den.tolist()})'
+
+    ## Returns a list containing the 'num/den' string of every element.
+    def strings(self):
+        return [f'{n}/{d}' for n, d in zip(self.num.tolist(), self.den.tolist())]
+
+    ## Returns the number of ratios in the array.
+    def __len__(self):
+        return len(self.num)
+
+    ## Implements RatioArray iteration by returning an iterator of Ratios.
+    def __iter__(self):
+        return iter(self.to_ratios())
+
+    ## Implements array[index]. An integer index returns a Ratio, a slice,
+    #  integer array or boolean mask returns a new RatioArray.
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Ratio._make(int(self.num[index]), int(self.den[index]))
+        return RatioArray._wrap(self.num[index], self.den[index])
+
+    ## Private method that returns the numerators and denominators of an
+    #  operand as arrays (or scalars that broadcast against the array).
+    #
+    #  A TypeError is raised if other is not a RatioArray, Ratio or int.
+    def _operand(self, other):
+        if isinstance(other, RatioArray):
+            if len(other) != len(self):
+                raise ValueError("RatioArrays must have the same length")
+            return other.num, other.den
+        if isinstance(other, Ratio):
+            return np.int64(other.num), np.int64(other.den)
+        if isinstance(other, (int, np.integer)):
+            return np.int64(other), np.int64(1)
+        raise TypeError(f"You cannot combine {other} with a RatioArray")
+
+    ## Implements RatioArray + RatioArray, RatioArray + Ratio and
+    #  RatioArray + int. The denominators are converted to their least common
+    #  multiple before adding.
+    #  @returns A new RatioArray.
+    #
+    #  Raises an OverflowError if a result does not fit in 64 bits.
+    def __add__(self, other):
+        num, den = self._operand(other)
+        lcm = RatioArray._lcm(self.den, den)
+        product = RatioArray._product
+        return RatioArray._wrap(*RatioArray._normalize(product(self.num, lcm // self.den) + product(num, lcm // den), lcm))
+
+    ## Implements right side addition by calling __add__.
+    __radd__ = __add__
+
+    ## Implements -array (negation).
+    #  @returns A new RatioArray.
+    def __neg__(self):
+        return RatioArray._wrap(-self.num, self.den.copy())
+
+    ## Implements RatioArray - RatioArray, RatioArray - Ratio and RatioArray - int.
+    #  @returns A new RatioArray.
+    def __sub__(self, other):
+        num, den = self._operand(other)
+        lcm = RatioArray._lcm(self.den, den)
+        product = RatioArray._product
+        return RatioArray._wrap(*RatioArray._normalize(product(self.num, lcm // self.den) - product(num, lcm // den), lcm))
+
+    ## Implements Ratio - RatioArray and int - RatioArray.
+    #  @returns A new RatioArray.
+    def __rsub__(self, other):
+        return (-self).__add__(other)
+
+    ## Implements RatioArray * RatioArray, RatioArray * Ratio and RatioArray * int.
+    #  @returns A new RatioArray.
+    def __mul__(self, other):
+        num, den = self._operand(other)
+        product = RatioArray._product
+        return RatioArray._wrap(*RatioArray._normalize(product(self.num, num), product(self.den, den)))
+
+    ## Implements right side multiplication by calling __mul__.
+    __rmul__ = __mul__
+
+    ## Implements RatioArray / RatioArray, RatioArray / Ratio and RatioArray / int.
+    #  @returns A new RatioArray.
+    def __truediv__(self, other):
+        num, den = self._operand(other)
+        product = RatioArray._product
+        return RatioArray._wrap(*RatioArray._normalize(product(self.num, den), product(self.den, num)))
+
+    ## Implements Ratio / RatioArray and int / RatioArray.
+    #  @returns A new RatioArray.
+    def __rtruediv__(self, other):
+        num, den = self._operand(other)
+        product = RatioArray._product
+        return RatioArray._wrap(*RatioArray._normalize(product(num, self.den), product(den, self.num)))
+
+    ## Helper method implements elementwise comparison. Returns an int64 array
+    #  that is 0 where the ratios are equal, negative where self is less than
+    #  other and positive where self is greater. See: Ratio.compare().
+    def compare(self, other):
+        num, den = self._operand(other)
+        return RatioArray._product(self.num, den) - RatioArray._product(num, self.den)
+
+    ## Implements elementwise array < other. Returns a boolean array.
+    def __lt__(self, other):
+        return self.compare(other) < 0
+
+    ## Implements elementwise array <= other. Returns a boolean array.
+    def __le__(self, other):
+        return self.compare(other) <= 0
+
+    ## Implements elementwise array == other. Returns a boolean array.
+    def __eq__(self, other):
+        return self.compare(other) == 0
+
+    ## Implements elementwise array != other. Returns a boolean array.
+    def __ne__(self, other):
+        return self.compare(other) != 0
+
+    ## Implements elementwise array >= other. Returns a boolean array.
+    def __ge__(self, other):
+        return self.compare(other) >= 0
+
+    ## Implements elementwise array > other. Returns a boolean array.
+    def __gt__(self, other):
+        return self.compare(other) > 0
+
+    ## RatioArrays compare elementwise so they cannot be hashed.
+    __hash__ = None
+
+    ## Returns the least common multiple of all the denominators as a
+    #  Python integer. The result is 1 for an empty array.
+    def common_den(self):
+        return reduce(Ratio.lcm, np.unique(self.den).tolist(), 1)
+
+    ## Private method that returns the numerators scaled to the common
+    #  denominator. Raises an OverflowError if the scaled sum of the array
+    #  would not fit in 64 bits.
+    def _scaled(self, lcm):
+        if lcm * float(np.sum(np.abs(self.num) / self.den)) >= 2 ** 62:
+            raise OverflowError("The RatioArray sum is too large for 64 bit integers")
+        return self.num * (np.int64(lcm) // self.den)
+
+    ## Returns the running (prefix) sums of the array, e.g. the onsets of a
+    #  list of durations are [0] + durations.cumsum()[:-1].
+    #  @returns A new RatioArray the same length as this one.
+    #
+    #  The sums are computed with a single cumsum over numerators scaled to
+    #  the common denominator and one vectorized gcd. See: common_den().
+    def cumsum(self):
+        lcm = self.common_den()
+        total = np.cumsum(self._scaled(lcm))
+        return RatioArray._wrap(*RatioArray._normalize(total, np.full(total.shape, lcm, dtype=np.int64)))
+
+    ## Returns the onset of each element if the array holds consecutive
+    #  durations: the first onset is 0 and each following onset is the sum
+    #  of all the previous durations.
+    #  @param start The Ratio (or int) onset of the first element.
+    #  @returns A new RatioArray the same length as this one.
+    def onsets(self, start=0):
+        if not len(self):
+            return RatioArray([])
+        sums = self.cumsum()
+        return RatioArray._wrap(np.concatenate(([0], sums.num[:-1])),
+                                np.concatenate(([1], sums.den[:-1]))) + start
+
+    ## Returns the sum of all the elements as a Ratio.
+    def sum(self):
+        lcm = self.common_den()
+        return Ratio(int(np.sum(self._scaled(lcm))), lcm)
+
+    ## Returns the array as a float64 NumPy array.
+    def float(self):
+        return self.num / self.den
+
+    ## Converts the ratios to floating point seconds according to a
+    #  given tempo and beat. See: Ratio.seconds().
+    #  @param tempo  The tempo in beats per minute. Defaults to 60.
+    #  @param beat  A ratio representing the beat. Defaults to 1/4 (quarter note).
+    #  @returns A float64 NumPy array.
+    def seconds(self, tempo=60, beat=None):
+        if beat is None:
+            beat = Ratio(1, 4)
+        return (self / beat).float() / (tempo / 60)
+
+
+if __name__ == '__main__':
+    durs = RatioArray.from_ratios([Ratio(1, 4), Ratio(1, 8), Ratio(1, 8), Ratio(1, 2)])
+    print(durs)
+    print(durs.onsets())
+    print(durs.sum())
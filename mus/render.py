@@ -0,0 +1,143 @@
+###############################################################################
+## @file
+#  Block based additive synthesis of note lists and scores to WAV files.
+#
+#  A note is an (onset, dur, keynum) tuple where onset and dur are Ratios (or
+#  ints) measured in whole notes and keynum is a midi key number. Onsets and
+#  durations become seconds with Ratio.seconds(tempo, beat) and key numbers
+#  become hertz with midi_to_hertz(). The audio is computed in fixed size
+#  blocks: every block synthesizes all the sounding notes at once as a 2D
+#  NumPy array (one row per voice) and is written to the WAV file before the
+#  next block is started, so only one block of audio is ever in memory.
+#
+#  Notes are played by a fixed pool of voices. A starting note takes a free
+#  voice, or the voice that started earliest if all are busy, and gives it
+#  back when its release has finished.
+
+import wave
+from collections import namedtuple
+
+import numpy as np
+
+from .ratio import Ratio, RatioAccumulator
+from .tet import midi_to_hertz
+
+## A note to render: its Ratio onset and duration and its midi key number.
+RenderNote = namedtuple('RenderNote', ['onset', 'dur', 'keynum'])
+
+## The default relative amplitudes of the harmonics 1, 2, 3 ... of a voice.
+HARMONICS = (1.0, 0.5, 0.25, 0.125)
+
+
+## Returns the sorted RenderNotes of a Score. Rests are skipped and each note
+#  of a chord becomes its own RenderNote. The onset of a bar is the sum of
+#  the durations of the bars before it in its staff, where the duration of a
+#  bar is the duration of its longest voice. The onsets of a voice are
+#  summed with a RatioAccumulator, so the sum is only reduced at the notes
+#  that are rendered. See also: Timebase.
+#  @param score A Score (or anything iterable as parts, staffs, bars, voices
+#  and durationals).
+def score_notes(score):
+    notes = []
+    for part in score:
+        for staff in part:
+            barOnset = Ratio(0)
+            for bar in staff:
+                barEnd = barOnset
+                for voice in bar:
+                    onset = RatioAccumulator(barOnset)
+                    for note in voice:
+                        # the score may carry its own copy of the Ratio class
+                        dur = Ratio(note.dur.num, note.dur.den)
+                        keynums = [pitched.pitch.keynum() for pitched in getattr(note, 'notes', None) or [note]
+                                   if getattr(pitched, 'pitch', None) is not None]
+                        if keynums:
+                            start = onset.value()
+                            notes.extend(RenderNote(start, dur, keynum) for keynum in keynums)
+                        onset += dur
+                    if onset.compare(barEnd) > 0:
+                        barEnd = onset.value()
+                barOnset = barEnd
+    notes.sort(key=lambda n: n.onset)
+    return notes
+
+
+## Renders a list of notes to a mono 16 bit WAV file.
+#  @param notes An iterable of (onset, dur, keynum) tuples, e.g. RenderNotes
+#  or the result of score_notes().
+#  @param path The path of the WAV file to write.
+#  @param tempo The tempo in beats per minute. See: Ratio.seconds().
+#  @param beat The Ratio beat. Defaults to 1/4 (quarter note).
+#  @param rate The sample rate in hertz.
+#  @param voices The number of voices in the pool.
+#  @param harmonics The relative amplitudes of the harmonics of each voice.
+#  @param attack The attack time of each note in seconds.
+#  @param release The release time of each note in seconds.
+#  @param gain The amplitude of a single voice (0.0 - 1.0). The mix is
+#  clipped to -1.0 - 1.0.
+#  @param blocksize The number of samples computed and written at a time.
+#  @returns The length of the file in seconds.
+def render(notes, path, tempo=60, beat=None, rate=44100, voices=16, harmonics=HARMONICS,
+           attack=0.005, release=0.05, gain=0.2, blocksize=4096):
+    if beat is None:
+        beat = Ratio(1, 4)
+    # sample positions and frequencies of every note, in onset order
+    events = []
+    for onset, dur, keynum in notes:
+        onset = onset if isinstance(onset, Ratio) else Ratio(onset)
+        dur = dur if isinstance(dur, Ratio) else Ratio(dur)
+        start = int(round(onset.seconds(tempo, beat) * rate))
+        end = start + int(round(dur.seconds(tempo, beat) * rate))
+        events.append((start, end, midi_to_hertz(keynum)))
+    events.sort(key=lambda e: e[0])
+    attack = max(1, int(attack * rate))
+    release = max(1, int(release * rate))
+    total = max((end for start, end, hertz in events), default=0) + release
+    amps = np.asarray(harmonics, dtype=np.float64)
+    ranks = np.arange(1, len(amps) + 1, dtype=np.float64)[:, None, None]
+    # the voice pool: start and end sample and frequency of each voice. A
+    # voice is free once its release ended before the current block, so a
+    # voice is never reused while the block still holds its last note.
+    starts = np.zeros(voices, dtype=np.int64)
+    ends = np.full(voices, -release, dtype=np.int64)
+    freqs = np.zeros(voices)
+    nxt = 0
+    with wave.open(path, 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        for block in range(0, total, blocksize):
+            stop = min(block + blocksize, total)
+            while nxt < len(events) and events[nxt][0] < stop:
+                free = np.flatnonzero(ends + release <= block)
+                voice = free[0] if len(free) else int(np.argmin(starts))
+                starts[voice], ends[voice], freqs[voice] = events[nxt]
+                nxt += 1
+            out.writeframes(_block(block, stop, starts, ends, freqs, amps, ranks, attack, release, gain, rate))
+    return total / rate
+
+
+## Private helper that synthesizes the samples block to stop of every voice
+#  in the pool and returns the mix as 16 bit PCM bytes.
+def _block(block, stop, starts, ends, freqs, amps, ranks, attack, release, gain, rate):
+    sounding = (starts < stop) & (ends + release > block)
+    if not sounding.any():
+        return np.zeros(stop - block, dtype='<i2').tobytes()
+    start = starts[sounding][:, None]
+    end = ends[sounding][:, None]
+    # samples since each note started, one row per sounding voice
+    elapsed = np.arange(block, stop)[None, :] - start
+    phase = (2 * np.pi / rate) * freqs[sounding][:, None] * elapsed
+    tone = np.tensordot(amps, np.sin(ranks * phase[None, :, :]), axes=1)
+    # a linear attack from the start and a linear release after the end
+    envelope = np.clip(elapsed / attack, 0.0, 1.0) * np.clip((end + release - start - elapsed) / release, 0.0, 1.0)
+    mix = np.clip(gain * (tone * envelope).sum(axis=0) / amps.sum(), -1.0, 1.0)
+    return (mix * 32767).astype('<i2').tobytes()
+
+
+if __name__ == '__main__':
+    import tempfile
+    scale = [RenderNote(Ratio(i, 8), Ratio(1, 8), key) for i, key in enumerate([60, 62, 64, 65, 67, 69, 71, 72])]
+    chord = [RenderNote(Ratio(1), Ratio(1, 2), key) for key in (60, 64, 67, 72)]
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp:
+        print(temp.name, render(scale + chord, temp.name, tempo=120))
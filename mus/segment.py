@@ -0,0 +1,152 @@
+###############################################################################
+## @file
+#  Streaming segmentation of fundamental frequency (f0) tracks into notes.
+#
+#  A pitch tracker produces one f0 estimate per analysis frame, e.g. 100
+#  frames per second, with 0 (or NaN) for frames that have no pitch. The
+#  segment() generator reads such a track block by block and yields a
+#  NoteEvent for every note it finds, so hours of tracker output can be
+#  turned into notes in bounded memory. Each block is converted to
+#  fractional midi key numbers with one NumPy call and note boundaries are
+#  found with vectorized searches, never one Python step per frame.
+#
+#  Segmentation rules:
+#  1. Hysteresis. A note keeps its key number until the pitch moves more than
+#     50 + hysteresis cents away from it, so vibrato and a pitch hovering
+#     around a quarter tone do not split the note.
+#  2. Unvoiced frames. Frames without a pitch end the current note unless the
+#     gap is at most maxgap seconds long and the pitch resumes on the same
+#     key. Frames whose nearest key is outside 0-127 count as unvoiced.
+#  3. Minimum duration. Notes shorter than mindur seconds are dropped.
+
+from collections import namedtuple
+
+import numpy as np
+
+from .tet import midi_to_pitch
+
+## A note found in an f0 track: its onset and duration in seconds, its midi
+#  key number and its pitch name.
+NoteEvent = namedtuple('NoteEvent', ['onset', 'dur', 'midi', 'pitch'])
+
+## The smallest number of frames searched at a time, see: _first().
+_WINDOW = 32
+
+
+## A generator that yields the notes of a stream of f0 estimates.
+#  @param blocks Either a 1D NumPy array of f0 values in hertz or an iterable
+#  of such arrays (or lists), e.g. the blocks read from a pitch tracker.
+#  Values that are 0, negative or NaN are unvoiced frames.
+#  @param rate The number of frames per second.
+#  @param hysteresis The extra distance in cents, beyond the 50 cents to the
+#  next key, the pitch must move before a new note starts.
+#  @param mindur The shortest note in seconds, shorter notes are dropped.
+#  @param maxgap The longest run of unvoiced frames in seconds that does not
+#  end a note.
+#  @returns An iterator of NoteEvents in onset order.
+#
+#  Example:
+#  @code
+#  for note in segment(tracker_blocks, rate=100):
+#      print(note.onset, note.dur, note.pitch)
+#  @endcode
+def segment(blocks, rate=100.0, hysteresis=30.0, mindur=0.05, maxgap=0.0):
+    if rate <= 0:
+        raise ValueError(f"The frame rate must be positive, your input was {rate}")
+    if isinstance(blocks, np.ndarray):
+        blocks = (blocks,)
+    band = (50.0 + hysteresis) / 100.0
+    minframes = max(1, int(round(mindur * rate)))
+    maxframes = int(round(maxgap * rate))
+    key = None
+    # true while the current note is interrupted by unvoiced frames
+    gap = False
+    # the global frame index of the current note's first and last voiced
+    # frames, and of the first frame of the current block.
+    start = last = offset = 0
+    for block in blocks:
+        midis, voiced = _fractional_midis(block)
+        size = len(midis)
+        i = 0
+        while i < size:
+            if key is None:
+                j = _first(lambda lo, hi: voiced[lo:hi], i, size)
+                if j < 0:
+                    break
+                key = int(np.rint(midis[j]))
+                start = last = offset + j
+                i = j + 1
+                continue
+            if not gap:
+                # the first frame that is unvoiced or outside the key's band
+                j = _first(lambda lo, hi: ~voiced[lo:hi] | (np.abs(midis[lo:hi] - key) > band), i, size)
+                if j < 0:
+                    last = offset + size - 1
+                    break
+                if j > i:
+                    last = offset + j - 1
+                i = j
+                gap = not voiced[j]
+                if gap:
+                    continue
+            else:
+                # the gap ends at the next voiced frame, possibly in a later block
+                i = _first(lambda lo, hi: voiced[lo:hi], i, size)
+                if i < 0:
+                    break
+                gap = False
+                if offset + i - last - 1 <= maxframes and abs(midis[i] - key) <= band:
+                    continue
+            if last - start + 1 >= minframes:
+                yield _event(key, start, last, rate)
+            key = None
+        offset += size
+    if key is not None and last - start + 1 >= minframes:
+        yield _event(key, start, last, rate)
+
+
+## Returns a list of all the notes in an f0 track. See: segment().
+def notes(f0, rate=100.0, hysteresis=30.0, mindur=0.05, maxgap=0.0):
+    return list(segment(f0, rate, hysteresis, mindur, maxgap))
+
+
+## Private helper that returns the fractional midi key numbers of a block of
+#  f0 values and a boolean mask of the voiced frames.
+def _fractional_midis(block):
+    hertz = np.asarray(block, dtype=np.float64).ravel()
+    voiced = np.isfinite(hertz) & (hertz > 0)
+    midis = np.zeros(hertz.shape)
+    midis[voiced] = 69 + 12 * np.log2(hertz[voiced] / 440.0)
+    nearest = np.rint(midis)
+    voiced &= (nearest >= 0) & (nearest <= 127)
+    return midis, voiced
+
+
+## Private helper that returns the first index at or after i where a test
+#  is true, or -1 if there is none before size. The test is called with
+#  (lo, hi) and returns a boolean array for the frames lo to hi. The window
+#  doubles after every miss, so finding a boundary costs time proportional to
+#  the distance to it rather than to the size of the block.
+def _first(test, i, size):
+    window = _WINDOW
+    while i < size:
+        hi = min(i + window, size)
+        hits = np.flatnonzero(test(i, hi))
+        if len(hits):
+            return i + int(hits[0])
+        i = hi
+        window *= 2
+    return -1
+
+
+## Private helper that returns the NoteEvent for a key held from frame
+#  start to frame last.
+def _event(key, start, last, rate):
+    return NoteEvent(start / rate, (last - start + 1) / rate, key, midi_to_pitch(key))
+
+
+if __name__ == '__main__':
+    track = np.concatenate([np.full(30, 261.6), np.zeros(5), np.full(40, 440.0 * 2 ** (0.3 / 12)),
+                            np.full(3, 470.0), np.full(20, 392.0)])
+    for note in segment([track[:50], track[50:]], rate=100, maxgap=0.1):
+        print(note)
@@ -21,6 +21,7 @@
 #     72, 'C3', 'C5', 'B#4', 'Dbb8',  and so on.
 
 import math
+from types import MappingProxyType
 
 
 ## Returns the midi key number for a given hertz frequency.
@@ -40,7 +41,7 @@ def hertz_to_midi(hertz): #done
     else:
         raise ValueError("The hertz value is outside of the valid MIDI range of 0-127. Your value was {}".format(hertzConv))
 
-# Returns the hertz value for a given midi key number.
+## Returns the hertz value for a given midi key number.
 #  The formula for mapping midi key numbers into hertz is
 #  440.0 * 2 ** ((midi-69)/12).
 #  @param midi  The midi key number to convert.
@@ -50,7 +51,7 @@ def hertz_to_midi(hertz): #done
 #  is not a valid midi key number.
 def midi_to_hertz(midi): #done
     if check_midi(midi) and isinstance(midi, int):
-        return 440.0 * 2 ** ((round(midi) - 69) / 12)
+        return MIDI_HERTZ[midi]
     else:
         raise ValueError("The MIDI value is outside the valid MIDI range. Your input was {}".format(midi))
 
@@ -66,7 +67,7 @@ def midi_to_hertz(midi): #done
 def midi_to_pc(midi):
     if check_midi(midi):
         #will have to round the midi
-        return round(midi) % 12
+        return MIDI_PCS[round(midi)]
     else:
         raise ValueError("The MIDI value is outside the valid MIDI range. Your input was {}".format(midi))
 
@@ -92,105 +93,14 @@ def midi_to_pc(midi):
 #  @returns An integer midi key number 0-127.
 #
 #  The function should signal a ValueError if the input is not a valid
-#  pitch name or produces an invalid midi key number.
+#  pitch name or produces an invalid midi key number. Every valid pitch
+#  name is precomputed in PITCH_MIDIS so parsing is a single lookup.
 def pitch_to_midi(pitch):
-    letterDict = {'C': 0,
-                  'D': 2,
-                  'E': 4,
-                  'F': 5,
-                  'G': 7,
-                  'A': 9,
-                  'B': 11, }
-
-    if isinstance(pitch, str):
-        pitchList = list(pitch)
-    else:
-        raise ValueError("Your input pitch is not a valid pitch")
-    #              0      2      4   5      7      9     11  Used to find the midi key for a pitch class
-    # just use a dictionary dummy
-    # dictionary.get('key','if not found')
-
-
-    # .upper used if the user tries to use a lowercase letter
-    midi = letterDict.get(pitchList[0],"Not Found")
-    if midi != "Not Found":
-    #checks for #, ##, b, bb, and natural and nothing else
-        if pitchList[1] == '#' or pitchList[1] == 's':
-            #if "##"
-            if pitchList[2] == '#' or pitchList[2] == 's':
-                midi += 2
-                #checks for a valid octave number, makes sure there are no other characters other than digits
-                if check_if_valid_octave(pitchList, 3):
-                    #finds the midi number
-                    return find_octave_in_pitch(pitchList, midi)
-                    #checks the midi number to see if it is in the valid midi range and raises and error if not
-
-                else:
-                    raise ValueError("The input pitch is not a valid pitch")
-            #if "#"
-            else:
-                midi += 1
-                if check_if_valid_octave(pitchList, 2):
-                    return find_octave_in_pitch(pitchList, midi)
-                else:
-                    raise ValueError("The input pitch is not a valid pitch")
-        # if flats
-        elif pitchList[1] == 'b' or pitchList[1] == 'f':
-            #if 'bb'
-            if pitchList[2] == 'b' or pitchList[2] == 'f':
-                midi -= 2
-                if check_if_valid_octave(pitchList, 3):
-                    return find_octave_in_pitch(pitchList, midi)
-
-                else:
-                    raise ValueError("The input pitch is not a valid pitch")
-            #if 'b'
-            else:
-                midi -= 1
-                if check_if_valid_octave(pitchList, 2):
-                    return find_octave_in_pitch(pitchList, midi)
-
-                else:
-                    raise ValueError("The input pitch is not a valid pitch")
-        #needs to check if there are any other characters in the pitch other than numbers, uses check_if_valid_octave
-        else:
-            if check_if_valid_octave(pitchList, 1):
-                return find_octave_in_pitch(pitchList, midi)
-            else:
-                raise ValueError("The input pitch is not a valid pitch")
-    else:
-        raise ValueError("The input pitch is not a valid pitch")
-
-#checking for 00 vs 0
-#creates a string with all numbers in the pitch
-#then returns the total midi value with the appropriate amount of octaves
-#throws Value Error if outside the valid midi range
-
-def find_octave_in_pitch(pitchList, midi):
-
-    octaves = [num for num in pitchList if num.isdigit()]
-    octaves = ''.join(octaves)
-    if octaves == '':
-        raise ValueError("The input pitch is not a valid pitch")
-
-    if octaves == '00':
-        return midi
-    elif len(octaves) < 2:
-        midi += (int(octaves) + 1) * 12
-        if check_midi(midi):
-            return midi
-        else:
-            raise ValueError(
-                "The input pitch is outside the valid MIDI range of 0-127. Your MIDI value was {}".format(midi))
-    else:
-        raise ValueError("The input pitch is not a valid pitch")
+    try:
+        return PITCH_MIDIS[pitch]
+    except (KeyError, TypeError):
+        raise ValueError("The input pitch is not a valid pitch. Your input was {}".format(pitch))
 
-#Checks if the rest of the pitch is a valid pitch string, specifically the octave
-def check_if_valid_octave(pitchList, preceedingChars):
-    for num in range(preceedingChars, len(pitchList)):
-        if not(str(pitchList[num]).isdigit()):
-            return False
-    return True
 ## Returns a pitch name for the given key number.
 #  If no accidental is proved in the call, white key numbers produce
 #  pitch names with no accidentals and black key numbers return C# Eb F# Ab Bb.
@@ -202,125 +112,13 @@ def check_if_valid_octave(pitchList, preceedingChars):
 #
 #  The function should raise a ValueError if the midi key number
 #  is invalid or if the pitch requested does not support the specified
-#  accidental.
+#  accidental. The names are looked up in MIDI_PITCHES.
 def midi_to_pitch(midi, accidental=None):
-    #can redo using a dictionary
-    #or do a 3 lists, pitch class, accidental, and octave
-    keyList = ['C','D','E','F','G','A','B']
-    accidentalList = ['bb','ff','b','f','','#','s','##','ss']
-    octaveList = ['00','0','1','2','3','4','5','6','7','8','9']
-    #still need to check how the edge case of B# works
-    if check_midi(midi):
-        noteNumPitch = divmod(midi, 12)
-        octave = noteNumPitch[0]
-        if octave == 0:
-            octave = '00'
-        else:
-            octave = str(noteNumPitch[0] - 1)
-        if noteNumPitch[1] == 0:
-            if accidental == 'bb' or accidental == 'ff':
-                return 'Dbb'+ octave
-            elif accidental == '#' or accidental == 's':
-                return 'B#' + str((int(octave) - 1))
-            elif accidental == None:
-                return 'C' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-        if noteNumPitch[1] == 1:
-            if accidental == 'b' or accidental == 'f':
-                return 'Db' + octave
-            elif accidental == '#' or accidental == 's' or accidental == None:
-                return 'C#' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-        if noteNumPitch[1] == 2:
-            if accidental == 'bb' or accidental == 'ff':
-                return 'Ebb' + octave
-            elif accidental == '##' or accidental == 'ss':
-                return 'C##' + octave
-            elif accidental == None:
-                return 'D' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-        if noteNumPitch[1] == 3:
-            if accidental == '#' or accidental == 's':
-                return 'D#' + octave
-            elif accidental == 'b' or accidental == 'f' or accidental == None:
-                return 'Eb' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-        if noteNumPitch[1] == 4:
-            if accidental == 'b' or accidental == 'f':
-                return 'Fb' + octave
-            elif accidental == '##' or accidental == 'ss':
-                return 'D##' + octave
-            elif accidental == None:
-               return 'E' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-        if noteNumPitch[1] == 5:
-            if accidental == 'bb' or accidental == 'ff':
-                return 'Gbb' + octave
-            elif accidental == '#' or accidental == 's':
-                return 'E#' + octave
-            elif accidental == None:
-               return 'F' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-
-        if noteNumPitch[1] == 6:
-            if accidental == 'b' or accidental == 'f':
-                return 'Gb' + octave
-            elif accidental == '#' or accidental == 's' or accidental == None:
-                return 'F#' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-        if noteNumPitch[1] == 7:
-            if accidental == 'bb' or accidental == 'ff':
-                return 'Abb' + octave
-            elif accidental == '##' or accidental == 'ss':
-                return 'F##' + octave
-            elif accidental == None:
-                return 'G' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-
-        if noteNumPitch[1] == 8:
-            if accidental == 'b' or accidental == 'f' or accidental == None:
-                return 'Ab' + octave
-            elif accidental == '#' or accidental == 's':
-                return 'G#' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-        if noteNumPitch[1] == 9:
-            if accidental == 'bb' or accidental == 'ff':
-                return 'Bbb' + octave
-            elif accidental == '##' or accidental == 'ss':
-                return 'G##' + octave
-            elif accidental == None:
-                return 'A' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-
-        if noteNumPitch[1] == 10:
-            if accidental == 'bb' or accidental == 'ff':
-                return 'Cbb' + str(int(octave) + 1)
-            if accidental == 'b' or accidental == 'f' or accidental == None:
-                return 'Bb' + octave
-            elif accidental == '#' or accidental == 's':
-                return 'A#' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
-
-        if noteNumPitch[1] == 11:
-            if accidental == 'b' or accidental == 'f':
-                return 'Cb' + octave
-            elif accidental == '##' or accidental == 'ss':
-                return 'A##' + octave
-            elif accidental == None:
-                return 'B' + octave
-            else:
-                raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
+    if isinstance(midi, int) and check_midi(midi):
+        try:
+            return MIDI_PITCHES[midi][accidental]
+        except KeyError:
+            raise ValueError("Pitch requested is not valid based on the midi number of {}".format(midi))
     else:
         raise ValueError("Midi value is not a valid number. Your midi value was {}".format(midi))
 
@@ -342,7 +140,7 @@ def hertz_to_pitch(hertz):
 #  @param pitch  The pitch name to convert.
 #  @returns A floating point hertz value.
 def pitch_to_hertz(pitch):
-    return midi_to_hertz(pitch_to_midi(pitch))
+    return MIDI_HERTZ[pitch_to_midi(pitch)]
 
 
 def check_midi(midi):
@@ -350,6 +148,181 @@ def check_midi(midi):
         return False
     return True
 
+
+## The hertz frequency of every midi key number 0-127, i.e.
+#  MIDI_HERTZ[69] is 440.0. See: midi_to_hertz().
+MIDI_HERTZ = tuple(440.0 * 2 ** ((midi - 69) / 12) for midi in range(128))
+
+## The pitch class of every midi key number 0-127. See: midi_to_pc().
+MIDI_PCS = tuple(midi % 12 for midi in range(128))
+
+## The spellings of each pitch class as a dictionary of accidental:
+#  (name, octave offset). The None entry is the default spelling. B# belongs
+#  to the octave below its key number's and Cbb to the octave above.
+_PC_SPELLINGS = (
+    {None: ('C', 0), 'bb': ('Dbb', 0), '#': ('B#', -1)},
+    {None: ('C#', 0), 'b': ('Db', 0), '#': ('C#', 0)},
+    {None: ('D', 0), 'bb': ('Ebb', 0), '##': ('C##', 0)},
+    {None: ('Eb', 0), 'b': ('Eb', 0), '#': ('D#', 0)},
+    {None: ('E', 0), 'b': ('Fb', 0), '##': ('D##', 0)},
+    {None: ('F', 0), 'bb': ('Gbb', 0), '#': ('E#', 0)},
+    {None: ('F#', 0), 'b': ('Gb', 0), '#': ('F#', 0)},
+    {None: ('G', 0), 'bb': ('Abb', 0), '##': ('F##', 0)},
+    {None: ('Ab', 0), 'b': ('Ab', 0), '#': ('G#', 0)},
+    {None: ('A', 0), 'bb': ('Bbb', 0), '##': ('G##', 0)},
+    {None: ('Bb', 0), 'bb': ('Cbb', 1), 'b': ('Bb', 0), '#': ('A#', 0)},
+    {None: ('B', 0), 'b': ('Cb', 0), '##': ('A##', 0)},
+)
+
+## The alternate accidental spellings accepted by midi_to_pitch().
+_ACCIDENTAL_ALIASES = {'ff': 'bb', 'f': 'b', 's': '#', 'ss': '##'}
+
+
+## Private helper that builds the MIDI_PITCHES table.
+def _build_midi_pitches():
+    table = []
+    for midi in range(128):
+        octave, pc = divmod(midi, 12)
+        octave = '00' if octave == 0 else str(octave - 1)
+        names = {}
+        for accidental, (name, offset) in _PC_SPELLINGS[pc].items():
+            names[accidental] = name + (str(int(octave) + offset) if offset else octave)
+        for alias, accidental in _ACCIDENTAL_ALIASES.items():
+            if accidental in names:
+                names[alias] = names[accidental]
+        table.append(names)
+    return tuple(table)
+
+
+## The pitch names of every midi key number 0-127. Each entry is a
+#  dictionary mapping an accidental (or None) to the pitch name spelled with
+#  it, e.g. MIDI_PITCHES[60]['#'] is 'B#3'. See: midi_to_pitch().
+MIDI_PITCHES = _build_midi_pitches()
+
+## The spellings of each accidental in a pitch name and its semitone offset.
+#  The two characters of a double accidental may be mixed, e.g. 'C#s4'.
+_NAME_ACCIDENTALS = {'': 0, 'b': -1, 'f': -1, '#': 1, 's': 1,
+                     'bb': -2, 'bf': -2, 'fb': -2, 'ff': -2,
+                     '##': 2, '#s': 2, 's#': 2, 'ss': 2}
+
+
+## Private helper that builds the PITCH_MIDIS table by enumerating every
+#  letter, accidental and octave and keeping the names inside 0-127.
+def _build_pitch_midis():
+    letters = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+    octaves = {'00': 0}
+    octaves.update((str(octave), (octave + 1) * 12) for octave in range(10))
+    table = {}
+    for letter, pc in letters.items():
+        for accidental, offset in _NAME_ACCIDENTALS.items():
+            for octave, base in octaves.items():
+                midi = base + pc + offset
+                if check_midi(midi):
+                    table[letter + accidental + octave] = midi
+    return MappingProxyType(table)
+
+
+## A read only dictionary mapping every valid pitch name to its midi key
+#  number, e.g. PITCH_MIDIS['C4'] is 60. See: pitch_to_midi().
+PITCH_MIDIS = _build_pitch_midis()
+
+## The NumPy module and read only NumPy copies of MIDI_HERTZ and MIDI_PCS,
+#  set by _numpy() the first time an array function is called.
+_NUMPY_TABLES = None
+
+
+## Private helper that imports NumPy and returns a tuple (np, hertz, pcs)
+#  with the module and the table arrays. Only the *_array functions need
+#  NumPy, so the rest of tet works without it.
+def _numpy():
+    global _NUMPY_TABLES
+    if _NUMPY_TABLES is None:
+        import numpy as np
+        hertz = np.array(MIDI_HERTZ)
+        hertz.flags.writeable = False
+        pcs = np.array(MIDI_PCS, dtype=np.int64)
+        pcs.flags.writeable = False
+        _NUMPY_TABLES = (np, hertz, pcs)
+    return _NUMPY_TABLES
+
+
+## Returns the hertz frequencies of an array of midi key numbers.
+#  Integer key numbers are looked up in MIDI_HERTZ, fractional key numbers
+#  (e.g. from a pitch tracker) use the formula 440.0 * 2 ** ((midi-69)/12).
+#  @param midis  A sequence or NumPy array of midi key numbers 0-127.
+#  @returns A float64 NumPy array.
+#
+#  The function raises a ValueError if any key number is outside 0-127.
+def midi_to_hertz_array(midis):
+    np, hertz, pcs = _numpy()
+    midis = _as_midis(midis)
+    if np.issubdtype(midis.dtype, np.integer):
+        return hertz[midis]
+    return 440.0 * 2 ** ((midis - 69) / 12)
+
+
+## Returns the midi key numbers of an array of hertz frequencies.
+#  @param hertz  A sequence or NumPy array of positive frequencies.
+#  @param fractional  If true the unrounded float64 key numbers are returned,
+#  e.g. 445 Hz is 69.196, otherwise the nearest integer key numbers.
+#  @returns An int64 (or float64) NumPy array.
+#
+#  The function raises a ValueError if any frequency is not positive or its
+#  nearest key number is outside 0-127. See: hertz_to_midi().
+def hertz_to_midi_array(hertz, fractional=False):
+    np = _numpy()[0]
+    midis = _fractional_midis(hertz)
+    nearest = np.rint(midis)
+    if np.any((nearest < 0) | (nearest > 127)):
+        raise ValueError("The hertz values must be inside the valid MIDI range of 0-127")
+    return midis if fractional else nearest.astype(np.int64)
+
+
+## Returns the nearest midi key number of an array of hertz frequencies and
+#  how far each frequency is from that key in cents (-50 to 50), e.g. 445 Hz
+#  is key 69 plus 19.6 cents.
+#  @param hertz  A sequence or NumPy array of positive frequencies.
+#  @returns A tuple (midis, cents) of an int64 and a float64 NumPy array.
+def hertz_to_cents_array(hertz):
+    np = _numpy()[0]
+    midis = hertz_to_midi_array(hertz, fractional=True)
+    nearest = np.rint(midis)
+    return nearest.astype(np.int64), (midis - nearest) * 100
+
+
+## Returns the pitch classes of an array of midi key numbers. Fractional key
+#  numbers are rounded to the nearest key first, like midi_to_pc().
+#  @param midis  A sequence or NumPy array of midi key numbers 0-127.
+#  @returns An int64 NumPy array of pitch classes 0-11.
+def midi_to_pc_array(midis):
+    np, hertz, pcs = _numpy()
+    midis = _as_midis(midis)
+    if not np.issubdtype(midis.dtype, np.integer):
+        midis = np.rint(midis).astype(np.int64)
+    return pcs[midis]
+
+
+## Private helper that returns midi key numbers as a flat NumPy array,
+#  raising a ValueError if any of them is outside 0-127.
+def _as_midis(midis):
+    np = _numpy()[0]
+    midis = np.asarray(midis).ravel()
+    if not (np.issubdtype(midis.dtype, np.integer) or np.issubdtype(midis.dtype, np.floating)):
+        raise ValueError("Midi values must be numbers")
+    if not np.all(np.isfinite(midis)) or np.any((midis < 0) | (midis > 127)):
+        raise ValueError("Midi values must be inside the valid MIDI range of 0-127")
+    return midis
+
+
+## Private helper that returns the unrounded key numbers of an array of
+#  hertz values, raising a ValueError if any of them is not positive.
+def _fractional_midis(hertz):
+    np = _numpy()[0]
+    hertz = np.asarray(hertz, dtype=np.float64).ravel()
+    if not np.all(hertz > 0) or not np.all(np.isfinite(hertz)):
+        raise ValueError("Hertz values must be positive numbers")
+    return 69 + np.log2(hertz / 440.0) * 12
+
 ###############################################################################
 # There are two methods you can use to test out code as you develop it.
 #
@@ -0,0 +1,244 @@
+###############################################################################
+## @file
+#  Tuning systems: equal temperaments, just intonation, Pythagorean,
+#  meantone and custom (Scala) tables.
+#
+#  The tet module is fixed to twelve-tone equal temperament at A440. A Tuning
+#  describes any repeating scale as the sizes of its degrees in cents above
+#  the scale's root, plus the size of the period the scale repeats at
+#  (normally the 1200 cent octave). Key numbers count scale degrees: the
+#  root key is degree 0, root key + 1 is degree 1 and so on, wrapping into
+#  the next period after the last degree. A reference key and frequency
+#  anchor the tuning to hertz, e.g. key 69 is 440.0 Hz.
+#
+#  Every Tuning precomputes the hertz frequency of its first 128 keys when it
+#  is created, so key to hertz conversion is a table lookup. The reverse
+#  direction, hertz to the nearest key plus a deviation in cents, works on
+#  whole NumPy arrays so that a recorded pitch track can be mapped onto one
+#  or several tunings without a Python loop per frame. See: nearest(),
+#  nearest_keys().
+
+import math
+import numpy as np
+
+from .ratio import Ratio
+
+## The 5-limit just intonation ratios of the chromatic scale.
+JUST_RATIOS = (Ratio(1, 1), Ratio(16, 15), Ratio(9, 8), Ratio(6, 5),
+               Ratio(5, 4), Ratio(4, 3), Ratio(45, 32), Ratio(3, 2),
+               Ratio(8, 5), Ratio(5, 3), Ratio(9, 5), Ratio(15, 8))
+
+## The syntonic comma (81/80), the amount meantone fifths are narrowed by.
+SYNTONIC_COMMA = Ratio(81, 80)
+
+
+## Returns the size of a frequency ratio in cents: 1200 * log2(ratio).
+#  @param ratio A positive Ratio, int or float.
+def cents(ratio):
+    return 1200 * math.log2(ratio.float() if isinstance(ratio, Ratio) else ratio)
+
+
+class Tuning:
+
+    ## Creates a Tuning from the sizes of its scale degrees.
+    #  @param degrees A sequence of cents, one per scale degree, starting with
+    #  0 for the root and strictly increasing below the period.
+    #  @param period The size in cents of the interval the scale repeats at.
+    #  @param name A short name for the tuning, e.g. '12-TET'.
+    #  @param rootkey The key number of the root (degree 0).
+    #  @param refkey The key number that sounds at refhertz.
+    #  @param refhertz The frequency of refkey.
+    #  @param size The number of keys in the precomputed hertz table.
+    #
+    #  The constructor raises a ValueError if the degrees do not start at 0,
+    #  are not increasing or do not fit inside the period.
+    #  See also: equal(), just(), pythagorean(), meantone(), from_scala().
+    def __init__(self, degrees, period=1200.0, name='', rootkey=60, refkey=69, refhertz=440.0, size=128):
+        degrees = np.asarray(degrees, dtype=np.float64).ravel()
+        if not len(degrees) or degrees[0] != 0:
+            raise ValueError("The first degree of a tuning must be 0 cents")
+        if np.any(np.diff(degrees) <= 0) or degrees[-1] >= period:
+            raise ValueError("The degrees of a tuning must increase and be smaller than the period")
+        if refhertz <= 0:
+            raise ValueError(f"The reference frequency must be positive, your input was {refhertz}")
+        self.name = name
+        ## The cents of each scale degree above the root, read only.
+        self.degrees = degrees
+        self.degrees.flags.writeable = False
+        ## The size of the period in cents.
+        self.period = float(period)
+        self.rootkey = rootkey
+        self.refkey = refkey
+        self.refhertz = float(refhertz)
+        # the degrees with the last degree of the period below and the root of
+        # the period above, so the nearest degree of any cents value in
+        # [0, period) is at one of two neighboring positions.
+        self._bounds = np.concatenate(([degrees[-1] - self.period], degrees, [self.period]))
+        self._refcents = self._key_cents(np.int64(refkey))
+        ## The hertz frequency of the keys 0 to size - 1, read only.
+        self.table = self._hertz(np.arange(size, dtype=np.int64))
+        self.table.flags.writeable = False
+
+    ## Returns an n-tone equal temperament tuning, e.g. Tuning.equal(24) is
+    #  the quarter tone scale.
+    #  @param steps The number of equal steps in the period.
+    #  @param period The period as a Ratio (default 2/1, the octave).
+    #  Other keyword arguments are passed to the constructor.
+    @classmethod
+    def equal(cls, steps=12, period=Ratio(2, 1), **kwargs):
+        if not isinstance(steps, int) or steps < 1:
+            raise ValueError(f"An equal temperament needs a positive number of steps, your input was {steps}")
+        size = cents(period)
+        kwargs.setdefault('name', f'{steps}-TET')
+        return cls([size * i / steps for i in range(steps)], size, **kwargs)
+
+    ## Returns a just intonation tuning built from a table of Ratios.
+    #  @param ratios A sequence of Ratios starting with 1, each larger than the
+    #  last and smaller than the period. Defaults to JUST_RATIOS.
+    #  @param period The period as a Ratio (default 2/1, the octave).
+    #  Other keyword arguments are passed to the constructor.
+    @classmethod
+    def just(cls, ratios=JUST_RATIOS, period=Ratio(2, 1), **kwargs):
+        kwargs.setdefault('name', 'Just')
+        return cls([cents(r) for r in ratios], cents(period), **kwargs)
+
+    ## Returns the twelve note Pythagorean tuning, built from pure 3/2 fifths
+    #  stacked from Eb up to G# (the wolf fifth is G# to Eb).
+    #  Keyword arguments are passed to the constructor.
+    @classmethod
+    def pythagorean(cls, **kwargs):
+        kwargs.setdefault('name', 'Pythagorean')
+        return cls(Tuning._fifths(cents(Ratio(3, 2))), **kwargs)
+
+    ## Returns a twelve note meantone tuning whose fifths are narrowed by a
+    #  fraction of the syntonic comma, stacked from Eb up to G#.
+    #  @param fraction The part of the comma each fifth is narrowed by, e.g.
+    #  Ratio(1, 4) for quarter-comma meantone (pure major thirds) or
+    #  Ratio(1, 6) for sixth-comma meantone.
+    #  Keyword arguments are passed to the constructor.
+    @classmethod
+    def meantone(cls, fraction=Ratio(1, 4), **kwargs):
+        kwargs.setdefault('name', f'{fraction.string()}-comma meantone')
+        return cls(Tuning._fifths(cents(Ratio(3, 2)) - fraction.float() * cents(SYNTONIC_COMMA)), **kwargs)
+
+    ## Returns a custom tuning from the text of a Scala (.scl) file. Lines
+    #  starting with '!' are comments, the first line is the description, the
+    #  second the number of pitches, followed by one pitch per line: a number
+    #  with a '.' is in cents, otherwise it is a ratio like '5/4' or '2'. The
+    #  last pitch is the period.
+    #  @param text The contents of the .scl file.
+    #  Keyword arguments are passed to the constructor.
+    #
+    #  Raises a ValueError if the text is not a valid scale.
+    @classmethod
+    def from_scala(cls, text, **kwargs):
+        lines = [line.strip() for line in text.splitlines() if not line.strip().startswith('!')]
+        try:
+            description = lines[0]
+            count = int(lines[1].split()[0])
+            pitches = [Tuning._scala_cents(line.split()[0]) for line in lines[2:2 + count]]
+        except (IndexError, ValueError, ZeroDivisionError):
+            raise ValueError("The text is not a valid Scala scale")
+        if len(pitches) != count or not count:
+            raise ValueError(f"The Scala scale should have {count} pitches")
+        kwargs.setdefault('name', description)
+        return cls([0.0] + pitches[:-1], pitches[-1], **kwargs)
+
+    ## Private static method that returns the cents of one Scala pitch line.
+    @staticmethod
+    def _scala_cents(pitch):
+        if '.' in pitch:
+            return float(pitch)
+        if '/' in pitch:
+            return cents(Ratio(pitch))
+        return cents(int(pitch))
+
+    ## Private static method that returns the twelve sorted degrees made by
+    #  stacking a fifth of the given size three times down and eight times up
+    #  from the root, reduced into the octave.
+    @staticmethod
+    def _fifths(fifth):
+        return sorted((i * fifth) % 1200.0 for i in range(-3, 9))
+
+    ## Returns a string showing the tuning's name, size and the hex id.
+    #  Example: '<Tuning: 12-TET (12 degrees) 0x109877c50>'
+    def __str__(self):
+        return f'<Tuning: {self.name} ({len(self.degrees)} degrees) {hex(id(self))}>'
+
+    ## Define __repr__ to be the same as __str__ except there is no hex id.
+    def __repr__(self):
+        return f'<Tuning: {self.name} ({len(self.degrees)} degrees)>'
+
+    ## Returns the number of degrees in one period.
+    def __len__(self):
+        return len(self.degrees)
+
+    ## Private method that returns the cents of an array of keys above the
+    #  root key.
+    def _key_cents(self, keys):
+        periods, degree = np.divmod(keys - self.rootkey, len(self.degrees))
+        return periods * self.period + self.degrees[degree]
+
+    ## Private method that computes the hertz of an array of keys.
+    def _hertz(self, keys):
+        return self.refhertz * 2 ** ((self._key_cents(keys) - self._refcents) / 1200)
+
+    ## Returns the hertz frequency of a key number. Keys inside the table are
+    #  looked up, others are computed.
+    #  @param key An integer key number.
+    def hertz(self, key):
+        if 0 <= key < len(self.table):
+            return float(self.table[key])
+        return float(self._hertz(np.int64(key)))
+
+    ## Returns the hertz frequencies of an array of key numbers.
+    #  @param keys A sequence or NumPy array of integer key numbers.
+    #  @returns A float64 NumPy array.
+    def hertz_array(self, keys):
+        keys = np.asarray(keys, dtype=np.int64).ravel()
+        if len(keys) and keys.min() >= 0 and keys.max() < len(self.table):
+            return self.table[keys]
+        return self._hertz(keys)
+
+    ## Returns the scale degree (0 to len(self) - 1) of a key number.
+    def degree(self, key):
+        return (key - self.rootkey) % len(self.degrees)
+
+    ## Maps an array of frequencies onto the nearest keys of the tuning.
+    #  @param hertz A sequence or NumPy array of positive frequencies.
+    #  @returns A tuple (keys, cents) of an int64 array holding the nearest
+    #  key number of each frequency and a float64 array holding how far the
+    #  frequency is from that key in cents (positive is sharp).
+    #
+    #  Keys are not limited to 0-127. A ValueError is raised if any frequency
+    #  is not positive.
+    def nearest(self, hertz):
+        hertz = np.asarray(hertz, dtype=np.float64).ravel()
+        if not np.all(hertz > 0) or not np.all(np.isfinite(hertz)):
+            raise ValueError("Hertz values must be positive numbers")
+        above = 1200 * np.log2(hertz / self.refhertz) + self._refcents
+        periods = np.floor(above / self.period)
+        within = above - periods * self.period
+        upper = np.clip(np.searchsorted(self._bounds, within), 1, len(self._bounds) - 1)
+        lower = upper - 1
+        pick = np.where(within - self._bounds[lower] <= self._bounds[upper] - within, lower, upper)
+        # position 0 of the bounds is degree -1 and position i is degree i - 1
+        keys = self.rootkey + periods.astype(np.int64) * len(self.degrees) + pick - 1
+        return keys, within - self._bounds[pick]
+
+
+## Maps an array of frequencies onto several tunings at once.
+#  @param hertz A sequence or NumPy array of positive frequencies.
+#  @param tunings A sequence of Tunings.
+#  @returns A tuple (keys, cents) of two 2D arrays with one row per tuning and
+#  one column per frequency. See: Tuning.nearest().
+def nearest_keys(hertz, tunings):
+    results = [tuning.nearest(hertz) for tuning in tunings]
+    return np.array([k for k, c in results], dtype=np.int64), np.array([c for k, c in results])
+
+
+if __name__ == '__main__':
+    tunings = [Tuning.equal(), Tuning.just(), Tuning.pythagorean(), Tuning.meantone()]
+    for tuning in tunings:
+        print(tuning, tuning.hertz(60), tuning.hertz(64))
+    print(nearest_keys([261.63, 329.63, 440.0, 445.0], tunings))